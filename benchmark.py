@@ -0,0 +1,215 @@
+# benchmark.py
+#
+# Mesures de performance (sans fenêtre graphique) :
+#     python benchmark.py -o bench.json
+#     python benchmark.py --quick --compare bench.json
+# Les résultats sont écrits en JSON pour comparer deux commits.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+
+import crossSection as cS
+import halfLife as hL
+import molarMass as mM
+import reactorModel as rm
+import nuclideChain as nC
+import projet
+from nuclearData import REGISTRY
+
+
+def fuel(kind):
+    """Fuel composition [%] of a benchmark case: 'UOX', 'MOX' or 'thorium'."""
+    f = rm.Fuel()
+    f.U235, f.U238, f.Pu239, f.Th232 = {
+        "UOX": (3.0, 97.0, 0.0, 0.0),
+        "MOX": (0.3, 92.7, 7.0, 0.0),
+        "thorium": (4.0, 0.0, 0.0, 96.0),
+    }[kind]
+    return f
+
+
+def timed(fun, repeat=1):
+    """
+    (best wall time [s] over repeat calls, peak traced memory [bytes], last
+    result) of fun(). The memory is measured on one more call, tracemalloc
+    slowing down the small numpy operations too much to be used while timing.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fun()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fun()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, res
+
+
+def bench_reactor(t_finals, repeat):
+    """Steps per second and peak memory of reactorModel (euler) per fuel, t_final and control."""
+    out = {}
+    for kind in ("UOX", "MOX", "thorium"):
+        for t_final in t_finals:
+            for control in (False, True):
+                name = "reactorModel/%s/t=%gs/control=%s" % (kind, t_final, "on" if control else "off")
+                wall, peak, res = timed(lambda: rm.reactorModel(
+                    fuel(kind), rm.FP(), t_final, 1e10, 0.0, 25.0,
+                    use_control=control, P_nom=1e7, K_p=1e-10), repeat)
+                n_steps = res["stats"]["n_steps"]
+                out[name] = {"wall_time": wall, "n_steps": n_steps, "steps_per_s": n_steps / wall,
+                             "peak_memory_MB": peak / 2 ** 20, "burnup": float(res["burnup"])}
+    return out
+
+
+def bench_lookups(n_calls, n_points):
+    """Calls per second of the nuclear data lookups, and cross-section points per second."""
+    out = {}
+    E = np.logspace(-5, 7, n_points)
+    cases = {
+        "crossSection/scalar": lambda: cS.crossSection("U235", "Fission", 0.025),
+        "halfLife": lambda: hL.halfLife("Xe135", "BetaMinus"),
+        "molarMass": lambda: mM.molarMass("U235"),
+    }
+    for name, call in cases.items():
+        t0 = time.perf_counter()
+        for _ in range(n_calls):
+            call()
+        wall = time.perf_counter() - t0
+        out[name] = {"wall_time": wall, "calls": n_calls, "calls_per_s": n_calls / wall}
+
+    wall, peak, _ = timed(lambda: cS.crossSection("U235", "Fission", E), repeat=3)
+    out["crossSection/vector"] = {"wall_time": wall, "points": n_points,
+                                  "points_per_s": n_points / wall, "peak_memory_MB": peak / 2 ** 20}
+    out.update(bench_libraries(E[::10]))
+    out.update(bench_registry(n_calls))
+    return out
+
+
+def pointwise_library(n_table):
+    """
+    PointwiseLibrary with one log-log table of n_table points per pair of
+    the default library (its values sampled on a log grid), for timing.
+    """
+    n_pairs = len(cS.LIBRARY.pairs)
+    E = np.logspace(-5, 7, n_table)
+    sigma = cS.LIBRARY.evaluate(np.arange(n_pairs), E)
+    return cS.PointwiseLibrary(cS.LIBRARY.pairs, np.tile(E, n_pairs), sigma.ravel(),
+                               np.arange(n_pairs + 1) * n_table,
+                               np.full(n_pairs, cS.INTERP_LAWS.index("loglog")))
+
+
+def bench_libraries(E):
+    """Points per second of the batched evaluate of every pair, plateau and pointwise libraries."""
+    out = {}
+    libraries = {"CrossSectionLibrary": cS.LIBRARY, "PointwiseLibrary": pointwise_library(1000)}
+    for name, library in libraries.items():
+        ids = np.arange(len(library.pairs))
+        wall, peak, _ = timed(lambda: library.evaluate(ids, E), repeat=3)
+        points = len(ids) * len(E)
+        out[name + "/evaluate"] = {"wall_time": wall, "points": points,
+                                   "points_per_s": points / wall, "peak_memory_MB": peak / 2 ** 20}
+    return out
+
+
+def bench_registry(n_calls):
+    """Calls per second of the REGISTRY lookups used when building a chain."""
+    out = {}
+    ids = REGISTRY.id_array(nC.NUCLIDES)
+    cases = {
+        "REGISTRY/half_life": lambda: REGISTRY.half_life("Xe135", "BetaMinus"),
+        "REGISTRY/decay_constant": lambda: REGISTRY.decay_constant("Xe135", "BetaMinus"),
+        "REGISTRY/molar_masses": lambda: REGISTRY.molar_masses(ids),
+        "REGISTRY/group_xs": lambda: REGISTRY.group_xs(nC.NUCLIDES, nC.NEUTRON_REACTIONS,
+                                                       [rm.E_FAST, rm.E_TH]),
+    }
+    for name, call in cases.items():
+        t0 = time.perf_counter()
+        for _ in range(n_calls):
+            call()
+        wall = time.perf_counter() - t0
+        out[name] = {"wall_time": wall, "calls": n_calls, "calls_per_s": n_calls / wall}
+    return out
+
+
+def bench_projet(t_final):
+    """End-to-end time of the three cases of projet.py."""
+    out = {}
+    cases = [("no_xe_no_control", False, False), ("xe_no_control", True, False),
+             ("xe_control", True, True)]
+    for name, use_xe, use_control in cases:
+        wall, peak, _ = timed(lambda: projet.run_case(name, use_xe=use_xe, use_control=use_control,
+                                                      t_final=t_final))
+        out["projet/" + name] = {"wall_time": wall, "t_final": t_final,
+                                 "peak_memory_MB": peak / 2 ** 20}
+    return out
+
+
+def environment():
+    try:
+        here = os.path.dirname(os.path.abspath(__file__))
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, cwd=here).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "platform": platform.platform()}
+
+
+def run(quick=False):
+    """Whole suite as a JSON-serialisable dict {"environment": ..., "results": {name: metrics}}."""
+    results = {}
+    results.update(bench_reactor([1.0] if quick else [1.0, 10.0], repeat=1 if quick else 3))
+    results.update(bench_lookups(2000 if quick else 20000, 10 ** 5 if quick else 10 ** 6))
+    results.update(bench_projet(10.0 if quick else 100.0))
+    return {"environment": environment(), "quick": quick, "results": results}
+
+
+# grandeur principale de chaque mesure, "plus grand = mieux" ou non
+METRICS = (("steps_per_s", True), ("calls_per_s", True), ("points_per_s", True),
+           ("wall_time", False))
+
+
+def compare(new, old):
+    """Print the ratio new / old of the main metric of every benchmark present in both."""
+    for name, res in new["results"].items():
+        ref = old["results"].get(name)
+        if ref is None:
+            continue
+        for key, higher in METRICS:
+            if key in res and key in ref and ref[key] > 0:
+                ratio = res[key] / ref[key]
+                speedup = ratio if higher else 1.0 / ratio
+                print("%-45s %-13s %10.4g -> %10.4g   x%.2f" % (name, key, ref[key], res[key], speedup))
+                break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of reactorModel, crossSection and projet.py")
+    parser.add_argument("-o", "--output", help="JSON file of the results")
+    parser.add_argument("--quick", action="store_true", help="short runs (smoke test)")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    args = parser.parse_args()
+
+    report = run(args.quick)
+    for name, res in report["results"].items():
+        print("%-45s %s" % (name, ", ".join("%s=%.4g" % (k, v) for k, v in res.items()
+                                             if isinstance(v, (int, float)))))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            print("\nspeed-up vs %s:" % args.compare)
+            compare(report, json.load(f))
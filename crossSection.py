@@ -1,188 +1,424 @@
 # crossSection.py
 
+import os
+
 import numpy as np
 
 
-def crossSection(X, Transfo, E_neutron):
-    """
-    Computes the cross section for a specific energy level
-    ENDF database: https://www-nds.iaea.org/exfor/endf.htm
+# limites des régions : thermique E <= E_TH_LIMIT, rapide E >= E_FAST_LIMIT,
+# interpolation en log(E) entre les deux
+E_TH_LIMIT = 1.0     # eV
+E_FAST_LIMIT = 1e6   # eV
 
-    ----------------
-    :param X: string
-        nuclide or nucleon (for a neutron), follows the atomic notation of the element,
-        e.g.: for Uranium-235, X = 'U235'
-    :param Transfo: string
-        name of the considered transformation, should be one of:
-        ['Fission', 'Capture']
-    :param E_neutron: array-like
-        energy(ies) of the incident neutron in [eV]
-        expected range [1e-5; 2e7] [eV]
-    :return: numpy array of same shape as E_neutron
-        cross section in [barn]
-    """
+# thermal values
+XS_TH = {
+    # U235
+    ("U235", "Fission"): 580.0,
+    ("U235", "Capture"): 100.0,
 
-    E = np.array(E_neutron, dtype=float)
+    # U238
+    ("U238", "Fission"): 0.02,
+    ("U238", "Capture"): 2.7,
+
+    # U236 (peu fissile, plutôt capture)
+    ("U236", "Fission"): 0.1,
+    ("U236", "Capture"): 5.0,
+
+    # U237 (intermédiaire, capture modérée)
+    ("U237", "Fission"): 0.05,
+    ("U237", "Capture"): 3.0,
 
-    # output
-    sigma = np.zeros_like(E)
+    # U239 (intermédiaire vers Np239)
+    ("U239", "Fission"): 1.0,
+    ("U239", "Capture"): 5.0,
 
-    # define energy groups
-    E_th = 1.0     # eV
-    E_fast = 1e6   # eV
+    # Np239
+    ("Np239", "Fission"): 200.0,
+    ("Np239", "Capture"): 50.0,
 
-    # thermal values
-    sig = {
-        # U235
-        ("U235", "Fission", "th"): 580.0,
-        ("U235", "Capture", "th"): 100.0,
+    # Pu239
+    ("Pu239", "Fission"): 750.0,
+    ("Pu239", "Capture"): 270.0,
 
-        # U238
-        ("U238", "Fission", "th"): 0.02,
-        ("U238", "Capture", "th"): 2.7,
+    # Pu240 (plutôt poison)
+    ("Pu240", "Fission"): 0.5,
+    ("Pu240", "Capture"): 290.0,
 
-        # U236 (peu fissile, plutôt capture)
-        ("U236", "Fission", "th"): 0.1,
-        ("U236", "Capture", "th"): 5.0,
+    # Pu241 (bien fissile)
+    ("Pu241", "Fission"): 900.0,
+    ("Pu241", "Capture"): 280.0,
 
-        # U237 (intermédiaire, capture modérée)
-        ("U237", "Fission", "th"): 0.05,
-        ("U237", "Capture", "th"): 3.0,
+    # Thorium + cycle U233
+    ("Th232", "Fission"): 0.01,
+    ("Th232", "Capture"): 7.0,
 
-        # U239 (intermédiaire vers Np239)
-        ("U239", "Fission", "th"): 1.0,
-        ("U239", "Capture", "th"): 5.0,
+    ("Th233", "Fission"): 150.0,
+    ("Th233", "Capture"): 30.0,
 
-        # Np239
-        ("Np239", "Fission", "th"): 200.0,
-        ("Np239", "Capture", "th"): 50.0,
+    ("Pa233", "Fission"): 200.0,
+    ("Pa233", "Capture"): 50.0,
 
-        # Pu239
-        ("Pu239", "Fission", "th"): 750.0,
-        ("Pu239", "Capture", "th"): 270.0,
+    ("U233", "Fission"): 530.0,
+    ("U233", "Capture"): 45.0,
 
-        # Pu240 (plutôt poison)
-        ("Pu240", "Fission", "th"): 0.5,
-        ("Pu240", "Capture", "th"): 290.0,
+    # Xénon-135 (énorme poison thermique)
+    ("Xe135", "Capture"): 2.5e6,
+}
 
-        # Pu241 (bien fissile)
-        ("Pu241", "Fission", "th"): 900.0,
-        ("Pu241", "Capture", "th"): 280.0,
+# fast values (smaller fission XS, small captures)
+XS_FAST = {
+    # U235
+    ("U235", "Fission"): 1.0,
+    ("U235", "Capture"): 1.0,
 
-        # Thorium + cycle U233
-        ("Th232", "Fission", "th"): 0.01,
-        ("Th232", "Capture", "th"): 7.0,
+    # U238
+    ("U238", "Fission"): 0.3,
+    ("U238", "Capture"): 0.5,
 
-        ("Th233", "Fission", "th"): 150.0,
-        ("Th233", "Capture", "th"): 30.0,
+    # U236
+    ("U236", "Fission"): 0.1,
+    ("U236", "Capture"): 0.5,
 
-        ("Pa233", "Fission", "th"): 200.0,
-        ("Pa233", "Capture", "th"): 50.0,
+    # U237
+    ("U237", "Fission"): 0.1,
+    ("U237", "Capture"): 0.5,
 
-        ("U233", "Fission", "th"): 530.0,
-        ("U233", "Capture", "th"): 45.0,
+    # U239
+    ("U239", "Fission"): 0.5,
+    ("U239", "Capture"): 0.5,
 
-        # Xénon-135 (énorme poison thermique)
-        ("Xe135", "Capture", "th"): 2.5e6,
-    }
+    # Np239
+    ("Np239", "Fission"): 1.0,
+    ("Np239", "Capture"): 0.5,
 
-    # fast values (smaller fission XS, small captures)
-    sig_fast = {
-        # U235
-        ("U235", "Fission"): 1.0,
-        ("U235", "Capture"): 1.0,
+    # Pu239
+    ("Pu239", "Fission"): 1.5,
+    ("Pu239", "Capture"): 1.0,
 
-        # U238
-        ("U238", "Fission"): 0.3,
-        ("U238", "Capture"): 0.5,
+    # Pu240
+    ("Pu240", "Fission"): 0.1,
+    ("Pu240", "Capture"): 1.0,
 
-        # U236
-        ("U236", "Fission"): 0.1,
-        ("U236", "Capture"): 0.5,
+    # Pu241
+    ("Pu241", "Fission"): 1.5,
+    ("Pu241", "Capture"): 1.0,
 
-        # U237
-        ("U237", "Fission"): 0.1,
-        ("U237", "Capture"): 0.5,
+    # Thorium + cycle U233
+    ("Th232", "Fission"): 0.01,
+    ("Th232", "Capture"): 0.3,
 
-        # U239
-        ("U239", "Fission"): 0.5,
-        ("U239", "Capture"): 0.5,
+    ("Th233", "Fission"): 0.8,
+    ("Th233", "Capture"): 0.3,
 
-        # Np239
-        ("Np239", "Fission"): 1.0,
-        ("Np239", "Capture"): 0.5,
+    ("Pa233", "Fission"): 1.0,
+    ("Pa233", "Capture"): 0.5,
 
-        # Pu239
-        ("Pu239", "Fission"): 1.5,
-        ("Pu239", "Capture"): 1.0,
+    ("U233", "Fission"): 1.2,
+    ("U233", "Capture"): 0.5,
 
-        # Pu240
-        ("Pu240", "Fission"): 0.1,
-        ("Pu240", "Capture"): 1.0,
+    # Xe135 (poison rapide beaucoup moins fort)
+    ("Xe135", "Capture"): 1e3,
+}
+
+
+class CrossSectionLibrary:
+    """
+    Cross sections of every (nuclide, reaction) pair of a thermal and a fast
+    table, stored once in contiguous arrays with an integer index.
+
+    Pair p has thermal value sig_th[p] (used for E <= E_TH_LIMIT) and fast
+    value sig_fast[p] (E >= E_FAST_LIMIT), log-linear in between. A value
+    missing from one table is 0 in its region and the other value is used
+    in the intermediate region, as in crossSection().
+
+    ----------------
+    :param xs_th: dict {(nuclide, reaction): sigma [barn]}
+    :param xs_fast: dict {(nuclide, reaction): sigma [barn]}
+    """
 
-        # Pu241
-        ("Pu241", "Fission"): 1.5,
-        ("Pu241", "Capture"): 1.0,
+    def __init__(self, xs_th=XS_TH, xs_fast=XS_FAST):
+        self._index_pairs(list(xs_th) + [key for key in xs_fast if key not in xs_th])
+
+        self.sig_th = np.array([xs_th.get(key, 0.0) for key in self.pairs], dtype=float)
+        self.sig_fast = np.array([xs_fast.get(key, 0.0) for key in self.pairs], dtype=float)
+        self.has_th = np.array([key in xs_th for key in self.pairs], dtype=bool)
+        self.has_fast = np.array([key in xs_fast for key in self.pairs], dtype=bool)
+        self.has_both = self.has_th & self.has_fast
+
+    def _index_pairs(self, pairs):
+        self.pairs = pairs
+        self.index = {key: p for p, key in enumerate(self.pairs)}
+        self.nuclides = list(dict.fromkeys(X for X, _ in self.pairs))
+        self.reactions = list(dict.fromkeys(R for _, R in self.pairs))
+
+        # pair_index[i, r] : indice de la paire (nuclides[i], reactions[r]), -1 si absente
+        self.pair_index = np.full((len(self.nuclides), len(self.reactions)), -1, dtype=np.int64)
+        for p, (X, R) in enumerate(self.pairs):
+            self.pair_index[self.nuclides.index(X), self.reactions.index(R)] = p
+
+    def pair_ids(self, nuclides, reactions):
+        """
+        Integer ids of the pairs nuclides x reactions, shape
+        (len(nuclides), len(reactions)), -1 where there is no data.
+        """
+        i = np.array([self.nuclides.index(X) if X in self.nuclides else -1 for X in nuclides],
+                     dtype=np.int64)
+        r = np.array([self.reactions.index(R) if R in self.reactions else -1 for R in reactions],
+                     dtype=np.int64)
+        ids = self.pair_index[np.ix_(np.maximum(i, 0), np.maximum(r, 0))]
+        ids[(i < 0)[:, None] | (r < 0)[None, :]] = -1
+        return ids
+
+    def evaluate(self, ids, E_neutron):
+        """
+        Cross sections [barn] of the pairs ids (all valid) at the energies
+        E_neutron [eV], shape (len(ids), len(E_neutron)).
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        E = np.asarray(E_neutron, dtype=float).ravel()
+
+        s_th = self.sig_th[ids][:, None]
+        s_fast = self.sig_fast[ids][:, None]
+        both = self.has_both[ids][:, None]
+
+        # valeur manquante = 0 : s_th + s_fast est la valeur disponible
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = (np.log(E) - np.log(E_TH_LIMIT)) / (np.log(E_FAST_LIMIT) - np.log(E_TH_LIMIT))
+            sigma_mid = np.where(both, s_th + w * (s_fast - s_th), s_th + s_fast)
+
+        return np.where(E <= E_TH_LIMIT, s_th, np.where(E >= E_FAST_LIMIT, s_fast, sigma_mid))
+
+    def lookup(self, nuclides, reactions, E_neutron):
+        """
+        Batched lookup of nuclides x reactions x energies.
+
+        ----------------
+        :param nuclides: list of strings
+        :param reactions: list of strings, e.g. ['Fission', 'Capture']
+        :param E_neutron: array-like of energies [eV]
+        :return: (sigma, missing)
+            sigma: array (len(nuclides), len(reactions), len(E_neutron)) in
+            [barn], 0 where there is no data; missing: bool array
+            (len(nuclides), len(reactions)), True where there is no data
+        """
+        ids = self.pair_ids(nuclides, reactions)
+        missing = ids < 0
+        E = np.asarray(E_neutron, dtype=float).ravel()
+        sigma = self.evaluate(np.maximum(ids, 0).ravel(), E).reshape(ids.shape + (len(E),))
+        sigma[missing] = 0.0
+        return sigma, missing
+
+
+# bibliothèque par défaut, construite une seule fois
+LIBRARY = CrossSectionLibrary()
+
+
+# ------------------- DONNÉES PONCTUELLES -------------------
+
+INTERP_LAWS = ("linlin", "loglog")
+
+
+class PointwiseLibrary(CrossSectionLibrary):
+    """
+    Pointwise tabulated cross sections (ENDF/EXFOR-like), all tables
+    concatenated in two contiguous arrays: pair p covers
+    energy[offsets[p]:offsets[p+1]] (increasing) and the same slice of
+    sigma. Evaluation uses searchsorted and the lin-lin or log-log law of
+    the table, the end values being held outside the tabulated range.
 
-        # Thorium + cycle U233
-        ("Th232", "Fission"): 0.01,
-        ("Th232", "Capture"): 0.3,
+    Pairs without a table are taken from `fallback` (e.g. the default
+    plateau LIBRARY), so that a partial data set can be used as is.
 
-        ("Th233", "Fission"): 0.8,
-        ("Th233", "Capture"): 0.3,
+    ----------------
+    :param pairs: list of (nuclide, reaction)
+    :param energy, sigma: 1-D arrays, concatenated tables in [eV] and [barn]
+    :param offsets: int array (len(pairs) + 1,)
+    :param interp: int array (len(pairs),), index in INTERP_LAWS
+    :param fallback: CrossSectionLibrary or None
+    """
 
-        ("Pa233", "Fission"): 1.0,
-        ("Pa233", "Capture"): 0.5,
+    def __init__(self, pairs, energy, sigma, offsets, interp, fallback=None):
+        self.table_pairs = [tuple(key) for key in pairs]
+        self.energy = np.asarray(energy, dtype=float)
+        self.sigma = np.asarray(sigma, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.interp = np.asarray(interp, dtype=np.int64)
+        self.fallback = fallback
+
+        extra = [] if fallback is None else [key for key in fallback.pairs
+                                             if key not in self.table_pairs]
+        self._index_pairs(self.table_pairs + extra)
+
+    def _table(self, p, E):
+        a, b = self.offsets[p], self.offsets[p + 1]
+        x, y = self.energy[a:b], self.sigma[a:b]
+        if len(x) == 1:
+            return np.full(len(E), y[0])
+
+        Ec = np.clip(E, x[0], x[-1])
+        i = np.clip(np.searchsorted(x, Ec, side="right"), 1, len(x) - 1)
+        x0, x1, y0, y1 = x[i - 1], x[i], y[i - 1], y[i]
+
+        if INTERP_LAWS[self.interp[p]] == "loglog":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                w = np.log(Ec / x0) / np.log(x1 / x0)
+                out = y0 * (y1 / y0) ** w
+            # sigma nul sur un intervalle : loi lin-lin
+            lin = (y0 <= 0.0) | (y1 <= 0.0) | (x0 <= 0.0)
+            if np.any(lin):
+                out[lin] = y0[lin] + (Ec[lin] - x0[lin]) * (y1[lin] - y0[lin]) / (x1[lin] - x0[lin])
+            return out
+        return y0 + (Ec - x0) * (y1 - y0) / (x1 - x0)
+
+    def evaluate(self, ids, E_neutron):
+        """Cross sections [barn], shape (len(ids), len(E_neutron))."""
+        ids = np.asarray(ids, dtype=np.int64)
+        E = np.asarray(E_neutron, dtype=float).ravel()
+        out = np.zeros((len(ids), len(E)))
+        n_tab = len(self.table_pairs)
+        for k, p in enumerate(ids):
+            if p < n_tab:
+                out[k] = self._table(p, E)
+        from_fallback = np.flatnonzero(ids >= n_tab)
+        if len(from_fallback):
+            keys = [self.pairs[p] for p in ids[from_fallback]]
+            out[from_fallback] = self.fallback.evaluate([self.fallback.index[key] for key in keys], E)
+        return out
+
+
+def parse_pointwise(path):
+    """
+    Read a pointwise text file made of blocks
+
+        NUCLIDE U235
+        REACTION Fission
+        INTERP loglog          (optional, 'linlin' or 'loglog', default loglog)
+        1.0e-5   5.2e3         (E [eV], sigma [barn], increasing E)
+        ...
+
+    '#' starts a comment. The header lines may come in any order before
+    the values; a header line after values starts a new block, which keeps
+    the NUCLIDE/REACTION not given again and gets INTERP loglog by default.
+    :return: list of (nuclide, reaction, interp, energies, sigmas)
+    """
+    blocks = []
+    head = {"NUCLIDE": None, "REACTION": None, "INTERP": "loglog"}
+    values = []
+
+    def close():
+        if values:
+            if head["NUCLIDE"] is None or head["REACTION"] is None:
+                raise ValueError("%s: data before NUCLIDE/REACTION header" % path)
+            xy = np.array(" ".join(values).split(), dtype=float).reshape(-1, 2)
+            if np.any(np.diff(xy[:, 0]) < 0):
+                raise ValueError("%s: energies of %s/%s are not increasing"
+                                 % (path, head["NUCLIDE"], head["REACTION"]))
+            blocks.append((head["NUCLIDE"], head["REACTION"], head["INTERP"], xy[:, 0], xy[:, 1]))
+            values.clear()
+            head["INTERP"] = "loglog"
+
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            word = line.split(None, 1)
+            if word[0].upper() in head:
+                close()
+                key = word[0].upper()
+                head[key] = word[1].strip()
+                if key == "INTERP" and head[key] not in INTERP_LAWS:
+                    raise ValueError("%s: unknown INTERP '%s', expected one of %s"
+                                     % (path, head[key], INTERP_LAWS))
+            else:
+                values.append(line)
+    close()
+    return blocks
+
+
+def _sources(paths):
+    return [[os.path.abspath(p), os.stat(p).st_mtime_ns, os.stat(p).st_size] for p in paths]
+
+
+def load_pointwise(paths, cache=None, fallback=LIBRARY):
+    """
+    PointwiseLibrary from one or several text files (see parse_pointwise).
 
-        ("U233", "Fission"): 1.2,
-        ("U233", "Capture"): 0.5,
+    With cache (path of a .npz file) the parsed tables are saved once in
+    binary form; the next calls load them directly, without reading the
+    text files, as long as these have not changed (same paths, sizes and
+    modification times). A later table of the same pair replaces the
+    former one.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    sources = _sources(paths)
+
+    if cache is not None and os.path.exists(cache):
+        with np.load(cache) as data:
+            if data["sources"].tolist() == [repr(src) for src in sources]:
+                return PointwiseLibrary([tuple(key) for key in data["pairs"].tolist()],
+                                        data["energy"], data["sigma"], data["offsets"],
+                                        data["interp"], fallback)
+
+    tables = {}
+    for path in paths:
+        for X, R, law, E, sig in parse_pointwise(path):
+            tables[(X, R)] = (INTERP_LAWS.index(law), E, sig)
+
+    pairs = list(tables)
+    sizes = [len(tables[key][1]) for key in pairs]
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    energy = np.concatenate([tables[key][1] for key in pairs]) if pairs else np.zeros(0)
+    sigma = np.concatenate([tables[key][2] for key in pairs]) if pairs else np.zeros(0)
+    interp = np.array([tables[key][0] for key in pairs], dtype=np.int64)
+
+    if cache is not None:
+        tmp = cache + ".tmp.npz"
+        np.savez(tmp, pairs=np.array(pairs, dtype=str).reshape(-1, 2), energy=energy,
+                 sigma=sigma, offsets=offsets, interp=interp,
+                 sources=np.array([repr(src) for src in sources]))
+        os.replace(tmp, cache)
+
+    return PointwiseLibrary(pairs, energy, sigma, offsets, interp, fallback)
+
+
+def set_library(library):
+    """
+    Use `library` (e.g. load_pointwise(...)) for crossSection() and for the
+    chains built afterwards by nuclideChain.
+    """
+    global LIBRARY
+    LIBRARY = library
 
-        # Xe135 (poison rapide beaucoup moins fort)
-        ("Xe135", "Capture"): 1e3,
-    }
 
+def crossSection(X, Transfo, E_neutron):
+    """
+    Computes the cross section for a specific energy level
+    ENDF database: https://www-nds.iaea.org/exfor/endf.htm
 
-    # masks
-    mask_th = E <= E_th
-    mask_fast = E >= E_fast
-    mask_mid = (~mask_th) & (~mask_fast)
+    ----------------
+    :param X: string
+        nuclide or nucleon (for a neutron), follows the atomic notation of the element,
+        e.g.: for Uranium-235, X = 'U235'
+    :param Transfo: string
+        name of the considered transformation, should be one of:
+        ['Fission', 'Capture']
+    :param E_neutron: array-like
+        energy(ies) of the incident neutron in [eV]
+        expected range [1e-5; 2e7] [eV]
+    :return: numpy array of same shape as E_neutron
+        cross section in [barn]
+    """
 
-    key_th = (X, Transfo, "th")
-    key_fast = (X, Transfo)
+    E = np.array(E_neutron, dtype=float)
 
-    if key_th not in sig and key_fast not in sig_fast:
+    key = (X, Transfo)
+    if key not in LIBRARY.index:
         print("\n WARNING : No cross section data for", X, "/", Transfo)
-        return sigma
-
-    # thermal region
-    if key_th in sig:
-        sigma[mask_th] = sig[key_th]
-
-    # fast region
-    if key_fast in sig_fast:
-        sigma[mask_fast] = sig_fast[key_fast]
-
-    # intermediate region: log-linear interpolation between thermal and fast values
-    if np.any(mask_mid):
-        # if one of the endpoints is missing, just use the one we have
-        sigma_mid = np.zeros_like(E[mask_mid])
-
-        if key_th in sig and key_fast in sig_fast:
-            s_th = sig[key_th]
-            s_fast = sig_fast[key_fast]
-            logE = np.log(E[mask_mid])
-            logE_th = np.log(E_th)
-            logE_fast = np.log(E_fast)
-            w = (logE - logE_th) / (logE_fast - logE_th)
-            sigma_mid = s_th + w * (s_fast - s_th)
-        elif key_th in sig:
-            sigma_mid[:] = sig[key_th]
-        elif key_fast in sig_fast:
-            sigma_mid[:] = sig_fast[key_fast]
-
-        sigma[mask_mid] = sigma_mid
-
-    return sigma
+        return np.zeros_like(E)
+
+    return LIBRARY.evaluate([LIBRARY.index[key]], E)[0].reshape(E.shape)
 
 
 # Simple test
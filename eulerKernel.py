@@ -0,0 +1,447 @@
+# eulerKernel.py
+
+import time
+import warnings
+
+import numpy as np
+
+
+BACKENDS = ("numpy", "numba")
+
+
+def euler_steps(E, y, G, Sigma_th, rod, E_rod, q, Q_fission, dt, n_steps,
+                use_control, P_nom, K_p, Sigma_min, Sigma_max,
+                rec_steps, idx, Y_out, P_out, Sigma_th_out, E_out, P_sum=0.0):
+    """
+    Explicit Euler loop of reactorModel written with scalar loops only, so
+    that it compiles in numba nopython mode. Same update as the numpy loop
+    of reactorModel._run_euler: [y_{k+1}, F_tot_k] = E @ [vec(n ⊗ N), y_k],
+    clamp, power, proportional rod controller. Scalar twin of the step
+    helpers of the numpy loops below (_assemble, _update, _control), which
+    nopython mode cannot call: a change of the step goes in both.
+
+    ----------------
+    :param E: 2-D array, ReactorSystem.euler_operator(dt), modified in place
+        on the rod diagonal entries
+    :param y: 1-D array, state [n, N], advanced in place
+    :param rod, E_rod: indices of the rod groups and their diagonal entries
+        of E at Sigma_th = 0
+    :param rec_steps: recorded steps (increasing)
+    :param idx: recorded entries of y
+    :param Y_out, P_out, Sigma_th_out, E_out: histories filled in place,
+        P_out, Sigma_th_out and E_out of length 0 when not recorded. E_out
+        gets P_sum - P / 2 at the recorded steps, the trapezoidal sum of the
+        powers of the full step grid without the first half step (energy
+        dt * (E_out - P_first / 2), see reactorModel._energy)
+    :param P_sum: running sum the powers of the steps are added to one by
+        one, so that a run cut into blocks sums in the same order as in one go
+    :return: (Sigma_th, P_sum + sum of P, first P, last P) at the end of the loop
+    """
+
+    R, W = E.shape
+    m = y.shape[0]
+    n = m - G
+    GN = W - m
+    w = np.empty(W)
+
+    P_first = 0.0
+    P = 0.0
+    j = 0
+    n_rec = rec_steps.shape[0]
+
+    for k in range(n_steps):
+        for r in range(rod.shape[0]):
+            E[rod[r], GN + rod[r]] = E_rod[r] - dt * Sigma_th
+
+        for g in range(G):
+            for i in range(n):
+                w[g * n + i] = y[g] * y[G + i]
+        for i in range(m):
+            w[GN + i] = y[i]
+
+        # y_{k+1} = E @ w (clamp), F_tot = dernière ligne
+        for r in range(m):
+            acc = 0.0
+            for c in range(W):
+                acc += E[r, c] * w[c]
+            y[r] = max(acc, 0.0)
+        F_tot = 0.0
+        for c in range(W):
+            F_tot += E[R - 1, c] * w[c]
+
+        P = Q_fission * F_tot
+        for i in range(m):
+            P += q[i] * y[i]
+        P_sum += P
+        if k == 0:
+            P_first = P
+
+        if use_control:
+            Sigma_th += K_p * (P - P_nom) * dt
+            Sigma_th = max(Sigma_min, min(Sigma_max, Sigma_th))
+
+        if j < n_rec and k == rec_steps[j]:
+            for i in range(idx.shape[0]):
+                Y_out[j, i] = y[idx[i]]
+            if P_out.shape[0] > 0:
+                P_out[j] = P
+            if Sigma_th_out.shape[0] > 0:
+                Sigma_th_out[j] = Sigma_th
+            if E_out.shape[0] > 0:
+                E_out[j] = P_sum - 0.5 * P
+            j += 1
+
+    return Sigma_th, P_sum, P_first, P
+
+
+# ------------------- PAS COMMUN DES BOUCLES NUMPY -------------------
+#
+# Les fonctions ci-dessous traitent un cas (y de forme (m,)) ou un lot de
+# B cas (y de forme (B, m)) ; un pas s'écrit
+#     np.multiply(n_view, N_view, out=bil)
+#     _assemble(...) ; P = _update(...) ; Sigma_th = _control(...)
+#     _record(...) aux pas enregistrés
+
+def _work(E, y, G):
+    """
+    Work arrays of a loop: w = [vec(n ⊗ N), y] so that a step is a single
+    product z = E @ w, and its views (bil = n ⊗ N, y_w = y, n_view and
+    N_view broadcast to n ⊗ N, z_y = z without the F_tot row).
+    :return: (w, bil, y_w, n_view, N_view, z, z_y)
+    """
+    R, W = E.shape[-2:]
+    lead = y.shape[:-1]
+    m = y.shape[-1]
+    GN = W - m
+    w = np.empty(lead + (W,))
+    w[..., GN:] = y
+    bil = w[..., :GN].reshape(lead + (G, m - G))
+    y_w = w[..., GN:]
+    z = np.empty(lead + (R,))
+    return w, bil, y_w, y_w[..., :G, None], y_w[..., None, G:], z, z[..., :-1]
+
+
+def _assemble(E, w, z, rod, diag_rod, rod_entries):
+    """Rod diagonal entries of E, then z = E @ w ([y_{k+1}, F_tot_k] before the clamp)."""
+    E[..., rod, diag_rod] = rod_entries
+    if w.ndim == 1:
+        np.matmul(E, w, out=z)
+    else:
+        np.matmul(E, w[..., None], out=z[..., None])
+
+
+def _update(z, z_y, y_w, q, Q_fission):
+    """Clamp (évite les valeurs < 0 numériques) and power of the step."""
+    np.maximum(z_y, 0.0, out=y_w)
+    if y_w.ndim == 1:
+        return Q_fission * z[-1] + q @ y_w
+    if q.ndim == 2:
+        return Q_fission * z[:, -1] + np.einsum("bi,bi->b", y_w, q)
+    return Q_fission * z[:, -1] + y_w @ q
+
+
+def _control(Sigma_th, P, use_control, P_nom, K_p, dt, Sigma_min, Sigma_max):
+    """Proportional rod controller, bounded by [Sigma_min, Sigma_max]."""
+    if isinstance(Sigma_th, np.ndarray):
+        # cas sans contrôle : gain nul, Sigma_th reste dans [min, max]
+        Sigma_th = Sigma_th + np.where(use_control, K_p, 0.0) * dt * (P - P_nom)
+        return np.clip(Sigma_th, Sigma_min, Sigma_max, out=Sigma_th)
+    if use_control:
+        Sigma_th += K_p * (P - P_nom) * dt
+        Sigma_th = max(Sigma_min, min(Sigma_max, Sigma_th))
+    return Sigma_th
+
+
+def _record(j, y_w, idx, P, Sigma_th, P_sum, Y_out, P_out, Sigma_th_out, E_out):
+    """Recorded step j: entries idx of y, P, Sigma_th and P_sum - P / 2 when kept."""
+    Y_out[j] = y_w[..., idx]
+    if len(P_out):
+        P_out[j] = P
+    if len(Sigma_th_out):
+        Sigma_th_out[j] = Sigma_th
+    if len(E_out):
+        E_out[j] = P_sum - 0.5 * P
+
+
+def euler_steps_numpy(E, y, G, Sigma_th, rod, E_rod, q, Q_fission, dt, n_steps,
+                      use_control, P_nom, K_p, Sigma_min, Sigma_max,
+                      rec_steps, idx, Y_out, P_out, Sigma_th_out, E_out, P_sum=0.0):
+    """
+    Same loop and signature as euler_steps, one numpy matrix-vector product
+    per step. Also advances a batch of cases with the shapes of
+    euler_steps_batch.
+    """
+
+    w, bil, y_w, n_view, N_view, z, z_y = _work(E, y, G)
+    diag_rod = E.shape[-1] - y.shape[-1] + rod
+    batch = y.ndim == 2
+
+    # énergie : trapèzes sur la grille complète, sans stocker P
+    P_sum = P_sum + np.zeros(len(y)) if batch else float(P_sum)
+    P_first = P = 0.0
+    j = 0
+    next_rec = rec_steps[0] if len(rec_steps) else -1
+
+    for k in range(n_steps):
+        np.multiply(n_view, N_view, out=bil)
+        _assemble(E, w, z, rod, diag_rod,
+                  E_rod - dt * (Sigma_th[:, None] if batch else Sigma_th))
+        P = _update(z, z_y, y_w, q, Q_fission)
+        P_sum += P
+        if k == 0:
+            P_first = P
+
+        # --- Contrôle automatique des barres ---
+        Sigma_th = _control(Sigma_th, P, use_control, P_nom, K_p, dt, Sigma_min, Sigma_max)
+
+        # stockage
+        if k == next_rec:
+            _record(j, y_w, idx, P, Sigma_th, P_sum, Y_out, P_out, Sigma_th_out, E_out)
+            j += 1
+            next_rec = rec_steps[j] if j < len(rec_steps) else -1
+
+    y[:] = y_w
+    return Sigma_th, P_sum, P_first, P
+
+
+def euler_steps_batch(E, y, G, Sigma_th, rod, E_rod, q, Q_fission, dt, n_steps,
+                      use_control, P_nom, K_p, Sigma_min, Sigma_max,
+                      rec_steps, idx, Y_out, P_out, Sigma_th_out, E_out, P_sum=0.0):
+    """
+    euler_steps_numpy for B independent cases advanced together, one
+    batched matrix product per step.
+
+    ----------------
+    :param E: 3-D array (B, G+n+1, W), one Euler operator per case
+    :param y: 2-D array (B, G+n), advanced in place
+    :param Sigma_th, use_control, P_nom, K_p: 1-D arrays (B,)
+    :param E_rod: 2-D array (B, len(rod))
+    :param q: 1-D array (G+n,) shared by the cases, or 2-D (B, G+n)
+    :param Y_out: 3-D array (K, B, len(idx)); P_out, Sigma_th_out, E_out of
+        shape (K, B), or (0, B) when not recorded
+    :param P_sum: float or 1-D array (B,)
+    :return: (Sigma_th, P_sum + sum of P, first P, last P), arrays (B,)
+    """
+    return euler_steps_numpy(E, y, G, np.array(Sigma_th, dtype=float), rod, E_rod, q,
+                             Q_fission, dt, n_steps, use_control, P_nom, K_p,
+                             Sigma_min, Sigma_max, rec_steps, idx, Y_out, P_out, Sigma_th_out,
+                             E_out, P_sum)
+
+
+def euler_steps_tangent(E, dE, y, dy, G, Sigma_th, dSigma, rod, E_rod, q, dq, Q_fission, dt,
+                        n_steps, use_control, P_nom, K_p, Sigma_min, Sigma_max,
+                        rec_steps, idx, Y_out, P_out, Sigma_th_out, E_out, d_idx, dY_out, dP_out,
+                        dS_out):
+    """
+    euler_steps_numpy with the tangent-linear model of the step carried
+    along for n_p parameters p at once: dy = dy/dp of shape (G+n, n_p) and
+    dSigma = dSigma_th/dp of shape (n_p,). The derivative of one step is
+
+        dz = E @ dw + dE/dp @ w - dt * Sigma'(p) * rod * n
+        dw = [vec(dn ⊗ N + n ⊗ dN), dy]
+
+    with the clamped entries and a saturated controller giving a zero
+    derivative, so that the tangents are the exact derivatives of the
+    discrete Euler solution.
+
+    ----------------
+    :param dE: 2-D array (W, (G+n+1) * n_p), derivatives of the Euler
+        operator laid out so that w @ dE = vec(dE/dp @ w), p varying fastest
+    :param dq: 2-D array (G+n, n_p), derivatives of q
+    :param dy, dSigma: tangents, advanced in place
+    :param d_idx: entries of y whose tangents go to dY_out (K, len(d_idx), n_p)
+    :param dP_out, dS_out: (K, n_p), or (0, n_p) when not recorded
+    :return: (Sigma_th, sum of P, first P, last P, sum of dP, first dP, last dP)
+    """
+
+    w, bil, y_w, n_view, N_view, z, z_y = _work(E, y, G)
+    R, W = E.shape
+    m = y.shape[0]
+    GN = W - m
+    n_p = dq.shape[1]
+    diag_rod = GN + rod
+
+    # tangentes : dw (W, n_p) et ses vues, comme w
+    dw = np.empty((W, n_p))
+    dw[GN:] = dy
+    d_bil = dw[:GN].reshape(G, m - G, n_p)
+    dy_w = dw[GN:]
+    dn_view = dy_w[:G, None, :]
+    dN_view = dy_w[None, G:, :]
+    N_col = y_w[G:, None]
+    dz = np.empty((R, n_p))
+    dz_data = np.empty(R * n_p)
+    tmp = np.empty((G, m - G, n_p))
+    dSigma = np.array(dSigma, dtype=float)
+
+    P_sum = 0.0
+    P_first = P = 0.0
+    dP_sum = np.zeros(n_p)
+    dP_first = dP = np.zeros(n_p)
+    j = 0
+    next_rec = rec_steps[0] if len(rec_steps) else -1
+
+    for k in range(n_steps):
+        np.multiply(n_view, N_view, out=bil)
+        np.multiply(dn_view, N_col, out=d_bil)
+        np.multiply(n_view[..., None], dN_view, out=tmp)
+        d_bil += tmp
+
+        dz_rod = dt * y_w[rod, None] * dSigma[None, :]
+        _assemble(E, w, z, rod, diag_rod, E_rod - dt * Sigma_th)
+        np.matmul(E, dw, out=dz)
+        np.matmul(w, dE, out=dz_data)
+        dz += dz_data.reshape(R, n_p)
+        dz[rod] -= dz_rod
+
+        # clamp : dérivée nulle sur les entrées ramenées à 0
+        np.multiply(dz[:-1], (z_y > 0.0)[:, None], out=dy_w)
+        P = _update(z, z_y, y_w, q, Q_fission)
+        dP = Q_fission * dz[-1] + q @ dy_w + y_w @ dq
+        P_sum += P
+        dP_sum += dP
+        if k == 0:
+            P_first = P
+            dP_first = dP
+
+        S_free = Sigma_th + K_p * (P - P_nom) * dt
+        Sigma_th = _control(Sigma_th, P, use_control, P_nom, K_p, dt, Sigma_min, Sigma_max)
+        if use_control:
+            dSigma += K_p * dt * dP
+            if Sigma_th != S_free:
+                dSigma[:] = 0.0
+
+        if k == next_rec:
+            _record(j, y_w, idx, P, Sigma_th, P_sum, Y_out, P_out, Sigma_th_out, E_out)
+            dY_out[j] = dy_w[d_idx]
+            if len(dP_out):
+                dP_out[j] = dP
+            if len(dS_out):
+                dS_out[j] = dSigma
+            j += 1
+            next_rec = rec_steps[j] if j < len(rec_steps) else -1
+
+    y[:] = y_w
+    dy[:] = dy_w
+    return Sigma_th, P_sum, P_first, P, dSigma, dP_sum, dP_first, dP
+
+
+# phases d'un pas mesurées par euler_steps_profiled
+PHASES = ("rates", "assembly", "update", "controller", "storage")
+
+
+class StepProfile:
+    """
+    Accumulated timings [s] of the phases of the Euler steps (PHASES: rates
+    = bilinear products n ⊗ N, assembly = rod entries and matrix-vector
+    product, update = clamp and power, controller, storage) and counters:
+    steps, clamped entries, steps with at least one clamp, steps with the
+    rod controller saturated at Sigma_min / Sigma_max.
+    """
+
+    def __init__(self):
+        self.time = dict.fromkeys(PHASES, 0.0)
+        self.counts = {"steps": 0, "clamped_entries": 0, "clamped_steps": 0,
+                       "saturated_min": 0, "saturated_max": 0}
+
+    def report(self):
+        total = sum(self.time.values())
+        return {"time": dict(self.time), "total_time": total,
+                "share": {k: (v / total if total > 0 else 0.0) for k, v in self.time.items()},
+                "counts": dict(self.counts)}
+
+
+def euler_steps_profiled(E, y, G, Sigma_th, rod, E_rod, q, Q_fission, dt, n_steps,
+                         use_control, P_nom, K_p, Sigma_min, Sigma_max,
+                         rec_steps, idx, Y_out, P_out, Sigma_th_out, E_out, profile,
+                         P_sum=0.0):
+    """
+    euler_steps_numpy with timers around each phase of a step and the
+    counters of profile (StepProfile), updated in place. Kept apart so that
+    the other loops pay nothing for it.
+    """
+
+    clock = time.perf_counter
+    T = profile.time
+    C = profile.counts
+    t_rates = t_assembly = t_update = t_control = t_storage = 0.0
+
+    w, bil, y_w, n_view, N_view, z, z_y = _work(E, y, G)
+    diag_rod = E.shape[-1] - y.shape[-1] + rod
+
+    P_sum = float(P_sum)
+    P_first = P = 0.0
+    j = 0
+    next_rec = rec_steps[0] if len(rec_steps) else -1
+    clamped = clamped_steps = sat_min = sat_max = 0
+
+    for k in range(n_steps):
+        t0 = clock()
+        np.multiply(n_view, N_view, out=bil)
+        t1 = clock()
+        _assemble(E, w, z, rod, diag_rod, E_rod - dt * Sigma_th)
+        t2 = clock()
+        neg = np.count_nonzero(z_y < 0.0)
+        P = _update(z, z_y, y_w, q, Q_fission)
+        P_sum += P
+        if k == 0:
+            P_first = P
+        t3 = clock()
+        Sigma_th = _control(Sigma_th, P, use_control, P_nom, K_p, dt, Sigma_min, Sigma_max)
+        if use_control:
+            if Sigma_th == Sigma_min:
+                sat_min += 1
+            elif Sigma_th == Sigma_max:
+                sat_max += 1
+        t4 = clock()
+        if k == next_rec:
+            _record(j, y_w, idx, P, Sigma_th, P_sum, Y_out, P_out, Sigma_th_out, E_out)
+            j += 1
+            next_rec = rec_steps[j] if j < len(rec_steps) else -1
+        t5 = clock()
+
+        if neg:
+            clamped += neg
+            clamped_steps += 1
+        t_rates += t1 - t0
+        t_assembly += t2 - t1
+        t_update += t3 - t2
+        t_control += t4 - t3
+        t_storage += t5 - t4
+
+    for key, value in zip(PHASES, (t_rates, t_assembly, t_update, t_control, t_storage)):
+        T[key] += value
+    C["steps"] += n_steps
+    C["clamped_entries"] += clamped
+    C["clamped_steps"] += clamped_steps
+    C["saturated_min"] += sat_min
+    C["saturated_max"] += sat_max
+
+    y[:] = y_w
+    return Sigma_th, P_sum, P_first, P
+
+
+_KERNEL = []
+
+
+def get_kernel(backend):
+    """
+    Euler loop of a backend: euler_steps_numpy for 'numpy', euler_steps
+    compiled by numba in nopython mode for 'numba'. numba is imported and
+    the kernel compiled on the first request only (cached on disk between
+    processes); without numba a RuntimeWarning is issued and the numpy loop
+    is returned.
+    """
+    if backend not in BACKENDS:
+        raise ValueError("Unknown backend '%s', expected one of %s" % (backend, BACKENDS))
+    if backend == "numpy":
+        return euler_steps_numpy
+    if not _KERNEL:
+        try:
+            import numba
+        except ImportError:
+            warnings.warn("numba not available, using the numpy backend", RuntimeWarning,
+                          stacklevel=2)
+            return euler_steps_numpy
+        _KERNEL.append(numba.njit(cache=True)(euler_steps))
+    return _KERNEL[0]
@@ -0,0 +1,128 @@
+# events.py
+
+import numpy as np
+
+
+class Event:
+    """
+    Event of a reactorModel run, located where fun changes sign:
+
+        fun(t, n, N, Sigma_th, P) -> double
+
+    with t [s], n the neutron populations (fastest group first), N the
+    inventory (order of the chain), Sigma_th [1/s] and P [W].
+
+    Events are plain objects (or module-level functions) so that they can be
+    sent to the worker processes of sweep.run_sweep.
+
+    The 'euler' loop samples fun every reactorModel.EVENT_STEPS steps: a
+    zero crossed and crossed back between two samples is missed.
+
+    ----------------
+    :param fun: callable or None (subclasses define value())
+    :param name: string, key of the event in the results
+    :param terminal: bool, stop the run at the event
+    :param direction: +1 only from negative to non-negative values, -1 only
+        from positive to non-positive values, 0 both
+    """
+
+    def __init__(self, fun=None, name=None, terminal=True, direction=0):
+        self.fun = fun
+        self.name = name or getattr(fun, "__name__", type(self).__name__)
+        self.terminal = terminal
+        self.direction = direction
+
+    def value(self, t, n, N, Sigma_th, P):
+        return self.fun(t, n, N, Sigma_th, P)
+
+    def __call__(self, t, n, N, Sigma_th, P):
+        return float(self.value(t, n, N, Sigma_th, P))
+
+    def crossed(self, g0, g1):
+        """Whether the values g0 -> g1 at two successive times cross zero in the direction."""
+        up = g0 < 0.0 <= g1
+        down = g0 > 0.0 >= g1
+        if self.direction > 0:
+            return up
+        if self.direction < 0:
+            return down
+        return up or down
+
+    def __repr__(self):
+        return "%s(name=%r, terminal=%r, direction=%r)" % (
+            type(self).__name__, self.name, self.terminal, self.direction)
+
+
+class PowerThreshold(Event):
+    """P crossing P_lim [W]: upwards (direction=+1, e.g. divergence) or downwards (-1)."""
+
+    def __init__(self, P_lim, direction=1, terminal=True, name=None):
+        Event.__init__(self, name=name or "power_threshold", terminal=terminal, direction=direction)
+        self.P_lim = P_lim
+
+    def value(self, t, n, N, Sigma_th, P):
+        return P - self.P_lim
+
+
+class SigmaSaturation(Event):
+    """Rod absorption Sigma_th reaching Sigma_min or Sigma_max (from inside the range)."""
+
+    def __init__(self, Sigma_min, Sigma_max, terminal=True, name=None):
+        Event.__init__(self, name=name or "Sigma_saturation", terminal=terminal, direction=-1)
+        self.Sigma_min = Sigma_min
+        self.Sigma_max = Sigma_max
+
+    def value(self, t, n, N, Sigma_th, P):
+        return min(Sigma_th - self.Sigma_min, self.Sigma_max - Sigma_th)
+
+
+class SteadyState(Event):
+    """
+    Power entering the band |P / P_target - 1| <= tol (the settling criterion
+    of sweep.settling_time), not before t_min [s] so that the first pass of
+    an oscillating transient can be skipped.
+    """
+
+    def __init__(self, P_target, tol=0.01, t_min=0.0, terminal=True, name=None):
+        Event.__init__(self, name=name or "steady_state", terminal=terminal, direction=-1)
+        self.P_target = P_target
+        self.tol = tol
+        self.t_min = t_min
+
+    def value(self, t, n, N, Sigma_th, P):
+        if t < self.t_min:
+            return 1.0
+        return abs(P / self.P_target - 1.0) - self.tol
+
+
+class NegativeInventory(Event):
+    """
+    Some neutron population or nuclide inventory dropping below -atol.
+    Stiff methods only: the explicit Euler loop clamps negative values to 0
+    at every step, before the events see the state, so that the event can
+    never fire there (reactorModel warns); its clamps are counted by
+    profile=True instead.
+    """
+
+    def __init__(self, atol=1e-6, terminal=True, name=None):
+        Event.__init__(self, name=name or "negative_inventory", terminal=terminal, direction=-1)
+        self.atol = atol
+
+    def value(self, t, n, N, Sigma_th, P):
+        return min(np.min(n), np.min(N)) + self.atol
+
+
+def event_list(events):
+    """None, one Event or a list of them -> list."""
+    if events is None:
+        return []
+    if callable(events):
+        events = [events]
+    return [e if isinstance(e, Event) else Event(e) for e in events]
+
+
+def interpolate_crossing(t0, t1, g0, g1):
+    """Time of the zero of g by linear interpolation between (t0, g0) and (t1, g1)."""
+    if g1 == g0:
+        return t1
+    return t0 + (t1 - t0) * g0 / (g0 - g1)
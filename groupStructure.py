@@ -0,0 +1,97 @@
+# groupStructure.py
+
+import numpy as np
+
+import crossSection as cS
+
+
+EV_TO_J = 1.602e-19
+M_NEUTRON = 1.6749e-27  # [kg]
+
+
+def neutron_speed(E):
+    """Speed [m/s] of a neutron of kinetic energy E [eV]."""
+    return np.sqrt(2.0 * np.asarray(E, dtype=float) * EV_TO_J / M_NEUTRON)
+
+
+def downscatter_matrix(energies, lambda_ref, lethargy_ref):
+    """
+    Slowing-down matrix between groups of representative energies
+    `energies` (fastest first): group g feeds group g+1 at the rate
+
+        lambda_g = lambda_ref * lethargy_ref / ln(E_g / E_{g+1})
+
+    so that crossing a lethargy lethargy_ref takes the same time whatever
+    the number of groups. With two groups E_g / E_{g+1} = exp(lethargy_ref)
+    this is the single rate lambda_ref.
+
+    ----------------
+    :param energies: array-like (G,), in [eV], decreasing
+    :param lambda_ref: double, reference slowing-down rate [1/s]
+    :param lethargy_ref: double, lethargy width it refers to
+    :return: (S, frac)
+        S: array (G, G), dn/dt = S @ n for the slowing-down alone
+        frac: array (G,), share of lethargy_ref crossed by the transfer out
+        of each group (0 for the last one), to split the slowing-down energy
+    """
+    E = np.asarray(energies, dtype=float)
+    G = len(E)
+    du = np.log(E[:-1] / E[1:])
+    lam = lambda_ref * (lethargy_ref / du)
+
+    S = np.zeros((G, G))
+    g = np.arange(G - 1)
+    S[g, g] -= lam
+    S[g + 1, g] += lam
+    frac = np.zeros(G)
+    frac[:-1] = du / lethargy_ref
+    return S, frac
+
+
+class GroupStructure:
+    """
+    Neutron energy groups given by their boundaries.
+
+    Each group is sampled at n_points energies equally spaced in lethargy,
+    i.e. weighted by a 1/E flux: cross sections are averaged over these
+    points and the group speed is the inverse of the average of 1/v.
+
+    ----------------
+    :param boundaries: array-like (G+1,)
+        group boundaries in [eV], > 0, in any order (groups are stored
+        fastest first)
+    :param n_points: int
+        sampling points per group
+    """
+
+    def __init__(self, boundaries, n_points=64):
+        b = np.sort(np.asarray(boundaries, dtype=float))[::-1]
+        if len(b) < 3 or b[-1] <= 0.0 or np.any(np.diff(b) == 0.0):
+            raise ValueError("need at least 3 distinct positive boundaries, got %s" % (boundaries,))
+        self.boundaries = b
+        self.G = len(b) - 1
+
+        # point milieu (en léthargie) de chaque groupe
+        self.energies = np.sqrt(b[:-1] * b[1:])
+        u = (np.arange(n_points) + 0.5) / n_points
+        self.E_points = b[1:, None] * (b[:-1] / b[1:])[:, None] ** u[None, :]
+        self.speeds = 1.0 / np.mean(1.0 / neutron_speed(self.E_points), axis=1)
+
+    def __len__(self):
+        return self.G
+
+    def key(self):
+        return ("groups",) + tuple(self.boundaries) + (self.E_points.shape[1],)
+
+    def collapse(self, ids, library=None):
+        """
+        Group-averaged cross sections [barn] of the pairs ids of a
+        crossSection.CrossSectionLibrary, shape (len(ids), G).
+        """
+        library = cS.LIBRARY if library is None else library
+        sigma = library.evaluate(ids, self.E_points.ravel())
+        return sigma.reshape(len(sigma), self.G, -1).mean(axis=2)
+
+    def downscatter(self, lambda_ref, lethargy_ref):
+        """downscatter_matrix() at the group energies."""
+        return downscatter_matrix(self.energies, lambda_ref, lethargy_ref)
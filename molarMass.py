@@ -53,6 +53,7 @@ MOLAR_MASS_DB = {
     # Plutonium
     "Pu239": 239.0522e-3,
     "Pu240": 240.0538e-3,
+    "Pu241": 241.0568e-3,
 
     # Xenon
     "Xe135": 134.9072e-3,
@@ -0,0 +1,186 @@
+# nuclearData.py
+
+import json
+
+import numpy as np
+
+import crossSection as cS
+from groupStructure import GroupStructure
+
+
+NA = 6.022e23           # [1/mol]
+
+
+def _builtin_tables():
+    """Tables of the data modules molarMass and halfLife."""
+    import molarMass as mM
+    import halfLife as hL
+
+    half_life = {}
+    for (X, mode), T in hL.HL_DB.items():
+        half_life.setdefault(X, {})[mode] = T
+    return {"molar_mass": dict(mM.MOLAR_MASS_DB), "half_life": half_life}
+
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class NuclearData:
+    """
+    Single registry of the nuclide data (molar masses, half-lives, cross
+    sections), keyed on the usual names ('U235', 'Xe135', 'FP').
+
+    The tables are read on first use from a list of sources, later sources
+    overriding earlier ones: the molarMass / halfLife modules by default,
+    or JSON files of the form
+        {"molar_mass": {"I135": 0.1349}, "half_life": {"I135": {"BetaMinus": 23652.0}}}
+
+    Each nuclide gets a stable integer ID on first use (IDs are never
+    reassigned), and derived quantities (decay constants, atoms per kg,
+    group cross sections) are computed once and cached as arrays indexed by
+    ID. Missing data gives 0, is listed in `missing` and reported once.
+
+    ----------------
+    :param sources: list of callables returning a dict, or JSON file paths
+    """
+
+    def __init__(self, sources=None):
+        self.sources = [_builtin_tables] if sources is None else list(sources)
+        self.names = []
+        self.ids = {}
+        self.missing = set()
+        self._tables = None
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self._decay = {}
+        self._arrays = {}
+        self._group_xs = {}
+
+    def add_source(self, source):
+        """Append a source (JSON path or callable); cached values are dropped, IDs kept."""
+        self.sources.append(source)
+        self._tables = None
+        self._reset_cache()
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            tables = {"molar_mass": {}, "half_life": {}}
+            for source in self.sources:
+                data = source() if callable(source) else _read_json(source)
+                tables["molar_mass"].update(data.get("molar_mass", {}))
+                for X, modes in data.get("half_life", {}).items():
+                    tables["half_life"].setdefault(X, {}).update(modes)
+            self._tables = tables
+        return self._tables
+
+    def _miss(self, what, key):
+        if (what, key) not in self.missing:
+            self.missing.add((what, key))
+            print("\n WARNING : No %s in database for %s" % (what, key))
+
+    # --- identifiants ---
+
+    def id(self, X):
+        """Integer ID of nuclide X, assigned on first call."""
+        if X not in self.ids:
+            self.ids[X] = len(self.names)
+            self.names.append(X)
+        return self.ids[X]
+
+    def id_array(self, nuclides):
+        return np.array([self.id(X) for X in nuclides], dtype=np.int64)
+
+    # --- valeurs ponctuelles ---
+
+    def molar_mass(self, X):
+        """Molar mass [kg/mol], 0 if unknown."""
+        M = self.tables["molar_mass"].get(X)
+        if M is None:
+            self._miss("molar mass", X)
+            return 0.0
+        return M
+
+    def half_life(self, X, mode):
+        """Half-life [s] of X for the decay mode, 0 if unknown (stable)."""
+        T = self.tables["half_life"].get(X, {}).get(mode)
+        if T is None:
+            self._miss("half-life", (X, mode))
+            return 0.0
+        return T
+
+    def decay_constant(self, X, mode):
+        """ln(2) / T_1/2 [1/s], 0 for an unknown or non-positive half-life; memoized."""
+        key = (X, mode)
+        if key not in self._decay:
+            T = self.half_life(X, mode)
+            self._decay[key] = np.log(2.0) / T if T > 0 else 0.0
+        return self._decay[key]
+
+    # --- tableaux indexés par ID ---
+
+    def _array(self, name, fun):
+        arr = self._arrays.get(name)
+        if arr is None or len(arr) != len(self.names):
+            arr = np.array([fun(X) for X in self.names], dtype=float)
+            arr.setflags(write=False)
+            self._arrays[name] = arr
+        return arr
+
+    def molar_masses(self, ids=None):
+        """Molar masses [kg/mol] of all registered nuclides (or of ids)."""
+        arr = self._array("molar_mass", self.molar_mass)
+        return arr if ids is None else arr[ids]
+
+    def atoms_per_kg(self, ids=None):
+        """NA / M [1/kg], 0 where the molar mass is unknown."""
+        M = self.molar_masses()
+        arr = self._arrays.get("atoms_per_kg")
+        if arr is None or len(arr) != len(M):
+            arr = np.divide(NA, M, out=np.zeros_like(M), where=M > 0)
+            arr.setflags(write=False)
+            self._arrays["atoms_per_kg"] = arr
+        return arr if ids is None else arr[ids]
+
+    def total_decay_constants(self, ids=None):
+        """Sum of the decay constants over all tabulated modes [1/s]."""
+        def total(X):
+            return sum(self.decay_constant(X, mode) for mode in self.tables["half_life"].get(X, {}))
+        arr = self._array("lambda_total", total)
+        return arr if ids is None else arr[ids]
+
+    def group_xs(self, nuclides, reactions, energies, library=None):
+        """
+        Cross sections [barn] of nuclides x reactions per group, shape
+        (G, len(nuclides), len(reactions)), and the (nuclides, reactions)
+        mask of missing pairs. energies: group energies [eV] or a
+        groupStructure.GroupStructure (group-averaged values). Memoized.
+        """
+        library = cS.LIBRARY if library is None else library
+        if isinstance(energies, GroupStructure):
+            gkey = energies.key()
+        else:
+            gkey = tuple(float(E) for E in np.atleast_1d(energies))
+        key = (library, gkey, tuple(nuclides), tuple(reactions))
+
+        if key not in self._group_xs:
+            self.id_array(nuclides)
+            ids = library.pair_ids(nuclides, reactions)
+            missing = ids < 0
+            if isinstance(energies, GroupStructure):
+                table = energies.collapse(np.maximum(ids, 0).ravel(), library)
+            else:
+                table = library.evaluate(np.maximum(ids, 0).ravel(), gkey)
+            table[missing.ravel()] = 0.0
+            xs = np.ascontiguousarray(table.T).reshape((table.shape[1],) + ids.shape)
+            xs.setflags(write=False)
+            missing.setflags(write=False)
+            self._group_xs[key] = (xs, missing)
+        return self._group_xs[key]
+
+
+# registre par défaut
+REGISTRY = NuclearData()
@@ -0,0 +1,222 @@
+# nuclideChain.py
+
+import copy
+
+import numpy as np
+
+import crossSection as cS
+from groupStructure import GroupStructure
+from nuclearData import REGISTRY
+
+
+# ------------------- TABLE DES NUCLIDES -------------------
+
+# ordre du vecteur d'inventaire
+NUCLIDES = [
+    "U235", "U236", "U237", "U238", "U239",
+    "Np239",
+    "Pu239", "Pu240", "Pu241",
+    "Th232", "Th233", "Pa233", "U233",
+    "FP", "Xe135",
+]
+
+# nom de la clé dans le dictionnaire de résultats de reactorModel
+RESULT_KEYS = {X: "N_" + X for X in NUCLIDES}
+RESULT_KEYS["Xe135"] = "N_Xe"
+
+# table déclarative (parent, réaction, fille)
+# fille = None : le noyau sort de la chaîne suivie (fission, Am241, ...)
+REACTIONS = [
+    # Uranium
+    ("U235", "Fission", None),
+    ("U235", "Capture", "U236"),
+    ("U236", "Fission", None),
+    ("U236", "Capture", "U237"),
+    ("U237", "Fission", None),
+    ("U237", "Capture", "U238"),
+    ("U238", "Fission", None),
+    ("U238", "Capture", "U239"),
+    ("U239", "Fission", None),
+    ("U239", "Capture", None),
+    ("U239", "BetaMinus", "Np239"),
+
+    # Np / Pu
+    ("Np239", "Fission", None),
+    ("Np239", "Capture", None),
+    ("Np239", "BetaMinus", "Pu239"),
+    ("Pu239", "Fission", None),
+    ("Pu239", "Capture", "Pu240"),
+    ("Pu240", "Fission", None),
+    ("Pu240", "Capture", "Pu241"),
+    ("Pu241", "Fission", None),
+    ("Pu241", "Capture", None),
+    ("Pu241", "BetaMinus", None),   # Pu-241 -> Am-241 (non suivi)
+
+    # Filière thorium
+    ("Th232", "Capture", "Th233"),
+    ("Th233", "Fission", None),
+    ("Th233", "Capture", None),
+    ("Th233", "BetaMinus", "Pa233"),
+    ("Pa233", "Fission", None),
+    ("Pa233", "Capture", None),
+    ("Pa233", "BetaMinus", "U233"),
+    ("U233", "Fission", None),
+    ("U233", "Capture", None),
+
+    # Produits de fission
+    ("FP", "BetaMinus", None),
+    ("Xe135", "Capture", None),
+    ("Xe135", "BetaMinus", None),
+]
+
+NEUTRON_REACTIONS = ("Fission", "Capture")
+
+
+def decay_constant(species, transfo):
+    return REGISTRY.decay_constant(species, transfo)
+
+
+class DepletionChain:
+    """
+    Nuclide inventory and transmutation/decay operators in matrix form,
+    built from a declarative (parent, reaction, daughter) table.
+
+    Groups are ordered from the fastest to the slowest neutrons, e.g.
+    energies = [E_FAST, E_TH], cross sections being taken at these
+    energies; with a groupStructure.GroupStructure they are averaged over
+    each group instead.
+
+    ----------------
+    :param nuclides: list of strings
+        tracked species, gives the order of the inventory vector
+    :param reactions: list of (parent, reaction, daughter) tuples
+        reaction is 'Fission', 'Capture' or a decay mode of halfLife
+        (e.g. 'BetaMinus'); daughter is None when the product is not tracked
+    :param energies: array-like or GroupStructure
+        representative energy of each neutron group in [eV], or the groups
+    """
+
+    def __init__(self, nuclides, reactions, energies):
+        self.nuclides = list(nuclides)
+        self.reactions = list(reactions)
+        self.index = {X: i for i, X in enumerate(self.nuclides)}
+        if isinstance(energies, GroupStructure):
+            self.groups = energies
+            self.energies = energies.energies.copy()
+        else:
+            self.groups = None
+            self.energies = np.array(energies, dtype=float)
+
+        n = len(self.nuclides)
+        G = len(self.energies)
+
+        # sections efficaces par groupe [m^2], shape (G, n)
+        self.sigma_fis = np.zeros((G, n))
+        self.sigma_cap = np.zeros((G, n))
+        # transmutation par unité de flux, shape (G, n, n)
+        self.transmutation = np.zeros((G, n, n))
+        # décroissance, shape (n, n)
+        self.decay = np.zeros((n, n))
+        self.lam = np.zeros(n)
+
+        # sections efficaces par groupe du registre (un seul calcul, mis en cache)
+        xs, missing = REGISTRY.group_xs(self.nuclides, NEUTRON_REACTIONS,
+                                        energies if self.groups is not None else self.energies)
+        r_index = {R: r for r, R in enumerate(NEUTRON_REACTIONS)}
+        self.missing_xs = [(X, R) for X, R, _ in reactions
+                           if R in r_index and missing[self.index[X], r_index[R]]]
+        if self.missing_xs:
+            print("\n WARNING : No cross section data for", self.missing_xs)
+
+        for parent, reaction, daughter in reactions:
+            i = self.index[parent]
+            j = None if daughter is None else self.index[daughter]
+
+            if reaction in NEUTRON_REACTIONS:
+                sigma = xs[:, i, r_index[reaction]] * 1e-28
+                if reaction == "Fission":
+                    self.sigma_fis[:, i] += sigma
+                else:
+                    self.sigma_cap[:, i] += sigma
+                self.transmutation[:, i, i] -= sigma
+                if j is not None:
+                    self.transmutation[:, j, i] += sigma
+            else:
+                lam = decay_constant(parent, reaction)
+                self.lam[i] += lam
+                self.decay[i, i] -= lam
+                if j is not None:
+                    self.decay[j, i] += lam
+
+        self.ids = REGISTRY.id_array(self.nuclides)
+        self.molar_mass = REGISTRY.molar_masses(self.ids)
+
+    def __len__(self):
+        return len(self.nuclides)
+
+    def vector(self, values):
+        """Inventory vector from a {nuclide: value} dict (missing -> 0)."""
+        N = np.zeros(len(self.nuclides))
+        for X, value in values.items():
+            N[self.index[X]] = value
+        return N
+
+    def scaled(self, factors):
+        """
+        Copy of the chain with the data of some reactions multiplied by a
+        factor: the cross section of a neutron reaction (all groups), the
+        half-life of a decay.
+        :param factors: dict {(parent, reaction): factor}
+        """
+        chain = copy.copy(self)
+        for name in ("sigma_fis", "sigma_cap", "transmutation", "decay", "lam"):
+            setattr(chain, name, getattr(self, name).copy())
+        daughter = {(X, R): D for X, R, D in self.reactions}
+
+        for (X, R), f in factors.items():
+            if (X, R) not in daughter:
+                raise ValueError("(%s, %s) is not a reaction of the chain" % (X, R))
+            i = self.index[X]
+            j = None if daughter[(X, R)] is None else self.index[daughter[(X, R)]]
+            if R in NEUTRON_REACTIONS:
+                sigma = chain.sigma_fis if R == "Fission" else chain.sigma_cap
+                d = (f - 1.0) * sigma[:, i]
+                sigma[:, i] += d
+                chain.transmutation[:, i, i] -= d
+                if j is not None:
+                    chain.transmutation[:, j, i] += d
+            else:
+                # T -> f T : lambda -> lambda / f
+                d = decay_constant(X, R) * (1.0 / f - 1.0)
+                chain.lam[i] += d
+                chain.decay[i, i] -= d
+                if j is not None:
+                    chain.decay[j, i] += d
+        return chain
+
+    def burnup_matrix(self, flux):
+        """
+        Linear operator A such that dN/dt = A N at fixed group fluxes,
+        fission product yields excluded.
+        :param flux: array-like of shape (G,), group fluxes in [1/(m^2 s)]
+        """
+        return self.decay + np.tensordot(flux, self.transmutation, axes=1)
+
+
+_DEFAULT_CHAINS = {}
+
+
+def default_chain(energies):
+    """
+    Chain of the reactor model (U, Np/Pu, Th/U233, FP, Xe135), built once
+    per set of group energies or GroupStructure and per cross-section
+    library (crossSection.set_library).
+    """
+    if isinstance(energies, GroupStructure):
+        key = energies.key()
+    else:
+        key = tuple(float(E) for E in energies)
+    key = (cS.LIBRARY,) + key
+    if key not in _DEFAULT_CHAINS:
+        _DEFAULT_CHAINS[key] = DepletionChain(NUCLIDES, REACTIONS, energies)
+    return _DEFAULT_CHAINS[key]
@@ -0,0 +1,181 @@
+# plotting.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+DOWNSAMPLING = ("minmax", "lttb")
+
+
+def _bucket_starts(x, n_buckets, xscale="linear"):
+    """First index of each non-empty bucket of equal width in x (or log x)."""
+    x = np.asarray(x, dtype=float)
+    if xscale == "log":
+        pos = x[x > 0]
+        lo = pos[0] if len(pos) else 1.0
+        edges = np.geomspace(lo, max(x[-1], lo), n_buckets + 1)
+    else:
+        edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    starts = np.searchsorted(x, edges[:-1], side="left")
+    starts[0] = 0
+    return np.unique(starts[starts < len(x)])
+
+
+def minmax_indices(x, y, n_buckets, xscale="linear"):
+    """
+    Indices of the points kept by min/max decimation: the first, minimum,
+    maximum and last point of each of n_buckets buckets of x (one per pixel
+    column), so that every peak of the drawn line is preserved. x must be
+    increasing. O(len(x)), without Python loop.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    starts = _bucket_starts(x, n_buckets, xscale)
+    ends = np.append(starts[1:], n) - 1
+    counts = ends - starts + 1
+    pos = np.arange(n)
+
+    # premier indice du min / max de chaque seau
+    y_min = np.repeat(np.minimum.reduceat(y, starts), counts)
+    y_max = np.repeat(np.maximum.reduceat(y, starts), counts)
+    i_min = np.minimum.reduceat(np.where(y == y_min, pos, n), starts)
+    i_max = np.minimum.reduceat(np.where(y == y_max, pos, n), starts)
+
+    keep = np.concatenate((starts, ends, i_min[i_min < n], i_max[i_max < n]))
+    return np.unique(keep)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets
+    (Steinarsson, 2013): in each bucket, the point forming the largest
+    triangle with the point kept in the previous bucket and the mean of the
+    next bucket. Keeps the visual shape with exactly n_out points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nxt = slice(hi, edges[b + 2] if b + 2 < len(edges) else n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+def downsample(x, y, n_points=2000, method="minmax", xscale="linear"):
+    """
+    (x, y) reduced to at most n_points points with a shape-preserving
+    method: 'minmax' (n_points / 4 buckets of up to 4 points, extrema
+    kept) or 'lttb' (exactly n_points). Short series are returned unchanged.
+    """
+    if method not in DOWNSAMPLING:
+        raise ValueError("Unknown downsampling '%s', expected one of %s" % (method, DOWNSAMPLING))
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= n_points:
+        return x, y
+    if method == "minmax":
+        idx = minmax_indices(x, y, max(1, n_points // 4), xscale)
+    else:
+        idx = lttb_indices(x, y, n_points)
+    return x[idx], y[idx]
+
+
+class FigureSpec:
+    """
+    Description of one figure (data and labels only, no matplotlib object),
+    so that it can be downsampled in the main process and drawn in a worker.
+
+    ----------------
+    :param filename: string, output file (format from the extension)
+    :param title, xlabel, ylabel: strings
+    :param xscale, yscale: 'linear' or 'log'
+    :param figsize: (width, height) in inches
+    """
+
+    def __init__(self, filename, title="", xlabel="", ylabel="", xscale="linear",
+                 yscale="linear", figsize=(6.4, 4.8)):
+        self.filename = filename
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.xscale = xscale
+        self.yscale = yscale
+        self.figsize = figsize
+        self.series = []
+
+    def plot(self, x, y, label=None):
+        self.series.append((np.asarray(x), np.asarray(y), label))
+        return self
+
+    def downsampled(self, n_points=None, method="minmax", dpi=100):
+        """Copy with each series downsampled (default: 4 points per pixel column)."""
+        n_points = n_points or 4 * int(self.figsize[0] * dpi)
+        spec = FigureSpec(self.filename, self.title, self.xlabel, self.ylabel,
+                          self.xscale, self.yscale, self.figsize)
+        for x, y, label in self.series:
+            spec.plot(*downsample(x, y, n_points, method, self.xscale), label=label)
+        return spec
+
+
+def render(spec, dpi=100):
+    """
+    Draw a FigureSpec to its file with the Agg canvas (no display, no
+    pyplot state, safe in worker processes). :return: the file name
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for x, y, label in spec.series:
+        ax.plot(x, y, label=label)
+    ax.set_xscale(spec.xscale)
+    ax.set_yscale(spec.yscale)
+    ax.set_xlabel(spec.xlabel)
+    ax.set_ylabel(spec.ylabel)
+    ax.set_title(spec.title)
+    ax.grid(True, which="both" if "log" in (spec.xscale, spec.yscale) else "major")
+    if any(label is not None for _, _, label in spec.series):
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(spec.filename, dpi=dpi)
+    return spec.filename
+
+
+def render_all(specs, directory=None, max_workers=None, n_points=None, method="minmax", dpi=100):
+    """
+    Downsample the figures in this process, then draw them in parallel
+    worker processes (max_workers=1: here, one after the other).
+
+    ----------------
+    :param specs: list of FigureSpec
+    :param directory: string or None, prepended to the file names (created)
+    :param n_points: points per series after downsampling, None -> 4 per
+        pixel column (one min/max bucket per column)
+    :return: list of the written files
+    """
+    specs = [s.downsampled(n_points, method, dpi) for s in specs]
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        for s in specs:
+            s.filename = os.path.join(directory, s.filename)
+
+    if max_workers == 1 or len(specs) == 1:
+        return [render(s, dpi) for s in specs]
+    with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count(), len(specs))) as pool:
+        return list(pool.map(render, specs, [dpi] * len(specs)))
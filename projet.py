@@ -1,6 +1,4 @@
-import numpy as np
-import matplotlib.pyplot as plt
-
+import plotting as pl
 import reactorModel as rm
 
 
@@ -14,31 +12,30 @@ def run_case(label, use_xe=True, use_control=False, t_final= 100.0):
         FPc.Xe135 = 0
         FPc.FP = 100
 
-    # Contrôle de puissance
-    rm.USE_CONTROL = use_control
-    rm.P_NOM = 1e7
-    rm.K_P = 1e-10
-
-    # Lancer la simulation
-    _ = rm.reactorModel(
+    # Lancer la simulation (contrôle de puissance passé explicitement)
+    res = rm.reactorModel(
         fuelCompo=fuel,
         FPCompo=FPc,
         t_final=t_final,
         n_th_init=1e10,
         n_fa_init=0.,
-        mTot=25.
+        mTot=25.,
+        use_control=use_control,
+        P_nom=1e7,
+        K_p=1e-10,
     )
 
-    # Récupération des historiques globaux
-    t = rm.TIME
-    P = rm.P_HIST
-    burnup = rm.BURNUP_HIST
-    NXe = rm.NXE_HIST
-    n_fa = rm.NFA_HIST
-    n_th = rm.NTH_HIST
-    NU = rm.NU_HIST
-    NPu = rm.NPU_HIST
-    Sigma_th_ctrl = rm.SIGMA_TH_CTRL_HIST
+    # Historiques
+    t = res["time"]
+    P = res["power"]
+    # burnup cumulée [MWd/t], calculée à la demande
+    burnup = res.burnup_MWd_t
+    NXe = res["N_Xe"]
+    n_fa = res["n_fast"]
+    n_th = res["n_thermal"]
+    NU = res["N_U235"]
+    NPu = res["N_Pu239"]
+    Sigma_th_ctrl = res["Sigma_th"]
 
     return t, P, burnup, NXe, n_fa, n_th, NU, NPu, Sigma_th_ctrl, label
 
@@ -58,70 +55,38 @@ if __name__ == "__main__":
     t2, P2, B2, Xe2, nf2, nt2, NU2, NPu2, Sctrl2, lab2 = res2
     t3, P3, B3, Xe3, nf3, nt3, NU3, NPu3, Sctrl3, lab3 = res3
 
+    # Figures dessinées hors écran, en parallèle, après sous-échantillonnage
+    figs = []
+
     # ===== 1. Puissance P(t) =====
-    plt.figure()
-    plt.plot(t1, P1, label=lab1)
-    plt.plot(t2, P2, label=lab2)
-    plt.plot(t3, P3, label=lab3)
-    plt.xlabel("Temps [s]")
-    plt.ylabel("Puissance [W]")
-    plt.grid(True)
-    plt.legend()
-    plt.title("Évolution de la puissance du réacteur")
-    plt.tight_layout()
+    figs.append(pl.FigureSpec("puissance.png", "Évolution de la puissance du réacteur",
+                              "Temps [s]", "Puissance [W]")
+                .plot(t1, P1, lab1).plot(t2, P2, lab2).plot(t3, P3, lab3))
 
     # ===== 2. Xe-135(t) pour les cas avec Xe =====
-    plt.figure()
-    plt.plot(t2, Xe2, label="Xe135 – sans contrôle")
-    plt.plot(t3, Xe3, label="Xe135 – avec contrôle")
-    plt.xlabel("Temps [s]")
-    plt.ylabel("N_Xe [atomes]")
-    plt.grid(True)
-    plt.legend()
-    plt.title("Accumulation de Xe-135")
-    plt.tight_layout()
+    figs.append(pl.FigureSpec("xenon.png", "Accumulation de Xe-135", "Temps [s]", "N_Xe [atomes]")
+                .plot(t2, Xe2, "Xe135 – sans contrôle").plot(t3, Xe3, "Xe135 – avec contrôle"))
 
     # ===== 3. Neutrons rapides / thermiques (cas avec Xe + contrôle) =====
-    plt.figure()
-    plt.plot(t3, nf3, label="Neutrons rapides")
-    plt.plot(t3, nt3, label="Neutrons thermiques")
-    plt.xlabel("Temps [s]")
-    plt.ylabel("Population de neutrons")
-    plt.grid(True)
-    plt.legend()
-    plt.title("Évolution des populations de neutrons (cas Xe + contrôle)")
-    plt.tight_layout()
+    figs.append(pl.FigureSpec("neutrons.png",
+                              "Évolution des populations de neutrons (cas Xe + contrôle)",
+                              "Temps [s]", "Population de neutrons")
+                .plot(t3, nf3, "Neutrons rapides").plot(t3, nt3, "Neutrons thermiques"))
 
     # ===== 4. U235 et Pu239 (cas Xe + contrôle) =====
-    plt.figure()
-    plt.plot(t3, NU3, label="U235")
-    plt.plot(t3, NPu3, label="Pu239")
-    plt.xlabel("Temps [s]")
-    plt.ylabel("Nombre d'atomes")
-    plt.grid(True)
-    plt.legend()
-    plt.title("Consommation du combustible fissile")
-    plt.tight_layout()
+    figs.append(pl.FigureSpec("combustible.png", "Consommation du combustible fissile",
+                              "Temps [s]", "Nombre d'atomes")
+                .plot(t3, NU3, "U235").plot(t3, NPu3, "Pu239"))
 
     # ===== 5. Burnup cumulée =====
-    plt.figure()
-    plt.plot(t1, B1, label=lab1)
-    plt.plot(t2, B2, label=lab2)
-    plt.plot(t3, B3, label=lab3)
-    plt.xlabel("Temps [s]")
-    plt.ylabel("Burnup [MWd/t]")
-    plt.grid(True)
-    plt.legend()
-    plt.title("Burnup cumulée du combustible")
-    plt.tight_layout()
+    figs.append(pl.FigureSpec("burnup.png", "Burnup cumulée du combustible",
+                              "Temps [s]", "Burnup [MWd/t]")
+                .plot(t1, B1, lab1).plot(t2, B2, lab2).plot(t3, B3, lab3))
 
     # ===== 6. Sigma_th_ctrl(t) (cas contrôle) =====
-    plt.figure()
-    plt.plot(t3, Sctrl3)
-    plt.xlabel("Temps [s]")
-    plt.ylabel("Σ_th_ctrl [1/s]")
-    plt.grid(True)
-    plt.title("Action des barres de contrôle (cas Xe + contrôle)")
-    plt.tight_layout()
-
-    plt.show()
+    figs.append(pl.FigureSpec("controle.png", "Action des barres de contrôle (cas Xe + contrôle)",
+                              "Temps [s]", "Σ_th_ctrl [1/s]")
+                .plot(t3, Sctrl3))
+
+    for name in pl.render_all(figs, "graphique"):
+        print(name)
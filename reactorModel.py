@@ -1,13 +1,25 @@
+import functools
+import hashlib
+import json
+import time
+from collections import namedtuple
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-import molarMass as mM
-import halfLife as hL
-import crossSection as cS
+import nuclideChain as nC
+import stiffSolver
+import cram
+import eulerKernel
+import resultStore
+import bateman
+import events as ev
+from results import Results
+from nuclideChain import decay_constant
+from groupStructure import GroupStructure, downscatter_matrix, neutron_speed, EV_TO_J, M_NEUTRON
+from nuclearData import NA
 
 # ------------------- CONSTANTES PHYSIQUES -------------------
 
-NA = 6.022e23           # [1/mol]
 V_CORE = 10.0           # [m^3] volume du coeur
 Q_FISSION = 200e6 * 1.602e-19   # [J/fission] ~200 MeV
 Q_FP   = 5e6   * 1.602e-19 
@@ -18,12 +30,12 @@ BETA = 0.0065           # fraction de neutrons retardés
 # Groupes d'énergie
 E_TH = 0.025      # [eV] thermique
 E_FAST = 1e6      # [eV] rapide
-EV_TO_J = 1.602e-19
-M_NEUTRON = 1.6749e-27  # [kg]
 
 # Ralentissement fast -> thermal
 T_SLOW = 5e-4
 LAMBDA_SLOW = np.log(2.0) / T_SLOW
+# léthargie traversée en T_SLOW (référence du ralentissement multigroupe)
+U_SLOW = np.log(E_FAST / E_TH)
 
 # ======= Options de contrôle des barres =======
 USE_CONTROL = True       # Active ou non le contrôle automatique
@@ -35,14 +47,9 @@ SIGMA_TH_MAX = 20.0      # Valeur max (barres totalement insérées)
 
 Sigma_Fast_ctr = 1
 
-
-
-
-def decay_constant(species, transfo):
-    T = hL.halfLife(species, transfo)
-    if T <= 0:
-        return 0.0
-    return np.log(2.0) / T
+# en dessous d'un neutron dans le coeur (et sans source retardée capable d'en
+# produire un sur l'intervalle), l'intervalle est traité en décroissance pure
+FLUX_FREE_N = 1.0
 
 
 # Décroissances
@@ -54,439 +61,1610 @@ LAMBDA_TH233 = decay_constant("Th233", "BetaMinus")
 LAMBDA_PA233 = decay_constant("Pa233", "BetaMinus")
 LAMBDA_PU241 = decay_constant("Pu241", "BetaMinus")  # Pu-241 -> Am-241
 
+# np.trapz a été renommé np.trapezoid dans NumPy 2
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
 
-def reactorModel(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot):
+def control_settings(use_control=None, P_nom=None, K_p=None):
     """
-    Modèle cinétique avec toutes les filières possibles du fuel (U, Pu, Th).
+    Rod controller settings of a run, (use_control, P_nom, K_p): the values
+    given, the module defaults USE_CONTROL / P_NOM / K_P for those left to
+    None. Passing them explicitly keeps concurrent runs independent.
+    """
+    return (bool(USE_CONTROL if use_control is None else use_control),
+            float(P_NOM if P_nom is None else P_nom),
+            float(K_P if K_p is None else K_p))
+
+
+class ReactorSystem:
+    """
+    Rate equations of the reactor model in matrix form.
+
+    The state vector is y = [n_0, ..., n_{G-1}, N_0, ..., N_{n-1}]: neutron
+    populations of the G groups (fastest first) followed by the inventory of
+    the chain. Every reaction rate is bilinear in (n_g, N_i), so with
+    w = [vec(n ⊗ N), y] the derivatives are linear in w:
+
+        [dy/dt, F_tot] = M @ w - Sigma_th * rod * n
+
+    where F_tot is the total fission rate and rod selects the groups
+    absorbed by the control rods.
+
+    With more than two groups (chain built on a GroupStructure) the
+    slowing-down rate of each group scales with the inverse of its lethargy
+    width (groupStructure.downscatter_matrix), so that going from E_FAST to
+    E_TH still takes ~T_SLOW and deposits Q_SLOW.
+
+    ----------------
+    :param chain: nuclideChain.DepletionChain
+    :param FPCompo: object with attribute Xe135 [%]
+        share of the fission products going to Xe135
+    """
+
+    def __init__(self, chain, FPCompo):
+        self.chain = chain
+        G = len(chain.energies)
+        n = len(chain)
+        self.G = G
+        self.n = n
+        if chain.groups is None:
+            self.speeds = neutron_speed(chain.energies)
+        else:
+            self.speeds = chain.groups.speeds
+
+        # spectre de fission : tout naît dans le groupe rapide
+        self.chi = np.zeros(G)
+        self.chi[0] = 1.0
+
+        # ralentissement g -> g+1 ; absorption fixe du groupe rapide
+        self.scatter, slow_frac = downscatter_matrix(chain.energies, LAMBDA_SLOW, U_SLOW)
+        self.absorption = np.zeros(G)
+        self.absorption[0] = Sigma_Fast_ctr
+
+        # barres de contrôle sur le groupe thermique
+        self.rod = np.zeros(G)
+        self.rod[-1] = 1.0
+
+        # fraction de PF allant dans Xe135
+        y_XE = FPCompo.Xe135 / 100.0
+        self.yields = chain.vector({"FP": (1.0 - y_XE) * 2.0, "Xe135": y_XE * 2.0})
+
+        # décroissance des PF (source retardée), celle de la chaîne
+        self.lambda_FP = chain.lam[chain.index["FP"]]
+
+        M, q, fis, cap = self.rate_matrix(chain.sigma_fis, chain.sigma_cap, chain.transmutation,
+                                          chain.decay, self.lambda_FP)
+
+        # --- Neutrons : ralentissement et absorption du groupe rapide ---
+        M[:G, G * n:G * n + G] += self.scatter - np.diag(self.absorption)
+
+        self.M = M
+        self.fis = fis
+        self.cap = cap
+
+        # puissance hors fission : P = Q_FISSION * F_tot + q @ y
+        q[:G] = Q_SLOW * slow_frac * (-np.diag(self.scatter))
+        self.q = q
+
+    def rate_matrix(self, sigma_fis, sigma_cap, transmutation, decay, lambda_FP):
+        """
+        Part of (M, q) linear in the nuclear data, i.e. all of it but the
+        slowing-down and the fast-group absorption. Called with the changes
+        of the data (e.g. one cross section set to 1 barn, all the others to
+        0) it gives the derivative of (M, q) along that change.
+
+        ----------------
+        :param sigma_fis, sigma_cap: arrays (G, n) [m^2]
+        :param transmutation: array (G, n, n) [m^2], DepletionChain layout
+        :param decay: array (n, n) [1/s]
+        :param lambda_FP: double, decay constant of the FP (delayed neutrons) [1/s]
+        :return: (M, q, fis, cap), fis and cap per unit population [1/s]
+        """
+        G, n = self.G, self.n
+        i_FP = self.chain.index["FP"]
+
+        # sections par unité de population : flux_g = n_g * v_g / V_CORE
+        k = self.speeds / V_CORE
+        fis = sigma_fis * k[:, None]          # (G, n)
+        cap = sigma_cap * k[:, None]
+        trans = transmutation * k[:, None, None]
+
+        n_w = G * n + G + n
+        M = np.zeros((G + n + 1, n_w))
+        bil = M[:, :G * n].reshape(G + n + 1, G, n)
+        lin = M[:, G * n:]
+
+        # --- Neutrons ---
+        for h in range(G):
+            bil[h] = NU * self.chi[h] * fis
+            bil[h, h] -= fis[h] + cap[h]
+        # source retardée
+        lin[:G, G + i_FP] += self.chi * BETA * lambda_FP
+
+        # --- Nuclides ---
+        bil[G:G + n] = np.transpose(trans, (1, 0, 2))
+        bil[G:G + n] += self.yields[:, None, None] * fis[None, :, :]
+        lin[G:G + n, G:] = decay
+
+        # --- Taux de fission total ---
+        bil[-1] = fis
+
+        q = np.zeros(G + n)
+        q[G + i_FP] = Q_FP * lambda_FP
+        return M, q, fis, cap
+
+    def populations(self, n_fast, n_thermal):
+        """Neutron populations with n_fast in the first group, n_thermal in the last one."""
+        n_g = np.zeros(self.G)
+        n_g[0] = n_fast
+        n_g[-1] = n_thermal
+        return n_g
+
+    def initial_state(self, fuelCompo, n_init, mTot):
+        """
+        State vector at t=0 from the fuel mass fractions [%] and the initial
+        neutron population of each group.
+        """
+        chain = self.chain
+        y = np.zeros(self.G + self.n)
+        y[:self.G] = n_init
+        for i, X in enumerate(chain.nuclides):
+            if hasattr(fuelCompo, X):
+                m = mTot * getattr(fuelCompo, X) / 100.0
+                y[self.G + i] = m / chain.molar_mass[i] * NA
+        return y
+
+    def augmented(self, y):
+        """w = [vec(n ⊗ N), y]."""
+        G = self.G
+        return np.concatenate((np.outer(y[:G], y[G:]).ravel(), y))
+
+    def rhs(self, y, Sigma_th):
+        """Return (dy/dt, F_tot)."""
+        z = self.M @ self.augmented(y)
+        dy = z[:-1]
+        dy[:self.G] -= Sigma_th * self.rod * y[:self.G]
+        return dy, z[-1]
+
+    def power(self, y, F_tot):
+        return Q_FISSION * F_tot + self.q @ y
+
+    def neutron_balance(self, Y, Sigma_th):
+        """
+        Neutron production (fissions and delayed neutrons of the FP) and
+        loss (absorptions in the nuclides, fast-group absorption, rods) [1/s]
+        for each row of a state history Y of shape (K, G + n); the
+        slowing-down only moves neutrons between groups.
+        """
+        G = self.G
+        n, N = Y[:, :G], Y[:, G:]
+        F_tot = np.einsum("kg,gi,ki->k", n, self.fis, N)
+        absorbed = np.einsum("kg,gi,ki->k", n, self.fis + self.cap, N)
+        prod = NU * F_tot + BETA * self.lambda_FP * N[:, self.chain.index["FP"]]
+        loss = absorbed + n @ self.absorption + np.asarray(Sigma_th) * (n @ self.rod)
+        return prod, loss
+
+    def power_history(self, Y):
+        """Power [W] for each row of a state history Y of shape (K, G + n)."""
+        G = self.G
+        W = np.concatenate(((Y[:, :G, None] * Y[:, None, G:]).reshape(len(Y), -1), Y), axis=1)
+        return Q_FISSION * (W @ self.M[-1]) + Y @ self.q
+
+    def jacobian(self, y, Sigma_th):
+        """
+        Analytical Jacobian of [dy/dt, F_tot] with respect to y,
+        shape (G + n + 1, G + n).
+        """
+        G, n = self.G, self.n
+        bil = self.M[:, :G * n].reshape(-1, G, n)
+        J = self.M[:, G * n:].copy()
+        J[:, :G] += bil @ y[G:]
+        J[:, G:] += np.tensordot(bil, y[:G], axes=([1], [0]))
+        J[np.arange(G), np.arange(G)] -= Sigma_th * self.rod
+        return J
+
+    def ode(self, use_control, P_nom, K_p):
+        """
+        Right-hand side and Jacobian of the full model for the stiff
+        solvers, on x = [y, Sigma_th, E] where E is the released energy [J].
+        The proportional controller dSigma_th/dt = K_p * (P - P_nom) stops at
+        SIGMA_TH_MIN / SIGMA_TH_MAX, and the rods see Sigma_th clipped to
+        that range so that the solver may step across a bound.
+        :return: (fun, jac), callables of (t, x)
+        """
+        G, n = self.G, self.n
+        m = G + n
+        rod = self.rod
+
+        def control_active(S, c):
+            return use_control and not ((S <= SIGMA_TH_MIN and c < 0) or (S >= SIGMA_TH_MAX and c > 0))
+
+        def fun(t, x):
+            y, S = x[:m], x[m]
+            dy, F_tot = self.rhs(y, min(max(S, SIGMA_TH_MIN), SIGMA_TH_MAX))
+            P = self.power(y, F_tot)
+            c = K_p * (P - P_nom)
+            dx = np.empty(m + 2)
+            dx[:m] = dy
+            dx[m] = c if control_active(S, c) else 0.0
+            dx[m + 1] = P
+            return dx
+
+        def jac(t, x):
+            y, S = x[:m], x[m]
+            Jy = self.jacobian(y, min(max(S, SIGMA_TH_MIN), SIGMA_TH_MAX))
+            dP = Q_FISSION * Jy[-1] + self.q
+            J = np.zeros((m + 2, m + 2))
+            J[:m, :m] = Jy[:-1]
+            if SIGMA_TH_MIN < S < SIGMA_TH_MAX:
+                J[:G, m] = -rod * y[:G]
+            P = self.power(y, self.M[-1] @ self.augmented(y))
+            if control_active(S, K_p * (P - P_nom)):
+                J[m, :m] = K_p * dP
+            J[m + 1, :m] = dP
+            return J
+
+        return fun, jac
+
+    def neutron_ode(self, N, use_control, P_nom, K_p):
+        """
+        Neutron/controller subsystem at a frozen inventory N, on
+        u = [n, Sigma_th, integral of n dt, E]. With N fixed the neutron
+        equations are linear in n apart from the rod term.
+        :return: (fun, jac), callables of (t, u)
+        """
+        G, n = self.G, self.n
+        bil = self.M[:, :G * n].reshape(-1, G, n)
+        lin = self.M[:, G * n:]
+        L = bil[:G] @ N + lin[:G, :G]
+        src = lin[:G, G:] @ N
+        dP = Q_FISSION * (bil[-1] @ N) + self.q[:G]
+        P_N = self.q[G:] @ N
+        rod = self.rod
+
+        def control_active(S, c):
+            return use_control and not ((S <= SIGMA_TH_MIN and c < 0) or (S >= SIGMA_TH_MAX and c > 0))
+
+        def fun(t, u):
+            n_g, S = u[:G], u[G]
+            S_eff = min(max(S, SIGMA_TH_MIN), SIGMA_TH_MAX)
+            P = dP @ n_g + P_N
+            c = K_p * (P - P_nom)
+            du = np.empty(2 * G + 2)
+            du[:G] = L @ n_g - S_eff * rod * n_g + src
+            du[G] = c if control_active(S, c) else 0.0
+            du[G + 1:2 * G + 1] = n_g
+            du[-1] = P
+            return du
+
+        def jac(t, u):
+            n_g, S = u[:G], u[G]
+            S_eff = min(max(S, SIGMA_TH_MIN), SIGMA_TH_MAX)
+            J = np.zeros((2 * G + 2, 2 * G + 2))
+            J[:G, :G] = L - np.diag(S_eff * rod)
+            if SIGMA_TH_MIN < S < SIGMA_TH_MAX:
+                J[:G, G] = -rod * n_g
+            if control_active(S, K_p * (dP @ n_g + P_N - P_nom)):
+                J[G, :G] = K_p * dP
+            J[G + 1:2 * G + 1, :G] = np.eye(G)
+            J[-1, :G] = dP
+            return J
+
+        return fun, jac
+
+    def nuclide_matrix(self, n_g):
+        """
+        Matrix B such that dN/dt = B N at frozen neutron populations n_g,
+        fission product yields included.
+        """
+        G, n = self.G, self.n
+        bil = self.M[G:G + n, :G * n].reshape(n, G, n)
+        return np.tensordot(n_g, bil, axes=([0], [1])) + self.M[G:G + n, G * n + G:]
+
+    def decay_solver(self):
+        """bateman.BatemanSolver of the chain, built on first use."""
+        if getattr(self, "_bateman", None) is None:
+            self._bateman = bateman.BatemanSolver(self.chain.decay)
+        return self._bateman
+
+    def flux_free(self, y, duration, n_min=FLUX_FREE_N):
+        """
+        True when the neutrons of state y are negligible over the next
+        `duration` seconds: fewer than n_min in the core, and fewer than
+        n_min delayed neutrons emitted by the FP precursors meanwhile.
+        """
+        N_FP = y[self.G + self.chain.index["FP"]]
+        return np.sum(y[:self.G]) <= n_min and BETA * N_FP * min(self.lambda_FP * duration, 1.0) <= n_min
+
+    def euler_operator(self, dt):
+        """
+        Matrix E such that [y_{k+1}, F_tot_k] = E @ w_k for one explicit
+        Euler step at Sigma_th = 0. The rod term sits on the diagonal
+        entries E[g, G*n + g] of the rod groups g.
+        :return: (E, rod groups, their diagonal entries at Sigma_th = 0)
+        """
+        G, n = self.G, self.n
+        rate = np.max(-np.diag(self.scatter) + self.absorption)
+        if dt * rate > 1.0:
+            print("\n WARNING : explicit Euler unstable with %d groups (dt * slowing-down rate "
+                  "= %.3g > 1), use method='rosenbrock'" % (G, dt * rate))
+        E = dt * self.M
+        E[-1] = self.M[-1]
+        E[np.arange(G + n), G * n + np.arange(G + n)] += 1.0
+        rod = np.flatnonzero(self.rod)
+        return E, rod, E[rod, G * n + rod].copy()
+
+
+def reactor_system(FPCompo, groups=None):
+    """
+    ReactorSystem of the default chain, on two groups (E_FAST, E_TH) or on
+    a groupStructure.GroupStructure.
+    """
+    chain = nC.default_chain([E_FAST, E_TH] if groups is None else groups)
+    return ReactorSystem(chain, FPCompo)
+
+
+def state_keys(system):
+    """Result keys of the state vector entries: {"n_fast": 0, ..., "N_Xe": G + n - 1}."""
+    G = system.G
+    keys = {"n_fast": 0}
+    for g in range(1, G - 1):
+        keys["n_%d" % g] = g
+    keys["n_thermal"] = G - 1
+    for i, X in enumerate(system.chain.nuclides):
+        keys[nC.RESULT_KEYS[X]] = G + i
+    return keys
+
+
+class Recorder:
+    """
+    Result channels kept by reactorModel and their histories. Only the
+    requested channels are allocated. "energy" is the energy released
+    since t = 0 [J], integrated on the full step grid of the run (not on
+    the recorded outputs).
+
+    ----------------
+    :param system: ReactorSystem
+    :param record: list of strings or None
+        keys of the result dict to keep, e.g. ["power", "N_Xe", "Sigma_th"];
+        None keeps every channel
+    """
+
+    def __init__(self, system, record=None):
+        self.system = system
+        index = state_keys(system)
+        channels = ["power"] + list(index) + ["Sigma_th", "energy"]
+
+        if record is None:
+            record = channels
+        unknown = [key for key in record if key not in channels]
+        if unknown:
+            raise ValueError("Unknown channel(s) %s, expected some of %s" % (unknown, channels))
+
+        self.keys = [key for key in channels if key in record]
+        self.state_keys = [key for key in self.keys if key in index]
+        self.index = np.array([index[key] for key in self.state_keys], dtype=np.int64)
+        self.power = "power" in record
+        self.Sigma_th = "Sigma_th" in record
+        self.energy = "energy" in record
+
+    def allocate(self, n_out):
+        self.Y = np.zeros((n_out, len(self.index)))
+        self.P = np.zeros(n_out if self.power else 0)
+        self.S = np.zeros(n_out if self.Sigma_th else 0)
+        self.E = np.zeros(n_out if self.energy else 0)
+
+    def select(self, Y_arr, P_arr, Sigma_th_arr, E_arr, stride=1):
+        """Keep the requested channels of full histories, every stride rows."""
+        self.Y = Y_arr[::stride, self.index]
+        self.P = P_arr[::stride] if self.power else np.zeros(0)
+        self.S = Sigma_th_arr[::stride] if self.Sigma_th else np.zeros(0)
+        self.E = E_arr[::stride] if self.energy else np.zeros(0)
+
+    def columns(self, t_arr):
+        """Current histories as a {key: 1-D array} dict, "time" first."""
+        res = {"time": t_arr}
+        for key in self.keys:
+            if key == "power":
+                res[key] = self.P
+            elif key == "Sigma_th":
+                res[key] = self.S
+            elif key == "energy":
+                res[key] = self.E
+            else:
+                res[key] = self.Y[:, self.state_keys.index(key)]
+        return res
+
+    def results(self, t_arr, burnup, stats, final_state=None, mTot=None, system=None):
+        """results.Results of the current histories."""
+        res = self.columns(t_arr)
+        res["burnup"] = burnup
+        res["stats"] = stats
+        if final_state is not None:
+            res["final_state"] = final_state
+        system = self.system if system is None else system
+        return Results(res, system, mTot, state_keys(system))
+
+
+def record_steps(n_steps, dt, stride=1, t_eval=None):
+    """
+    Indices of the recorded steps of the fixed-step loop: every stride-th
+    step, or the steps closest to the times t_eval [s].
     """
+    if t_eval is not None:
+        k = np.round(np.asarray(t_eval, dtype=float) / dt).astype(np.int64)
+        return np.unique(np.clip(k, 0, max(n_steps - 1, 0)))[:n_steps]
+    return np.arange(0, n_steps, stride, dtype=np.int64)
 
-    # --------- 1. COMPOSITION INITIALE DU FUEL ---------
 
-    # masses [kg]
-    m_U235  = mTot * fuelCompo.U235  / 100.0
-    m_U238  = mTot * fuelCompo.U238  / 100.0
-    m_Pu239 = mTot * fuelCompo.Pu239 / 100.0
-    m_Th232 = mTot * fuelCompo.Th232 / 100.0
+def _energy(P_half, P_first, dt):
+    """
+    Energy [J] released up to a step of the Euler loop, trapezoidal rule on
+    the full step grid: P_half is the sum of the powers up to that step
+    minus half its power (E_out of the eulerKernel loops), P_first the
+    power of the first step.
+    """
+    return dt * (P_half - 0.5 * P_first)
+
 
-    # nombres de noyaux
-    N_U235  = m_U235  / mM.molarMass("U235")  * NA
-    N_U238  = m_U238  / mM.molarMass("U238")  * NA
-    N_Pu239 = m_Pu239 / mM.molarMass("Pu239") * NA
-    N_Th232 = m_Th232 / mM.molarMass("Th232") * NA
+def reactorModel(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot,
+                 method="euler", t_eval=None, rtol=1e-6, atol=1.0, macro_dt=1.0,
+                 backend="numpy", record=None, stride=1, store=None,
+                 use_control=None, P_nom=None, K_p=None, groups=None, initial_state=None,
+                 events=None, checkpoint=None, checkpoint_every=10.0, profile=False,
+                 callback=None, callback_every=10000):
+    """
+    Modèle cinétique avec toutes les filières possibles du fuel (U, Pu, Th).
 
-    # noyaux créés pendant l'irradiation
-    N_U236  = 0.0
-    N_U237  = 0.0
-    N_U239  = 0.0
-    N_Np239 = 0.0
-    N_Pu240 = 0.0
-    N_Pu241 = 0.0
-    N_Th233 = 0.0
-    N_Pa233 = 0.0
-    N_U233  = 0.0
+    :param method: string
+        'euler' (explicit, dt = 1e-4 s), an adaptive implicit solver of
+        stiffSolver ('rosenbrock', 'BDF', 'Radau', 'LSODA') or 'multirate'
+    :param t_eval: array-like or None
+        output times; None -> every step ('euler') or every accepted step
+    :param macro_dt: double
+        'multirate' only: the neutrons and the rod controller are integrated
+        on adaptive fine steps with the inventory frozen, the inventory is
+        then advanced over a macro step with the averaged reaction rates.
+        The macro step is chosen from the error of the inventory (step
+        doubling, MACRO_RTOL) and macro_dt [s] is its upper bound
+    :param rtol, atol: double
+        tolerances of the implicit solvers, atol in number of neutrons or
+        nuclei
+    :param backend: string
+        'euler' only: 'numpy' or 'numba' (JIT-compiled loop of eulerKernel,
+        falls back to 'numpy' when numba is not installed)
+    :param record: list of strings or None
+        channels to keep (see Recorder), None -> all
+    :param stride: int
+        keep one output every stride steps (ignored for 'euler' if t_eval
+        is given)
+    :param store: string or None
+        directory of a resultStore: the histories are written there chunk by
+        chunk instead of being kept in memory, and the results.Results
+        returned reads them back as memory-mapped arrays (see open_results)
+    :param use_control, P_nom, K_p: rod controller of this run, None ->
+        module values USE_CONTROL, P_NOM, K_P
+    :param groups: groupStructure.GroupStructure or None
+        energy groups, None -> two groups at E_FAST and E_TH. n_fa_init goes
+        to the fastest group, n_th_init to the slowest, and the intermediate
+        groups are recorded as "n_1", "n_2", ...
+    :param initial_state: dict or None
+        "final_state" of a previous run ({"y": state vector, "Sigma_th"}),
+        to continue it: fuelCompo, n_th_init and n_fa_init are then ignored
+        and the time restarts from 0
+    :param events: events.Event, function or list of them
+        events located during the run ('euler' and the stiff methods):
+        result "events" lists the ones met (name, time [s], terminal) and a
+        terminal event ends the run there (stats["stopped_by"]). 'euler'
+        evaluates them every EVENT_STEPS steps (10 ms): a sign change undone
+        within one such block (a threshold crossed and crossed back) is not
+        seen; lower reactorModel.EVENT_STEPS to resolve faster transients
+    :param checkpoint: string or None
+        'euler' only: .npz file where the full loop state is saved every
+        checkpoint_every [s] of simulated time (atomic replace), the history
+        recorded since the previous save going to the segment files
+        checkpoint + '.h<i>.npz'. If the file already exists for the same
+        run (same arguments), the run resumes from it and gives
+        bit-identical results; the files are kept at the end
+    :param profile: bool
+        'euler' only: time the phases of the steps and count the clamps and
+        controller saturations (stats["profile"], see
+        eulerKernel.StepProfile); runs the numpy loop whatever the backend
+    :param callback: callable or None
+        'euler' only: callback(Snapshot) every callback_every steps and at
+        the end, with the live state (see iter_reactor for the fields)
+
+    The result is a results.Results, read as a dict of channels plus
+    "burnup" [J/kg], "stats" and "final_state" (the state at t_final for
+    initial_state), with derived series computed on demand (burnup_history
+    in J/kg, burnup_MWd_t, energy, mass(X), reaction_rate(X, reaction),
+    reactivity).
+    fuelCompo given as a list runs the batch with reactorEnsemble and
+    returns a list of result dicts.
+    """
 
-    # produits de fission
-    N_FP = 0.0
-    N_Xe = 0.0
+    if isinstance(fuelCompo, (list, tuple)):
+        if method != "euler" or store is not None or t_eval is not None:
+            raise ValueError("lists of compositions run with reactorEnsemble: method='euler', "
+                             "no t_eval, no store")
+        return reactorEnsemble(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot,
+                               use_control, P_nom, K_p, record=record, stride=stride,
+                               groups=groups)
 
-    # neutrons
-    n_fast = n_fa_init
-    n_th   = n_th_init
+    # --------- 1. SYSTÈME + COMPOSITION INITIALE ---------
+
+    system = reactor_system(FPCompo, groups)
+    recorder = Recorder(system, record)
+    control = control_settings(use_control, P_nom, K_p)
+    events = ev.event_list(events)
+    if events and method == "multirate":
+        raise ValueError("events need method='euler' or a stiff method, not 'multirate'")
+    if method == "euler" and any(isinstance(e, ev.NegativeInventory) for e in events):
+        print("\n WARNING : NegativeInventory never fires with method='euler' (negative values "
+              "are clamped to 0 at each step), use a stiff method")
+
+    y0 = system.initial_state(fuelCompo, system.populations(n_fa_init, n_th_init), mTot)
 
     # --- Initialisation des barres de contrôle ---
     Sigma_th = 1* SIGMA_TH_MAX # barres retirées au début
 
+    if initial_state is not None:
+        y0 = np.array(initial_state["y"], dtype=float)
+        Sigma_th = float(initial_state["Sigma_th"])
+
+    saved = None
+    if method != "euler" and (checkpoint is not None or profile or callback is not None):
+        raise ValueError("checkpoint, profile and callback need method='euler'")
+    if checkpoint is not None:
+        run_key = _run_key(fuelCompo, FPCompo, t_final, y0, Sigma_th, mTot, stride, t_eval,
+                           backend, recorder.keys, store, control, system, events, checkpoint_every)
+        saved = resultStore.load_checkpoint(checkpoint)
+
+    writer = None
+    if store is not None:
+        meta = {
+            "fuel": vars(fuelCompo), "FP": vars(FPCompo),
+            "USE_CONTROL": control[0], "P_NOM": control[1], "K_P": control[2],
+            "method": method, "dt": 1e-4 if method == "euler" else None,
+            "t_final": t_final, "n_th_init": n_th_init, "n_fa_init": n_fa_init, "mTot": mTot,
+            "groups": _groups_meta(groups),
+        }
+        length = None if saved is None else int(saved["store_length"])
+        # Euler : nombre de lignes connu d'avance, fichiers créés à la bonne taille
+        capacity = len(record_steps(int(t_final / 1e-4), 1e-4, stride, t_eval)) \
+            if method == "euler" else 1024
+        writer = resultStore.ResultWriter(store, ["time"] + recorder.keys, meta,
+                                          capacity=max(capacity, 1), length=length)
+
+    if method == "euler":
+        t_arr, E_tot, stats, y_end, S_end = _run_euler(
+            system, y0, Sigma_th, t_final, recorder, control, stride, t_eval, backend, writer,
+            events, None if checkpoint is None else
+            (checkpoint, round(checkpoint_every / 1e-4), run_key),
+            eulerKernel.StepProfile() if profile else None,
+            None if callback is None else (callback, callback_every))
+    else:
+        # t_final ajouté aux sorties pour connaître l'état final
+        te = None if t_eval is None else np.asarray(t_eval, dtype=float)
+        extra = te is not None and (len(te) == 0 or te[-1] < t_final)
+        if extra:
+            te = np.append(te, t_final)
+        if method == "multirate":
+            t_arr, Y_arr, P_arr, Sigma_th_arr, E_arr, E_tot, stats = _run_multirate(
+                system, y0, Sigma_th, t_final, macro_dt, te, rtol, atol, control)
+        else:
+            t_arr, Y_arr, P_arr, Sigma_th_arr, E_arr, E_tot, stats = _run_stiff(
+                system, y0, Sigma_th, t_final, method, te, rtol, atol, control, events)
+        if "x_stop" in stats:
+            x_stop = stats.pop("x_stop")
+            m = system.G + system.n
+            y_end, S_end = x_stop[:m].copy(), np.clip(x_stop[m], SIGMA_TH_MIN, SIGMA_TH_MAX)
+        else:
+            y_end, S_end = Y_arr[-1].copy(), Sigma_th_arr[-1]
+        if extra and len(t_arr) and t_arr[-1] == t_final:
+            t_arr, Y_arr, P_arr, Sigma_th_arr, E_arr = \
+                t_arr[:-1], Y_arr[:-1], P_arr[:-1], Sigma_th_arr[:-1], E_arr[:-1]
+        recorder.select(Y_arr, P_arr, Sigma_th_arr, E_arr, stride)
+        t_arr = t_arr[::stride]
+
+    burnup = E_tot / mTot
+    final_state = {"y": y_end, "Sigma_th": float(S_end)}
+    hits = stats.pop("events", None)
 
-    # fraction de PF allant dans Xe135
-    y_XE = FPCompo.Xe135 / 100.0
-
-    # --------- 2. VITESSES + SECTIONS EFFICACES ---------
-
-    v_th   = np.sqrt(2.0 * E_TH   * EV_TO_J / M_NEUTRON)
-    v_fast = np.sqrt(2.0 * E_FAST * EV_TO_J / M_NEUTRON)
-
-    def xs_th_fast(nuclide, transfo):
-        vals = cS.crossSection(nuclide, transfo, [E_TH, E_FAST])
-        return vals[0] * 1e-28, vals[1] * 1e-28
-
-    # Uranium
-    sigma_U235_fis_th, sigma_U235_fis_fast = xs_th_fast("U235", "Fission")
-    sigma_U235_cap_th, sigma_U235_cap_fast = xs_th_fast("U235", "Capture")
-    sigma_U236_fis_th, sigma_U236_fis_fast = xs_th_fast("U236", "Fission")
-    sigma_U236_cap_th, sigma_U236_cap_fast = xs_th_fast("U236", "Capture")
-    sigma_U237_fis_th, sigma_U237_fis_fast = xs_th_fast("U237", "Fission")
-    sigma_U237_cap_th, sigma_U237_cap_fast = xs_th_fast("U237", "Capture")
-    sigma_U238_fis_th, sigma_U238_fis_fast = xs_th_fast("U238", "Fission")
-    sigma_U238_cap_th, sigma_U238_cap_fast = xs_th_fast("U238", "Capture")
-    sigma_U239_fis_th, sigma_U239_fis_fast = xs_th_fast("U239", "Fission")
-    sigma_U239_cap_th, sigma_U239_cap_fast = xs_th_fast("U239", "Capture")
-
-    # Np / Pu
-    sigma_Np239_fis_th, sigma_Np239_fis_fast = xs_th_fast("Np239", "Fission")
-    sigma_Np239_cap_th, sigma_Np239_cap_fast = xs_th_fast("Np239", "Capture")
-    sigma_Pu239_fis_th, sigma_Pu239_fis_fast = xs_th_fast("Pu239", "Fission")
-    sigma_Pu239_cap_th, sigma_Pu239_cap_fast = xs_th_fast("Pu239", "Capture")
-    sigma_Pu240_fis_th, sigma_Pu240_fis_fast = xs_th_fast("Pu240", "Fission")
-    sigma_Pu240_cap_th, sigma_Pu240_cap_fast = xs_th_fast("Pu240", "Capture")
-    sigma_Pu241_fis_th, sigma_Pu241_fis_fast = xs_th_fast("Pu241", "Fission")
-    sigma_Pu241_cap_th, sigma_Pu241_cap_fast = xs_th_fast("Pu241", "Capture")
-
-    # Filière thorium
-    sigma_Th232_cap_th, sigma_Th232_cap_fast = xs_th_fast("Th232", "Capture")
-    sigma_Th233_fis_th, sigma_Th233_fis_fast = xs_th_fast("Th233", "Fission")
-    sigma_Th233_cap_th, sigma_Th233_cap_fast = xs_th_fast("Th233", "Capture")
-    sigma_Pa233_fis_th, sigma_Pa233_fis_fast = xs_th_fast("Pa233", "Fission")
-    sigma_Pa233_cap_th, sigma_Pa233_cap_fast = xs_th_fast("Pa233", "Capture")
-    sigma_U233_fis_th,  sigma_U233_fis_fast  = xs_th_fast("U233",  "Fission")
-    sigma_U233_cap_th,  sigma_U233_cap_fast  = xs_th_fast("U233",  "Capture")
-
-    # Xe
-    sigma_Xe_cap_th, sigma_Xe_cap_fast = xs_th_fast("Xe135", "Capture")
-    kappa_xe = sigma_Xe_cap_th * v_th / V_CORE
-
-    # --------- 3. TEMPS + TABLEAUX ---------
+    if writer is not None:
+        if method != "euler":
+            writer.append(recorder.columns(t_arr))
+        writer.close(burnup=burnup, stats=stats,
+                     final_state={"y": y_end.tolist(), "Sigma_th": float(S_end)},
+                     **({} if hits is None else {"events": hits}))
+        return open_results(store)
 
-    dt      = 1e-4
+    res = recorder.results(t_arr, burnup, stats, final_state, mTot)
+    if hits is not None:
+        res["events"] = hits
+    return res
+
+
+def _groups_meta(groups):
+    """JSON form of the groups argument of reactorModel, read back by open_results."""
+    if groups is None:
+        return None
+    if isinstance(groups, GroupStructure):
+        return {"boundaries": groups.boundaries.tolist(), "n_points": groups.E_points.shape[1]}
+    return np.asarray(groups, dtype=float).tolist()
+
+
+def open_results(path):
+    """
+    Run stored by reactorModel(store=path) as a results.Results, without
+    re-simulating it: the channels are the memory-mapped arrays of
+    resultStore.StoredResults and the derived series (burnup_history,
+    mass(X), reactivity...) are computed from them, the system being
+    rebuilt from the header.
+    """
+    stored = resultStore.open_results(path)
+    meta = stored.meta
+    groups = meta.get("groups")
+    if isinstance(groups, dict):
+        groups = GroupStructure(groups["boundaries"], groups["n_points"])
+    FPCompo = FP()
+    vars(FPCompo).update(meta["FP"])
+    system = reactor_system(FPCompo, groups)
+    return Results(stored, system, meta["mTot"], state_keys(system))
+
+
+def reactorEnsemble(fuelCompos, FPCompos, t_final, n_th_init, n_fa_init, mTot,
+                    use_control=None, P_nom=None, K_p=None, record=None, stride=1, groups=None,
+                    systems=None):
+    """
+    Explicit Euler run of many cases at once: the states of all cases form
+    an array of shape (n_cases, G + n) advanced by one batched matrix
+    product per step (eulerKernel.euler_steps_batch), so that the Python
+    cost of a step is paid once for the whole batch.
+
+    ----------------
+    :param fuelCompos: list of Fuel
+    :param FPCompos: FP or list of FP (one per case)
+    :param n_th_init, n_fa_init, mTot: double or array-like (one per case)
+    :param use_control, P_nom, K_p: None (module values USE_CONTROL, P_NOM,
+        K_P), a single value or one value per case
+    :param record, stride, groups: as in reactorModel
+    :param systems: list of ReactorSystem or None
+        one per case, used instead of the systems built from FPCompos and
+        groups (e.g. with perturbed nuclear data, see uncertainty.py)
+    :return: list of result dicts, one per case, as returned by reactorModel
+    """
+
+    B = len(fuelCompos)
+    if not isinstance(FPCompos, (list, tuple)):
+        FPCompos = [FPCompos] * B
+    if len(FPCompos) != B:
+        raise ValueError("%d fuel compositions but %d FP compositions" % (B, len(FPCompos)))
+
+    def per_case(value, default=None, dtype=float):
+        value = default if value is None else value
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (B,)).copy()
+
+    n_th = per_case(n_th_init)
+    n_fa = per_case(n_fa_init)
+    mTot = per_case(mTot)
+    use_control = per_case(use_control, USE_CONTROL, bool)
+    P_nom = per_case(P_nom, P_NOM)
+    K_p = per_case(K_p, K_P)
+
+    if systems is None:
+        systems = [reactor_system(FPc, groups) for FPc in FPCompos]
+    elif len(systems) != B:
+        raise ValueError("%d fuel compositions but %d systems" % (B, len(systems)))
+    recorder = Recorder(systems[0], record)
+
+    dt = 1e-4
     n_steps = int(t_final / dt)
+    rec_steps = record_steps(n_steps, dt, stride)
+    K = len(rec_steps)
+
+    y = np.array([s.initial_state(f, s.populations(n_fa[b], n_th[b]), mTot[b])
+                  for b, (s, f) in enumerate(zip(systems, fuelCompos))])
+    ops = [s.euler_operator(dt) for s in systems]
+    E = np.array([op[0] for op in ops])
+    rod = ops[0][1]
+    E_rod = np.array([op[2] for op in ops])
+    Sigma_th = np.full(B, float(SIGMA_TH_MAX))
+    q = systems[0].q
+    if any(np.any(s.q != q) for s in systems):
+        q = np.array([s.q for s in systems])
+
+    Y_out = np.zeros((K, B, len(recorder.index)))
+    P_out = np.zeros((K if recorder.power else 0, B))
+    S_out = np.zeros((K if recorder.Sigma_th else 0, B))
+    E_out = np.zeros((K if recorder.energy else 0, B))
+
+    kernel = eulerKernel.euler_steps_batch
+    Sigma_th, P_sum, P_first, P_last = kernel(
+        E, y, systems[0].G, Sigma_th, rod, E_rod, q, Q_FISSION, dt, n_steps,
+        use_control, P_nom, K_p, float(SIGMA_TH_MIN), float(SIGMA_TH_MAX),
+        rec_steps, recorder.index, Y_out, P_out, S_out, E_out)
+
+    E_tot = _energy(P_sum - 0.5 * P_last, P_first, dt) if n_steps > 1 else np.zeros(B)
+    E_out = _energy(E_out, P_first, dt)
+    t_arr = rec_steps * dt
+
+    results = []
+    for b in range(B):
+        recorder.Y = Y_out[:, b]
+        recorder.P = P_out[:, b]
+        recorder.S = S_out[:, b]
+        recorder.E = E_out[:, b]
+        results.append(recorder.results(t_arr, E_tot[b] / mTot[b],
+                                        {"n_steps": n_steps, "n_cases": B},
+                                        mTot=mTot[b], system=systems[b]))
+    return results
+
+
+# état instantané produit par iter_reactor ; N suit l'ordre de nuclideChain.NUCLIDES
+Snapshot = namedtuple("Snapshot", ["time", "power", "Sigma_th", "n", "flux", "N", "energy"])
+
+
+def iter_reactor(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot, every=1.0,
+                 method="euler", rtol=1e-6, atol=1.0, macro_dt=1.0, backend="numpy",
+                 use_control=None, P_nom=None, K_p=None, groups=None, initial_state=None):
+    """
+    Generator form of reactorModel: yields a Snapshot at t = 0, then every
+    `every` seconds and at t_final, without keeping any history. Stopping
+    the iteration early keeps all the snapshots already produced.
+
+    Snapshot fields: time [s], power [W], Sigma_th [1/s], n (neutrons per
+    group, fastest first), flux [1/(m^2 s)], N (inventory in the order of
+    nuclideChain.NUCLIDES), energy released since t = 0 [J].
+    Other parameters as in reactorModel.
+    """
 
-    t_arr      = np.zeros(n_steps)
-    P_arr      = np.zeros(n_steps)
-    n_fast_arr = np.zeros(n_steps)
-    n_th_arr   = np.zeros(n_steps)
+    system = reactor_system(FPCompo, groups)
+    G = system.G
+    k_flux = system.speeds / V_CORE
+    control = control_settings(use_control, P_nom, K_p)
+
+    y = system.initial_state(fuelCompo, system.populations(n_fa_init, n_th_init), mTot)
+    Sigma_th = float(SIGMA_TH_MAX)
+    if initial_state is not None:
+        y = np.array(initial_state["y"], dtype=float)
+        Sigma_th = float(initial_state["Sigma_th"])
+    energy = 0.0
+
+    def snapshot(t, P):
+        return Snapshot(t, P, Sigma_th, y[:G].copy(), y[:G] * k_flux, y[G:].copy(), energy)
+
+    yield snapshot(0.0, system.power_history(y[None, :])[0])
+
+    if method == "euler":
+        kernel = eulerKernel.get_kernel(backend)
+        dt = 1e-4
+        n_steps = int(t_final / dt)
+        chunk = max(1, int(round(every / dt)))
+        E, rod, E_rod = system.euler_operator(dt)
+        no_rec = np.zeros(0, dtype=np.int64)
+        empty = np.zeros(0)
+
+        done = 0
+        P_total = P_first = 0.0
+        while done < n_steps:
+            k = min(chunk, n_steps - done)
+            Sigma_th, P_total, P_0, P = kernel(
+                E, y, G, Sigma_th, rod, E_rod, system.q, Q_FISSION, dt, k,
+                *control, float(SIGMA_TH_MIN), float(SIGMA_TH_MAX),
+                no_rec, no_rec, np.zeros((0, 0)), empty, empty, empty, P_sum=P_total)
+            if done == 0:
+                P_first = P_0
+            done += k
+            energy = _energy(P_total - 0.5 * P, P_first, dt) if done > 1 else 0.0
+            yield snapshot(done * dt, P)
+    else:
+        t = 0.0
+        while t < t_final:
+            H = min(every, t_final - t)
+            if method == "multirate":
+                _, Y_arr, P_arr, S_arr, _, E_H, _ = _run_multirate(
+                    system, y, Sigma_th, H, macro_dt, np.array([H]), rtol, atol, control)
+            else:
+                _, Y_arr, P_arr, S_arr, _, E_H, _ = _run_stiff(
+                    system, y, Sigma_th, H, method, np.array([H]), rtol, atol, control)
+            y = Y_arr[-1].copy()
+            Sigma_th = S_arr[-1]
+            energy += E_H
+            t += H
+            yield snapshot(t, P_arr[-1])
+
+
+def cooling(state, FPCompo, duration, mTot, t_eval=None, record=None, groups=None):
+    """
+    Flux-free interval (shutdown, cooling, storage) in closed form: the
+    neutrons are set to 0 and the inventory follows the Bateman solution of
+    the decay chain (bateman.BatemanSolver), whatever the duration. The
+    power is then the decay power q @ y and Sigma_th stays constant.
+
+    ----------------
+    :param state: dict, "final_state" of a previous run ({"y", "Sigma_th"})
+    :param duration: double, in [s]
+    :param t_eval: array-like or None
+        output times in [0, duration], None -> 101 equally spaced times
+    :param record, groups: as in reactorModel
+    :return: result dict as returned by reactorModel
+    """
 
-    N_U235_arr  = np.zeros(n_steps)
-    N_U236_arr  = np.zeros(n_steps)
-    N_U237_arr  = np.zeros(n_steps)
-    N_U238_arr  = np.zeros(n_steps)
-    N_U239_arr  = np.zeros(n_steps)
-    N_Np239_arr = np.zeros(n_steps)
-    N_Pu239_arr = np.zeros(n_steps)
-    N_Pu240_arr = np.zeros(n_steps)
-    N_Pu241_arr = np.zeros(n_steps)
-    N_Th232_arr = np.zeros(n_steps)
-    N_Th233_arr = np.zeros(n_steps)
-    N_Pa233_arr = np.zeros(n_steps)
-    N_U233_arr  = np.zeros(n_steps)
-    N_FP_arr    = np.zeros(n_steps)
-    N_Xe_arr    = np.zeros(n_steps)
+    system = reactor_system(FPCompo, groups)
+    recorder = Recorder(system, record)
+    G = system.G
 
-    # --------- 4. BOUCLE TEMPORELLE ---------
+    if t_eval is None:
+        t_eval = np.linspace(0.0, duration, 101)
+    t_arr = np.asarray(t_eval, dtype=float)
+    y0 = np.array(state["y"], dtype=float)
+    Sigma_th = float(state["Sigma_th"])
 
-    for k in range(n_steps):
-        t = k * dt
-        t_arr[k] = t
+    solver = system.decay_solver()
+    Y_arr = np.zeros((len(t_arr), G + system.n))
+    Y_arr[:, G:] = solver.decay(y0[G:], t_arr)
+    P_arr = Y_arr @ system.q
+    E_arr = solver.integral(y0[G:], t_arr) @ system.q[G:]
+    recorder.select(Y_arr, P_arr, np.full(len(t_arr), Sigma_th), E_arr)
 
-        flux_th   = n_th   * v_th   / V_CORE
-        flux_fast = n_fast * v_fast / V_CORE
+    y_end = np.zeros_like(y0)
+    y_end[G:] = solver.decay(y0[G:], duration)
+    E_tot = system.q[G:] @ solver.integral(y0[G:], duration)
 
-        # --- Uranium ---
+    return recorder.results(t_arr, E_tot / mTot, {"n_steps": 0, "bateman": True},
+                            {"y": y_end, "Sigma_th": Sigma_th}, mTot)
 
-        R_U235_fis_th   = sigma_U235_fis_th   * flux_th   * N_U235
-        R_U235_fis_fast = sigma_U235_fis_fast * flux_fast * N_U235
-        R_U235_cap_th   = sigma_U235_cap_th   * flux_th   * N_U235
-        R_U235_cap_fast = sigma_U235_cap_fast * flux_fast * N_U235
 
-        R_U235_fis = R_U235_fis_th + R_U235_fis_fast
-        R_U235_cap = R_U235_cap_th + R_U235_cap_fast
+def _critical_guess(system, y, Sigma_th, cols, P_nom):
+    """
+    Start of equilibrium(): critical Sigma_th and the fundamental mode of
+    the linear problem without xenon burnout (n -> 0 in the bilinear
+    terms of the equilibrium nuclides), scaled to P_nom.
+    """
+    from scipy.optimize import brentq
 
-        R_U236_fis_th   = sigma_U236_fis_th   * flux_th   * N_U236
-        R_U236_fis_fast = sigma_U236_fis_fast * flux_fast * N_U236
-        R_U236_cap_th   = sigma_U236_cap_th   * flux_th   * N_U236
-        R_U236_cap_fast = sigma_U236_cap_fast * flux_fast * N_U236
+    G = system.G
+    y0 = y.copy()
+    y0[cols] = 0.0
 
-        R_U236_fis = R_U236_fis_th + R_U236_fis_fast
-        R_U236_cap = R_U236_cap_th + R_U236_cap_fast
+    def mode(S):
+        A = system.jacobian(y0, S)[np.ix_(cols, cols)]
+        mu, V = np.linalg.eig(A)
+        i = np.argmax(mu.real)
+        return mu[i].real, V[:, i].real
 
-        R_U237_fis_th   = sigma_U237_fis_th   * flux_th   * N_U237
-        R_U237_fis_fast = sigma_U237_fis_fast * flux_fast * N_U237
-        R_U237_cap_th   = sigma_U237_cap_th   * flux_th   * N_U237
-        R_U237_cap_fast = sigma_U237_cap_fast * flux_fast * N_U237
+    lo, hi = float(SIGMA_TH_MIN), float(SIGMA_TH_MAX)
+    if mode(lo)[0] > 0.0 > mode(hi)[0]:
+        Sigma_th = brentq(lambda S: mode(S)[0], lo, hi, xtol=1e-12)
+    v = mode(Sigma_th)[1]
+    v = v if np.sum(v[:G]) >= 0 else -v
 
-        R_U237_fis = R_U237_fis_th + R_U237_fis_fast
-        R_U237_cap = R_U237_cap_th + R_U237_cap_fast
+    z = y.copy()
+    z[cols] = np.abs(v)
+    P = system.power(z, system.M[-1] @ system.augmented(z))
+    return Sigma_th, z[cols] * (P_nom / P if P > 0 else 1.0)
 
-        R_U238_fis_th   = sigma_U238_fis_th   * flux_th   * N_U238
-        R_U238_fis_fast = sigma_U238_fis_fast * flux_fast * N_U238
-        R_U238_cap_th   = sigma_U238_cap_th   * flux_th   * N_U238
-        R_U238_cap_fast = sigma_U238_cap_fast * flux_fast * N_U238
 
-        R_U238_fis = R_U238_fis_th + R_U238_fis_fast
-        R_U238_cap = R_U238_cap_th + R_U238_cap_fast
-
-        R_U239_fis_th   = sigma_U239_fis_th   * flux_th   * N_U239
-        R_U239_fis_fast = sigma_U239_fis_fast * flux_fast * N_U239
-        R_U239_cap_th   = sigma_U239_cap_th   * flux_th   * N_U239
-        R_U239_cap_fast = sigma_U239_cap_fast * flux_fast * N_U239
-
-        R_U239_fis = R_U239_fis_th + R_U239_fis_fast
-        R_U239_cap = R_U239_cap_th + R_U239_cap_fast
-        R_U239_beta = LAMBDA_U239 * N_U239
-
-        # --- Np239 ---
-
-        R_Np239_fis_th   = sigma_Np239_fis_th   * flux_th   * N_Np239
-        R_Np239_fis_fast = sigma_Np239_fis_fast * flux_fast * N_Np239
-        R_Np239_cap_th   = sigma_Np239_cap_th   * flux_th   * N_Np239
-        R_Np239_cap_fast = sigma_Np239_cap_fast * flux_fast * N_Np239
-
-        R_Np239_fis = R_Np239_fis_th + R_Np239_fis_fast
-        R_Np239_cap = R_Np239_cap_th + R_Np239_cap_fast
-        R_Np239_beta = LAMBDA_NP239 * N_Np239
-
-        # --- Pu239 ---
-
-        R_Pu239_fis_th   = sigma_Pu239_fis_th   * flux_th   * N_Pu239
-        R_Pu239_fis_fast = sigma_Pu239_fis_fast * flux_fast * N_Pu239
-        R_Pu239_cap_th   = sigma_Pu239_cap_th   * flux_th   * N_Pu239
-        R_Pu239_cap_fast = sigma_Pu239_cap_fast * flux_fast * N_Pu239
-
-        R_Pu239_fis = R_Pu239_fis_th + R_Pu239_fis_fast
-        R_Pu239_cap = R_Pu239_cap_th + R_Pu239_cap_fast
-
-        # --- Pu240 ---
-
-        R_Pu240_fis_th   = sigma_Pu240_fis_th   * flux_th   * N_Pu240
-        R_Pu240_fis_fast = sigma_Pu240_fis_fast * flux_fast * N_Pu240
-        R_Pu240_cap_th   = sigma_Pu240_cap_th   * flux_th   * N_Pu240
-        R_Pu240_cap_fast = sigma_Pu240_cap_fast * flux_fast * N_Pu240
-
-        R_Pu240_fis = R_Pu240_fis_th + R_Pu240_fis_fast
-        R_Pu240_cap = R_Pu240_cap_th + R_Pu240_cap_fast
-
-        # --- Pu241 ---
-
-        R_Pu241_fis_th   = sigma_Pu241_fis_th   * flux_th   * N_Pu241
-        R_Pu241_fis_fast = sigma_Pu241_fis_fast * flux_fast * N_Pu241
-        R_Pu241_cap_th   = sigma_Pu241_cap_th   * flux_th   * N_Pu241
-        R_Pu241_cap_fast = sigma_Pu241_cap_fast * flux_fast * N_Pu241
-
-        R_Pu241_fis = R_Pu241_fis_th + R_Pu241_fis_fast
-        R_Pu241_cap = R_Pu241_cap_th + R_Pu241_cap_fast
-        R_Pu241_beta = LAMBDA_PU241 * N_Pu241   # Pu-241 -> Am-241 (non suivi, considéré comme perte)
-
-        # --- Filière thorium ---
-
-        R_Th232_cap_th   = sigma_Th232_cap_th   * flux_th   * N_Th232
-        R_Th232_cap_fast = sigma_Th232_cap_fast * flux_fast * N_Th232
-        R_Th232_cap = R_Th232_cap_th + R_Th232_cap_fast
-
-        R_Th233_fis_th   = sigma_Th233_fis_th   * flux_th   * N_Th233
-        R_Th233_fis_fast = sigma_Th233_fis_fast * flux_fast * N_Th233
-        R_Th233_cap_th   = sigma_Th233_cap_th   * flux_th   * N_Th233
-        R_Th233_cap_fast = sigma_Th233_cap_fast * flux_fast * N_Th233
-
-        R_Th233_fis = R_Th233_fis_th + R_Th233_fis_fast
-        R_Th233_cap = R_Th233_cap_th + R_Th233_cap_fast
-        R_Th233_beta = LAMBDA_TH233 * N_Th233
-
-        R_Pa233_fis_th   = sigma_Pa233_fis_th   * flux_th   * N_Pa233
-        R_Pa233_fis_fast = sigma_Pa233_fis_fast * flux_fast * N_Pa233
-        R_Pa233_cap_th   = sigma_Pa233_cap_th   * flux_th   * N_Pa233
-        R_Pa233_cap_fast = sigma_Pa233_cap_fast * flux_fast * N_Pa233
-
-        R_Pa233_fis = R_Pa233_fis_th + R_Pa233_fis_fast
-        R_Pa233_cap = R_Pa233_cap_th + R_Pa233_cap_fast
-        R_Pa233_beta = LAMBDA_PA233 * N_Pa233
-
-        R_U233_fis_th   = sigma_U233_fis_th   * flux_th   * N_U233
-        R_U233_fis_fast = sigma_U233_fis_fast * flux_fast * N_U233
-        R_U233_cap_th   = sigma_U233_cap_th   * flux_th   * N_U233
-        R_U233_cap_fast = sigma_U233_cap_fast * flux_fast * N_U233
-
-        R_U233_fis = R_U233_fis_th + R_U233_fis_fast
-        R_U233_cap = R_U233_cap_th + R_U233_cap_fast
-
-        # --- Xénon ---
-
-        R_Xe_cap_th = sigma_Xe_cap_th * flux_th * N_Xe
-        R_Xe_cap_fast = sigma_Xe_cap_fast * flux_fast * N_Xe
- 
-
-        # Fissions totales
-        F_tot = (
-            R_U235_fis + R_U236_fis + R_U237_fis + R_U238_fis + R_U239_fis +
-            R_Np239_fis +
-            R_Pu239_fis + R_Pu240_fis + R_Pu241_fis +
-            R_Th233_fis + R_Pa233_fis + R_U233_fis
-        )
-
-        # Fissions / captures par groupe d'énergie
-        R_fis_fast = (
-            R_U235_fis_fast + R_U236_fis_fast + R_U237_fis_fast +
-            R_U238_fis_fast + R_U239_fis_fast + R_Np239_fis_fast +
-            R_Pu239_fis_fast + R_Pu240_fis_fast + R_Pu241_fis_fast +
-            R_Th233_fis_fast + R_Pa233_fis_fast + R_U233_fis_fast
-        )
-        R_fis_th = (
-            R_U235_fis_th + R_U236_fis_th + R_U237_fis_th +
-            R_U238_fis_th + R_U239_fis_th + R_Np239_fis_th +
-            R_Pu239_fis_th + R_Pu240_fis_th + R_Pu241_fis_th +
-            R_Th233_fis_th + R_Pa233_fis_th + R_U233_fis_th
-        )
-
-        R_cap_fast = (
-            R_U235_cap_fast + R_U236_cap_fast + R_U237_cap_fast +
-            R_U238_cap_fast + R_U239_cap_fast +
-            R_Np239_cap_fast + R_Pu239_cap_fast + R_Pu240_cap_fast + R_Pu241_cap_fast +
-            R_Th232_cap_fast + R_Th233_cap_fast +
-            R_Pa233_cap_fast + R_U233_cap_fast + R_Xe_cap_fast
-        )
-        R_cap_th = (
-            R_U235_cap_th + R_U236_cap_th + R_U237_cap_th +
-            R_U238_cap_th + R_U239_cap_th +
-            R_Np239_cap_th + R_Pu239_cap_th + R_Pu240_cap_th + R_Pu241_cap_th +
-            R_Th232_cap_th + R_Th233_cap_th +
-            R_Pa233_cap_th + R_U233_cap_th +
-            R_Xe_cap_th
-        )
-
-        # Source retardée
-        S_d = BETA * LAMBDA_FP * N_FP
+def equilibrium(fuelCompo, FPCompo, mTot, P_nom=None, state=None, groups=None,
+                nuclides=("FP", "Xe135"), tol=1e-10, max_iter=50):
+    """
+    Steady state of the reactor at the power P_nom, computed directly
+    instead of waiting for the rod controller and the xenon to settle:
+    neutron populations, equilibrium densities of `nuclides` (FP and Xe135
+    by default) and critical Sigma_th, the other nuclides being held at
+    their current values.
+
+    Newton iteration on dn/dt = 0, dN_X/dt = 0 (X in nuclides) and
+    P = P_nom, with the analytical Jacobian of ReactorSystem, started from
+    the fundamental mode at the critical rod position without xenon
+    burnout. A few iterations, i.e. milliseconds.
+
+    ----------------
+    :param fuelCompo: Fuel, heavy nuclides (ignored if state is given)
+    :param P_nom: double or None (module value P_NOM)
+    :param state: dict or None
+        "final_state" of a run whose inventory is kept (burnt fuel)
+    :param nuclides: names of the chain nuclides solved at equilibrium
+    :param tol: relative Newton step at convergence
+    :return: dict with "y", "Sigma_th" (usable as initial_state of
+        reactorModel), "power" [W], "critical" (False when the critical
+        Sigma_th lies outside [SIGMA_TH_MIN, SIGMA_TH_MAX]), "iterations",
+        "residual" (scaled) and the "N_*" / "n_*" values
+    """
 
-        # --- Neutrons ---
+    P_nom = P_NOM if P_nom is None else P_nom
+    system = reactor_system(FPCompo, groups)
+    G = system.G
+    if state is None:
+        y = system.initial_state(fuelCompo, np.zeros(G), mTot)
+        Sigma_th = 0.5 * (SIGMA_TH_MIN + SIGMA_TH_MAX)
+    else:
+        y = np.array(state["y"], dtype=float)
+        Sigma_th = float(state["Sigma_th"])
+
+    cols = list(range(G)) + [G + system.chain.index[X] for X in nuclides]
+    Sigma_th, y[cols] = _critical_guess(system, y, Sigma_th, cols, P_nom)
+    m = len(cols)
+
+    def residual(y, S):
+        dy, F_tot = system.rhs(y, S)
+        return np.append(dy[cols], system.power(y, F_tot) / P_nom - 1.0)
+
+    r = residual(y, Sigma_th)
+    for it in range(1, max_iter + 1):
+        J_y = system.jacobian(y, Sigma_th)
+        J = np.zeros((m + 1, m + 1))
+        J[:m, :m] = J_y[np.ix_(cols, cols)]
+        J[:G, m] = -system.rod * y[:G]
+        J[m, :m] = (Q_FISSION * J_y[-1] + system.q)[cols] / P_nom
+
+        # mise à l'échelle : inconnues relatives, lignes normalisées
+        x_scale = np.append(np.maximum(np.abs(y[cols]), 1.0), max(abs(Sigma_th), 1.0))
+        J *= x_scale
+        row = np.max(np.abs(J), axis=1)
+        row[row == 0.0] = 1.0
+        dx = np.linalg.solve(J / row[:, None], -r / row) * x_scale
+
+        y[cols] += dx[:m]
+        Sigma_th += dx[m]
+        r = residual(y, Sigma_th)
+        if np.max(np.abs(dx / x_scale)) < tol:
+            break
+
+    critical = SIGMA_TH_MIN <= Sigma_th <= SIGMA_TH_MAX
+    if not critical:
+        print("\n WARNING : critical Sigma_th = %.4g outside [%g, %g], the rods cannot hold "
+              "P_nom = %.3g W" % (Sigma_th, SIGMA_TH_MIN, SIGMA_TH_MAX, P_nom))
+
+    res = {"y": y, "Sigma_th": float(Sigma_th), "power": float(P_nom * (1.0 + r[-1])),
+           "critical": bool(critical), "iterations": it,
+           "residual": float(np.max(np.abs(r[:m] / np.maximum(np.abs(y[cols]), 1.0))))}
+    for key, i in state_keys(system).items():
+        res[key] = float(y[i])
+    return res
+
+
+def reactorPhases(fuelCompo, FPCompo, mTot, phases, n_th_init=1e10, n_fa_init=0.0,
+                  groups=None, record=None, n_min=FLUX_FREE_N, **common):
+    """
+    Operating history made of successive phases (irradiation, shutdown,
+    cooling, restart, ...), each phase starting from the final state of the
+    previous one.
+
+    Phases whose neutron population stays below n_min (see
+    ReactorSystem.flux_free) are jumped in closed form with cooling() instead
+    of being stepped, so that days or months of decay cost as little as one
+    output. A "shutdown" phase drops the rods (Sigma_th = SIGMA_TH_MAX,
+    controller off): the delayed neutrons of the FP precursors are followed
+    with reactorModel until they become negligible, the rest of the phase
+    is a Bateman jump.
+
+    ----------------
+    :param phases: list of dicts
+        "duration" [s], optional "shutdown": True, optional "n_th_init" /
+        "n_fa_init" (neutron source of a restart, replacing the neutrons of
+        the previous state; for the first phase, replacing the arguments
+        below), and any argument of reactorModel (method, use_control,
+        P_nom, K_p, stride, t_eval, ...) overriding `common` for this
+        phase; the t_eval of a shutdown phase are shared between the
+        delayed-neutron run and the Bateman jump
+    :param n_th_init, n_fa_init: initial neutrons of the first phase
+    :param common: reactorModel arguments shared by all phases
+    :return: result dict with the concatenated histories (time from the
+        start of the first phase), "burnup" summed over the phases,
+        "phases" (start, duration, kind and stats of each phase) and
+        "final_state"
+    """
 
-        dn_fast_dt = (
-            NU * F_tot
-            - R_fis_fast
-            - R_cap_fast
-            - Sigma_Fast_ctr * n_fast
-            - LAMBDA_SLOW * n_fast
-            + S_d
-        )
-
-        dn_th_dt = (
-            LAMBDA_SLOW * n_fast
-            - R_fis_th
-            - R_cap_th
-            - Sigma_th * n_th
-        )
-
-        # --- Actinides U / Np / Pu ---
-
-        dN_U235_dt = -R_U235_fis - R_U235_cap
-        dN_U236_dt = -R_U236_fis - R_U236_cap + R_U235_cap
-        dN_U237_dt = -R_U237_fis - R_U237_cap + R_U236_cap
-        dN_U238_dt = -R_U238_fis - R_U238_cap + R_U237_cap
-        dN_U239_dt = -R_U239_fis - R_U239_cap - R_U239_beta + R_U238_cap
-
-        dN_Np239_dt = -R_Np239_fis - R_Np239_cap - R_Np239_beta + R_U239_beta
-
-        dN_Pu239_dt = -R_Pu239_fis - R_Pu239_cap + R_Np239_beta
-        dN_Pu240_dt = -R_Pu240_fis - R_Pu240_cap + R_Pu239_cap
-        dN_Pu241_dt = -R_Pu241_fis - R_Pu241_cap - R_Pu241_beta + R_Pu240_cap
-
-        # --- Filière thorium ---
-
-        dN_Th232_dt = -R_Th232_cap
-        dN_Th233_dt = -R_Th233_fis - R_Th233_cap - R_Th233_beta + R_Th232_cap
-        dN_Pa233_dt = -R_Pa233_fis - R_Pa233_cap - R_Pa233_beta + R_Th233_beta
-        dN_U233_dt  = -R_U233_fis  - R_U233_cap  + R_Pa233_beta
-
-        # --- FP / Xe ---
-
-        dN_FP_dt = (1.0 - y_XE) * 2.0 * F_tot - LAMBDA_FP * N_FP
-        dN_Xe_dt = (
-            y_XE * 2.0 * F_tot
-            - LAMBDA_XE * N_Xe
-            - R_Xe_cap_th
-        )
-
-
-
-        # --- Mise à jour Euler ---
-
-        n_fast += dn_fast_dt * dt
-        n_th   += dn_th_dt * dt
-
-        N_U235  += dN_U235_dt * dt
-        N_U236  += dN_U236_dt * dt
-        N_U237  += dN_U237_dt * dt
-        N_U238  += dN_U238_dt * dt
-        N_U239  += dN_U239_dt * dt
-        N_Np239 += dN_Np239_dt * dt
-        N_Pu239 += dN_Pu239_dt * dt
-        N_Pu240 += dN_Pu240_dt * dt
-        N_Pu241 += dN_Pu241_dt * dt
-        N_Th232 += dN_Th232_dt * dt
-        N_Th233 += dN_Th233_dt * dt
-        N_Pa233 += dN_Pa233_dt * dt
-        N_U233  += dN_U233_dt * dt
-        N_FP    += dN_FP_dt * dt
-        N_Xe    += dN_Xe_dt * dt
-
-        # clamp
-        n_fast = max(n_fast, 0.0)
-        n_th   = max(n_th,   0.0)
-        for N in [N_U235, N_U236, N_U237, N_U238, N_U239,
-                  N_Np239, N_Pu239, N_Pu240, N_Pu241,
-                  N_Th232, N_Th233, N_Pa233, N_U233, N_FP, N_Xe]:
-            if N < 0:
-                N = 0.0  # pas ultra propre mais évite les valeurs < 0 numériques
-        
-
-        # Puissance
-        P = Q_FISSION * F_tot + LAMBDA_FP * N_FP * Q_FP + Q_SLOW * LAMBDA_SLOW * n_fast 
-
-        # --- Contrôle automatique des barres ---
-        if USE_CONTROL:
-            error = P - P_NOM
-            Sigma_th += K_P * error * dt
-            Sigma_th = max(SIGMA_TH_MIN, min(SIGMA_TH_MAX, Sigma_th))
-
-
-        # stockage
-        P_arr[k]       = P
-        n_fast_arr[k]  = n_fast
-        n_th_arr[k]    = n_th
-        N_U235_arr[k]  = N_U235
-        N_U236_arr[k]  = N_U236
-        N_U237_arr[k]  = N_U237
-        N_U238_arr[k]  = N_U238
-        N_U239_arr[k]  = N_U239
-        N_Np239_arr[k] = N_Np239
-        N_Pu239_arr[k] = N_Pu239
-        N_Pu240_arr[k] = N_Pu240
-        N_Pu241_arr[k] = N_Pu241
-        N_Th232_arr[k] = N_Th232
-        N_Th233_arr[k] = N_Th233
-        N_Pa233_arr[k] = N_Pa233
-        N_U233_arr[k]  = N_U233
-        N_FP_arr[k]    = N_FP
-        N_Xe_arr[k]    = N_Xe
-
-        # enregistrer Sigma_th pour l'analyse
-        if k == 0:
-            Sigma_th_arr = np.zeros(n_steps)
-        Sigma_th_arr[k] = Sigma_th
-
-
-    E_tot = np.trapz(P_arr, t_arr)
-    burnup = E_tot / mTot
+    system = reactor_system(FPCompo, groups)
+    G = system.G
+    i_FP = G + system.chain.index["FP"]
+    state = None
+    t0 = 0.0
+    parts, info = [], []
+    burnup = 0.0
+
+    def run(kwargs, duration, initial_state, n_init=(n_th_init, n_fa_init)):
+        return reactorModel(fuelCompo, FPCompo, duration, *n_init, mTot,
+                            record=record, groups=groups, initial_state=initial_state,
+                            **kwargs)
+
+    for phase in phases:
+        phase = dict(phase)
+        duration = float(phase.pop("duration"))
+        shutdown = phase.pop("shutdown", False)
+        source = {k: phase.pop(k) for k in ("n_th_init", "n_fa_init") if k in phase}
+        kwargs = dict(common, **phase)
+
+        n_init = (source.get("n_th_init", n_th_init), source.get("n_fa_init", n_fa_init))
+        if state is not None and source:
+            y = np.array(state["y"], dtype=float)
+            y[:G] = system.populations(source.get("n_fa_init", 0.0), source.get("n_th_init", 0.0))
+            state = {"y": y, "Sigma_th": state["Sigma_th"]}
+
+        if shutdown:
+            if state is None:
+                raise ValueError("a shutdown phase needs a previous phase")
+            state = {"y": np.array(state["y"], dtype=float), "Sigma_th": float(SIGMA_TH_MAX)}
+            kwargs["use_control"] = False
+
+        sub = []
+        if state is not None and shutdown and not system.flux_free(state["y"], duration, n_min):
+            # décroissance des précurseurs : encore des neutrons retardés
+            N_FP = state["y"][i_FP]
+            t_settle = np.log(max(BETA * N_FP / n_min, 1.0)) / LAMBDA_FP + 10.0 * T_SLOW
+            t_settle = float(min(duration, t_settle))
+            kw = dict(kwargs)
+            t_eval = kwargs.get("t_eval")
+            if t_eval is not None:
+                # sorties de la phase : [0, t_settle] puis le saut de Bateman
+                t_eval = np.asarray(t_eval, dtype=float)
+                kw["t_eval"] = np.append(t_eval[t_eval < t_settle], t_settle)
+                t_eval = t_eval[t_eval > t_settle] - t_settle
+            res = run(kw, t_settle, state)
+            sub.append((res, "kinetic", t_settle))
+            state = res["final_state"]
+            if t_settle < duration:
+                state["y"][:G] = 0.0
+                res = cooling(state, FPCompo, duration - t_settle, mTot, t_eval, record, groups)
+                sub.append((res, "bateman", duration - t_settle))
+        elif state is not None and system.flux_free(state["y"], duration, n_min):
+            res = cooling(state, FPCompo, duration, mTot, kwargs.get("t_eval"), record, groups)
+            sub.append((res, "bateman", duration))
+        else:
+            sub.append((run(kwargs, duration, state, n_init), "kinetic", duration))
+
+        for res, kind, length in sub:
+            parts.append((t0, burnup * mTot, res))
+            info.append({"start": t0, "duration": length, "kind": kind,
+                         "shutdown": shutdown, "stats": res["stats"]})
+            burnup += res["burnup"]
+            state = res["final_state"]
+            t0 += length
+
+    # concaténation des historiques (temps croissants stricts)
+    # (énergie comptée depuis le début de la première phase)
+    keys = [key for key in parts[0][2] if key not in ("burnup", "stats", "final_state")]
+    out = {key: [] for key in keys}
+    t_last = -np.inf
+    for start, E_start, res in parts:
+        t = res["time"] + start
+        keep = t > t_last
+        for key in keys:
+            if key == "time":
+                out[key].append(t[keep])
+            elif key == "energy":
+                out[key].append(E_start + np.asarray(res[key])[keep])
+            else:
+                out[key].append(np.asarray(res[key])[keep])
+        if np.any(keep):
+            t_last = t[keep][-1]
+
+    res = {key: np.concatenate(out[key]) for key in keys}
+    res["burnup"] = burnup
+    res["stats"] = {"phases": len(info)}
+    res["phases"] = info
+    res["final_state"] = state
+    return Results(res, system, mTot, state_keys(system))
+
+
+# pas de temps par bloc écrit sur disque (~15 Mo d'historique en mémoire au plus)
+STORE_CHUNK = 100000
+# pas entre deux évaluations des événements (boucle d'Euler)
+EVENT_STEPS = 100
+
+# schéma multirate : tolérance relative par macro-pas, bornes du pas [s]
+MACRO_RTOL = 1e-3
+MACRO_DT_MIN = 1e-3
+MACRO_GROWTH = 2.0
+
+
+def _event_values(events, t, y, G, Sigma_th, P):
+    return [e(t, y[:G], y[G:], Sigma_th, P) for e in events]
+
+
+def _run_euler(system, y, Sigma_th, t_final, recorder, control, stride=1, t_eval=None,
+               backend="numpy", writer=None, events=None, checkpoint=None, profile=None,
+               callback=None):
+    """
+    Explicit Euler loop at dt = 1e-4 s, recording the channels of recorder
+    at the steps given by record_steps(). With a resultStore.ResultWriter
+    the loop runs by blocks of STORE_CHUNK steps, each block of history
+    being appended to the store and dropped.
+
+    With events (events.Event) the loop runs by blocks of EVENT_STEPS
+    steps and evaluates the events at the end of each block only, so that
+    two crossings of the same event within one block cancel out; a crossing is
+    located on the step by bisection (the block is replayed from its saved
+    state) and in time by linear interpolation between the two steps. A
+    terminal event stops the loop at that step.
+
+    checkpoint = (path, every, run_key): the loop state (y, Sigma_th, step,
+    energy sums, events met, and the history unless it goes to the writer)
+    is saved to the .npz file path every `every` steps, and the loop starts
+    again from that file when it exists with the same run_key. Each save
+    writes only the history recorded since the previous one, to a new
+    segment file (resultStore.segment_path). Block boundaries do not depend
+    on where a run was resumed, and the energy is summed step by step
+    across blocks, so a resumed run is bit-identical to an uninterrupted
+    one, and the energy does not depend on checkpoint_every, callback_every
+    or a store.
+
+    profile: eulerKernel.StepProfile or None, filled by the instrumented
+    numpy loop (eulerKernel.euler_steps_profiled) instead of the backend.
+    The event bisections run on the backend loop, and a block cut by a
+    terminal event is profiled up to the event step only, so that the
+    profile counts the n_steps steps of the run.
+    callback = (fun, every): fun(Snapshot) is called every `every` steps
+    with the live state.
+    :return: (t_arr, E_tot, stats, y, Sigma_th) with the state at the end
+        of the loop, t_arr is None with a writer; stats["events"] lists the
+        events met (name, time, terminal)
+    """
+    # les rejeux des événements passent par la boucle du backend : le
+    # profil ne mesure que les pas de la trajectoire
+    replay_kernel = eulerKernel.get_kernel(backend)
+    if profile is None:
+        kernel = replay_kernel
+    else:
+        kernel = functools.partial(eulerKernel.euler_steps_profiled, profile=profile)
 
-    return {
-        "time": t_arr,
-        "power": P_arr,
-        "n_fast": n_fast_arr,
-        "n_thermal": n_th_arr,
-        "N_U235": N_U235_arr,
-        "N_U236": N_U236_arr,
-        "N_U237": N_U237_arr,
-        "N_U238": N_U238_arr,
-        "N_U239": N_U239_arr,
-        "N_Np239": N_Np239_arr,
-        "N_Pu239": N_Pu239_arr,
-        "N_Pu240": N_Pu240_arr,
-        "N_Pu241": N_Pu241_arr,
-        "N_Th232": N_Th232_arr,
-        "N_Th233": N_Th233_arr,
-        "N_Pa233": N_Pa233_arr,
-        "N_U233": N_U233_arr,
-        "N_FP": N_FP_arr,
-        "N_Xe": N_Xe_arr,
-        "burnup": burnup,
-        "Sigma_th": Sigma_th_arr,
+    # --------- TEMPS + TABLEAUX ---------
 
+    dt      = 1e-4
+    n_steps = int(t_final / dt)
+
+    rec_steps = record_steps(n_steps, dt, stride, t_eval)
+    chunk = n_steps if writer is None else STORE_CHUNK
+    cb_every = None
+    if callback is not None:
+        callback, cb_every = callback[0], max(1, int(callback[1]))
+        k_flux = system.speeds / V_CORE
+    events = events or []
+    if events:
+        chunk = min(chunk, EVENT_STEPS)
+    blocks = [] if writer is None else None
+
+    # --------- BOUCLE TEMPORELLE ---------
+
+    E, rod, E_rod = system.euler_operator(dt)
+    G = system.G
+    y = y.copy()
+    Sigma_th = float(Sigma_th)
+    no_rec = np.zeros(0, dtype=np.int64)
+
+    def advance(y, Sigma_th, k, rec=no_rec, P_sum=0.0, kernel=kernel):
+        return kernel(E, y, G, Sigma_th, rod, E_rod, system.q, Q_FISSION, dt, k,
+                      *control, float(SIGMA_TH_MIN), float(SIGMA_TH_MAX),
+                      rec, recorder.index, recorder.Y, recorder.P, recorder.S, recorder.E,
+                      P_sum=P_sum)
+
+    hits = []
+    stop = None
+    recorder.allocate(0)
+    P_sum = P_first = P_last = 0.0
+    done = 0
+    segments = n_saved = 0
+
+    # --- reprise depuis le point de contrôle ---
+    every = None
+    if checkpoint is not None:
+        path, every, run_key = checkpoint
+        every = max(1, int(every))
+        saved = resultStore.load_checkpoint(path)
+        if saved is not None:
+            if str(saved["run"]) != run_key:
+                raise ValueError("checkpoint %s belongs to another run" % path)
+            y[:] = saved["y"]
+            Sigma_th = float(saved["Sigma_th"])
+            done = int(saved["step"])
+            P_sum, P_first, P_last = (float(saved[k]) for k in ("P_sum", "P_first", "P_last"))
+            hits = json.loads(str(saved["events"]))
+            stop = next((h["name"] for h in hits if h["terminal"]), None)
+            if blocks is not None:
+                segments = int(saved["segments"])
+                for i in range(segments):
+                    seg = resultStore.load_checkpoint(resultStore.segment_path(path, i))
+                    blocks.append((seg["rec"], seg["Y"], seg["P"], seg["S"], seg["E"]))
+                n_saved = len(blocks)
+
+    def save():
+        # historique : seuls les blocs depuis la dernière sauvegarde sont
+        # écrits, dans un nouveau segment
+        nonlocal segments, n_saved
+        if blocks is not None:
+            hist = _concat_blocks(blocks[n_saved:], recorder)
+            if hist is not None and len(hist[0]):
+                resultStore.save_checkpoint(resultStore.segment_path(path, segments),
+                                            dict(zip(("rec", "Y", "P", "S", "E"), hist)))
+                segments += 1
+            n_saved = len(blocks)
+        state = {
+            "run": run_key, "y": y, "Sigma_th": Sigma_th, "step": done, "time": done * dt,
+            "P_sum": P_sum, "P_first": P_first, "P_last": P_last,
+            "energy": _energy(P_sum - 0.5 * P_last, P_first, dt) if done > 1 else 0.0,
+            "events": json.dumps(hits),
+        }
+        if blocks is not None:
+            state["segments"] = segments
+        else:
+            state["store_length"] = writer.length
+        resultStore.save_checkpoint(path, state)
+
+    if events:
+        # même puissance qu'en fin de bloc (noyau) après une reprise
+        P_0 = P_last if done > 0 else system.power(y, system.M[-1] @ system.augmented(y))
+        g = _event_values(events, done * dt, y, G, Sigma_th, P_0)
+
+    while done < n_steps and stop is None:
+        k = min(chunk, n_steps - done)
+        if every is not None:
+            k = min(k, every - done % every)
+        if cb_every is not None:
+            k = min(k, cb_every - done % cb_every)
+        if events:
+            y_start, S_start, P_start = y.copy(), Sigma_th, P_sum
+            if profile is not None:
+                profile_start = dict(profile.time), dict(profile.counts)
+        rec = rec_steps[(rec_steps >= done) & (rec_steps < done + k)]
+        recorder.allocate(len(rec))
+        Sigma_th, P_sum, P_0, P_last = advance(y, Sigma_th, k, rec - done, P_sum)
+
+        if events:
+            g_new = _event_values(events, (done + k) * dt, y, G, Sigma_th, P_last)
+            # franchissements successifs du bloc : chacun localisé par
+            # dichotomie (bloc rejoué), la recherche reprenant après lui
+            start, g_start = 0, g
+            while stop is None and any(e.crossed(a, b) for e, a, b in zip(events, g_start, g_new)):
+                lo, hi, g_lo, g_hi = start, k, g_start, g_new
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    y_mid = y_start.copy()
+                    S_mid, _, _, P_mid = advance(y_mid, S_start, mid, kernel=replay_kernel)
+                    g_mid = _event_values(events, (done + mid) * dt, y_mid, G, S_mid, P_mid)
+                    if any(e.crossed(a, b) for e, a, b in zip(events, g_start, g_mid)):
+                        hi, g_hi = mid, g_mid
+                    else:
+                        lo, g_lo = mid, g_mid
+                for e, a, b in zip(events, g_lo, g_hi):
+                    if e.crossed(a, b):
+                        t_hit = ev.interpolate_crossing((done + lo) * dt, (done + hi) * dt, a, b)
+                        hits.append({"name": e.name, "time": t_hit, "terminal": e.terminal})
+                        if e.terminal and stop is None:
+                            stop = e.name
+                start, g_start = hi, g_hi
+            if stop is not None:
+                # bloc rejoué jusqu'au pas de l'événement, le profil
+                # repartant de son état en début de bloc
+                if profile is not None:
+                    profile.time, profile.counts = profile_start
+                y[:] = y_start
+                rec = rec[rec < done + start]
+                recorder.allocate(len(rec))
+                Sigma_th, P_sum, P_0, P_last = advance(y, S_start, start, rec - done, P_start)
+                k = start
+            g = g_new
+
+        if done == 0:
+            P_first = P_0
+        recorder.E = _energy(recorder.E, P_first, dt)
+        done += k
+        if writer is not None:
+            t_w = time.perf_counter()
+            writer.append(recorder.columns(rec * dt))
+            if profile is not None:
+                profile.time["storage"] += time.perf_counter() - t_w
+        else:
+            blocks.append((rec, recorder.Y, recorder.P, recorder.S, recorder.E))
+        if every is not None and (done % every == 0 or done >= n_steps or stop is not None):
+            save()
+        if cb_every is not None and (done % cb_every == 0 or done >= n_steps or stop is not None):
+            energy = _energy(P_sum - 0.5 * P_last, P_first, dt) if done > 1 else 0.0
+            callback(Snapshot(done * dt, P_last, Sigma_th, y[:G].copy(), y[:G] * k_flux,
+                              y[G:].copy(), energy))
+
+    if blocks is not None:
+        hist = _concat_blocks(blocks, recorder)
+        if hist is not None:
+            rec_steps, recorder.Y, recorder.P, recorder.S, recorder.E = hist
+
+    E_tot = _energy(P_sum - 0.5 * P_last, P_first, dt) if done > 1 else 0.0
+    t_arr = rec_steps * dt if writer is None else None
+
+    stats = {"n_steps": done}
+    if profile is not None:
+        stats["profile"] = profile.report()
+    if events:
+        stats["events"] = hits
+        stats["stopped_by"] = stop
+    return t_arr, E_tot, stats, y, Sigma_th
+
+
+def _run_key(fuelCompo, FPCompo, t_final, y0, Sigma_th, mTot, stride, t_eval, backend, keys,
+             store, control, system, events, every):
+    """Fingerprint of the arguments of a run, to check that a checkpoint belongs to it."""
+    run = {
+        "fuel": vars(fuelCompo), "FP": vars(FPCompo), "t_final": t_final, "mTot": mTot,
+        "y0": np.asarray(y0).tolist(), "Sigma_th": Sigma_th, "stride": stride,
+        "t_eval": None if t_eval is None else np.asarray(t_eval, dtype=float).tolist(),
+        "backend": backend, "keys": keys, "store": store, "control": list(control),
+        "energies": system.chain.energies.tolist(), "events": [repr(e) for e in events],
+        "every": every,
     }
+    text = json.dumps(run, sort_keys=True, default=float)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _concat_blocks(blocks, recorder):
+    """(rec, Y, P, S, E) of history blocks joined, None without blocks."""
+    if not blocks:
+        return None
+    if len(blocks) == 1:
+        return blocks[0]
+    return tuple(np.concatenate([b[i] for b in blocks]) for i in range(5))
+
+
+def _ode_event(system, event):
+    """events.Event as an event g(t, x) of the stiff solvers, on x = [y, Sigma_th, E]."""
+    G = system.G
+    m = G + system.n
+
+    def g(t, x):
+        y = x[:m]
+        S = min(max(x[m], SIGMA_TH_MIN), SIGMA_TH_MAX)
+        P = system.power(y, system.M[-1] @ system.augmented(y))
+        return event(t, y[:G], y[G:], S, P)
+
+    g.terminal = event.terminal
+    g.direction = event.direction
+    return g
+
+
+def _run_stiff(system, y0, Sigma_th, t_final, method, t_eval, rtol, atol, control, events=None):
+    """
+    Adaptive implicit integration on x = [y, Sigma_th, E].
+    control = (use_control, P_nom, K_p), see control_settings().
+    Returns (t, Y, P, Sigma_th, E history, E at the end, stats).
+    With events, stats gets "events" and "stopped_by" as in _run_euler and
+    "x_stop", the state x at the terminal event.
+    """
+    m = system.G + system.n
+
+    fun, jac = system.ode(*control)
+    x0 = np.concatenate((y0, [Sigma_th, 0.0]))
+    # Sigma_th en [1/s], E en [J]
+    atol = np.concatenate((np.full(m, atol), [1e-6 * (SIGMA_TH_MAX - SIGMA_TH_MIN), 1.0]))
+
+    events = events or []
+    t_arr, X, stats = stiffSolver.solve(fun, jac, t_final, x0, method=method, t_eval=t_eval,
+                                        rtol=rtol, atol=atol,
+                                        events=[_ode_event(system, e) for e in events])
+    E = X[-1, m + 1] if len(X) else 0.0
+
+    if events:
+        hits = [{"name": e.name, "time": float(t), "terminal": e.terminal, "x": x}
+                for e, t_e, x_e in zip(events, stats.pop("t_events"), stats.pop("x_events"))
+                for t, x in zip(t_e, x_e)]
+        hits.sort(key=lambda h: h["time"])
+        stop = [h for h in hits if h["terminal"]][:1] if stats.pop("terminated") else []
+        stats["stopped_by"] = stop[0]["name"] if stop else None
+        if stop:
+            stats["x_stop"] = np.asarray(stop[0]["x"])
+            E = stats["x_stop"][m + 1]
+        for h in hits:
+            del h["x"]
+        stats["events"] = hits
+
+    Y_arr = X[:, :m]
+    Sigma_th_arr = np.clip(X[:, m], SIGMA_TH_MIN, SIGMA_TH_MAX)
+    P_arr = system.power_history(Y_arr)
+
+    return t_arr, Y_arr, P_arr, Sigma_th_arr, X[:, m + 1], E, stats
+
+
+def _run_multirate(system, y0, Sigma_th, t_final, macro_dt, t_eval, rtol, atol, control):
+    """
+    Quasi-static scheme: on each macro step the neutron/controller
+    subsystem is integrated with rosenbrock at frozen inventory, then the
+    inventory is advanced with the step-averaged neutron populations.
+
+    The macro step is chosen by step doubling: a step H is compared with
+    two steps H/2 and accepted (the two half steps being kept) when the
+    inventories differ by less than MACRO_RTOL (relative, plus atol), the
+    next step growing or shrinking with the error, up to macro_dt.
+    """
+    G = system.G
+    m = G + system.n
+    atol_fast = np.concatenate((np.full(G, atol), [1e-6 * (SIGMA_TH_MAX - SIGMA_TH_MIN)],
+                                np.full(G, atol * macro_dt), [1.0]))
+    stats = {"n_macro": 0, "n_rejected": 0, "n_steps": 0}
+
+    def macro(y, Sigma_th, E, t0, H, outputs=True):
+        """One macro step from t0: ((t, Y, Sigma_th, E) kept, y, Sigma_th, E) at t0 + H."""
+        N = y[G:]
+
+        # --- neutrons + barres, inventaire figé ---
+        if t_eval is None or not outputs:
+            te = None if outputs else np.array([H])
+        else:
+            te = t_eval[(t_eval >= t0) & (t_eval < t0 + H)] - t0
+            if t0 + H >= t_final:
+                te = t_eval[t_eval >= t0] - t0
+            te = np.append(np.minimum(te, H), H)
+
+        fun, jac = system.neutron_ode(N, *control)
+        u0 = np.concatenate((y[:G], [Sigma_th], np.zeros(G), [E]))
+        t_loc, U, st = stiffSolver.rosenbrock(fun, jac, H, u0, t_eval=te, rtol=rtol, atol=atol_fast)
+        stats["n_steps"] += st["n_steps"]
+
+        # --- inventaire, taux de réaction moyens sur le pas ---
+        n_bar = U[-1, G + 1:2 * G + 1] / H
+        N_new = cram.cram(system.nuclide_matrix(n_bar), N, H)
+        y_new = np.concatenate((U[-1, :G], N_new))
+        if not outputs:
+            return None, y_new, U[-1, G], U[-1, -1]
+
+        # --- historiques (inventaire interpolé sur le pas) ---
+        if t_eval is None:
+            keep = slice(0 if t0 == 0.0 else 1, None)
+        else:
+            keep = slice(0, len(te) - 1)
+        t_k = t_loc[keep]
+        Y_k = np.empty((len(t_k), m))
+        Y_k[:, :G] = U[keep, :G]
+        Y_k[:, G:] = N + (t_k / H)[:, None] * (N_new - N)
+        return (t0 + t_k, Y_k, U[keep, G], U[keep, -1]), y_new, U[-1, G], U[-1, -1]
+
+    y = y0.copy()
+    E = 0.0
+    t0 = 0.0
+    H = macro_dt
+    T_list, Y_list, S_list, E_list = [], [], [], []
+
+    while t0 < t_final:
+        H = min(H, macro_dt, t_final - t0)
+        last = t0 + H >= t_final
+        t_mid = t0 + 0.5 * H
+        t_end = t_final if last else t0 + H
+        _, y_full, _, _ = macro(y, Sigma_th, E, t0, H, outputs=False)
+        hist_1, y_1, S_1, E_1 = macro(y, Sigma_th, E, t0, t_mid - t0)
+        hist_2, y_2, S_2, E_2 = macro(y_1, S_1, E_1, t_mid, t_end - t_mid)
+
+        # erreur sur l'inventaire (les neutrons suivent quasi statiquement)
+        err = np.max(np.abs(y_full[G:] - y_2[G:]) / (atol + MACRO_RTOL * np.abs(y_2[G:])))
+        # schéma d'ordre 1 : erreur locale en H^2
+        factor = min(MACRO_GROWTH, max(0.2, 0.9 / np.sqrt(err))) if err > 0 else MACRO_GROWTH
+        if err > 1.0 and H > MACRO_DT_MIN:
+            stats["n_rejected"] += 1
+            H = max(H * factor, MACRO_DT_MIN)
+            continue
+        t0 = t_end
+
+        for t_k, Y_k, S_k, E_k in (hist_1, hist_2):
+            T_list.append(t_k)
+            Y_list.append(Y_k)
+            S_list.append(S_k)
+            E_list.append(E_k)
+        y, Sigma_th, E = y_2, S_2, E_2
+        stats["n_macro"] += 1
+        H *= factor
+
+    t_arr = np.concatenate(T_list)
+    Y_arr = np.concatenate(Y_list)
+    Sigma_th_arr = np.clip(np.concatenate(S_list), SIGMA_TH_MIN, SIGMA_TH_MAX)
+    P_arr = system.power_history(Y_arr)
+
+    return t_arr, Y_arr, P_arr, Sigma_th_arr, np.concatenate(E_list), E, stats
+
+
+def depletion(fuelCompo, FPCompo, mTot, times, flux, power=None, groups=None, chain=None):
+    """
+    Long irradiation with the CRAM-16 depletion solver: the whole inventory
+    is advanced from one output time to the next by the exponential of the
+    burnup matrix (transmutation, decays and fission yields), the neutron
+    flux being held constant over each step.
+
+    ----------------
+    :param times: array-like
+        output times in [s], from 0, e.g. days or months apart
+    :param flux: array-like
+        group fluxes [1/(m^2 s)], fastest group first
+    :param groups: groupStructure.GroupStructure or None (two groups)
+    :param power: double or None
+        if given, the flux is rescaled at the beginning of each step so that
+        the fission power Q_FISSION * F_tot equals power [W]
+    :param chain: sparseChain.SparseChain or None
+        explicit decay/yield chain solved with sparse CRAM instead of the
+        lumped FP/Xe model (FPCompo and groups are then not used, the
+        groups being those of the chain); adds "decay_heat" [W]
+    :return: dict with "time", "flux" (K, G), the "N_*" inventories and
+        "burnup" [J/kg]
+    """
+
+    if chain is not None:
+        return _depletion_sparse(chain, fuelCompo, mTot, times, flux, power)
+
+    system = reactor_system(FPCompo, groups)
+    chain = system.chain
+    G = system.G
+
+    times = np.asarray(times, dtype=float)
+    flux = np.asarray(flux, dtype=float)
+    n_of_flux = V_CORE / system.speeds
+
+    N = system.initial_state(fuelCompo, np.zeros(G), mTot)[G:]
+    N_arr = np.zeros((len(times), system.n))
+    flux_arr = np.zeros((len(times), G))
+    P_arr = np.zeros(len(times))
+    N_arr[0] = N
+
+    for k in range(len(times)):
+        n_g = flux * n_of_flux
+        F_tot = system.fis.ravel() @ np.outer(n_g, N).ravel()
+        if power is not None and F_tot > 0:
+            n_g = n_g * power / (Q_FISSION * F_tot)
+            F_tot = power / Q_FISSION
+        flux_arr[k] = n_g / n_of_flux
+        P_arr[k] = Q_FISSION * F_tot
+
+        if k + 1 < len(times):
+            N = cram.cram(system.nuclide_matrix(n_g), N, times[k + 1] - times[k])
+            N_arr[k + 1] = N
+
+    res = {"time": times, "flux": flux_arr, "power": P_arr}
+    for i, X in enumerate(chain.nuclides):
+        res[nC.RESULT_KEYS[X]] = N_arr[:, i]
+    res["burnup"] = _trapezoid(P_arr, times) / mTot
+
+    return res
+
+
+def _depletion_sparse(chain, fuelCompo, mTot, times, flux, power=None):
+    """depletion() on a sparseChain.SparseChain, keys "N_" + nuclide name."""
+    times = np.asarray(times, dtype=float)
+    flux = np.asarray(flux, dtype=float)
+
+    N = chain.initial_inventory(fuelCompo, mTot)
+    N_arr = np.zeros((len(times), len(chain)))
+    flux_arr = np.zeros((len(times), len(flux)))
+    P_arr = np.zeros(len(times))
+    N_arr[0] = N
+
+    for k in range(len(times)):
+        phi = flux
+        F_tot = chain.fission_rates(phi) @ N
+        if power is not None and F_tot > 0:
+            phi = phi * power / (Q_FISSION * F_tot)
+            F_tot = power / Q_FISSION
+        flux_arr[k] = phi
+        P_arr[k] = Q_FISSION * F_tot
+
+        if k + 1 < len(times):
+            N = cram.cram(chain.burnup_matrix(phi), N, times[k + 1] - times[k])
+            N_arr[k + 1] = N
+
+    res = {"time": times, "flux": flux_arr, "power": P_arr}
+    for i, X in enumerate(chain.nuclides):
+        res["N_" + X] = N_arr[:, i]
+    res["decay_heat"] = chain.decay_heat(N_arr)
+    res["burnup"] = _trapezoid(P_arr, times) / mTot
+
+    return res
+
+
+def history_error(res, ref, key="power"):
+    """
+    Maximum relative deviation of res[key] from a reference run ref[key]
+    (e.g. the explicit Euler run), res being interpolated on ref["time"].
+    """
+    t_ref = ref["time"]
+    mask = (t_ref >= res["time"][0]) & (t_ref <= res["time"][-1])
+    x = np.interp(t_ref[mask], res["time"], res[key])
+    x_ref = ref[key][mask]
+    err = np.max(np.abs(x - x_ref))
+    scale = np.max(np.abs(x_ref))
+    return err / scale if scale > 0 else err
 
 
 # ------------------- CLASSES & TEST -------------------
@@ -506,6 +1684,8 @@ class FP:
 
 
 if __name__ == "__main__":
+    import plotting
+
     fuel = Fuel()
     fp = FP()
 
@@ -524,58 +1704,30 @@ if __name__ == "__main__":
     )
 
     t = res["time"]
-
-    # puissance
-    plt.figure()
-    plt.plot(t, res["power"])
-    plt.xlabel("Time [s]")
-    plt.ylabel("Power [W]")
-    plt.grid(True)
-    plt.title("Reactor power")
-    plt.tight_layout()
-
-    # barre
-    plt.figure()
-    plt.plot(res["time"], res["Sigma_th"])
-    plt.xlabel("Time [s]")
-    plt.ylabel("Sigma_th (control rod absorption)")
-    plt.grid(True)
-    plt.title("Control rod position (neutron absorption)")
-    plt.tight_layout()
-
-
-    # neutrons
-    plt.figure()
-    plt.loglog(t, res["n_thermal"], label="n_thermal")
-    plt.loglog(t, res["n_fast"], label="n_fast")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Neutrons")
-    plt.legend()
-    plt.grid(True, which="both")
-    plt.title("Neutron populations")
-    plt.tight_layout()
-
+    nuclides = [("N_U233", "U-233"), ("N_U235", "U-235"), ("N_U236", "U-236"),
+                ("N_U237", "U-237"), ("N_U238", "U-238"), ("N_Pu239", "Pu-239"),
+                ("N_Pu240", "Pu-240"), ("N_Pu241", "Pu-241"), ("N_Xe", "Xe-135"), ("N_FP", "FP")]
+
+    figs = [
+        # puissance
+        plotting.FigureSpec("reactorModel_power.png", "Reactor power", "Time [s]", "Power [W]")
+        .plot(t, res["power"]),
+        # barre
+        plotting.FigureSpec("reactorModel_control_rod.png",
+                            "Control rod position (neutron absorption)",
+                            "Time [s]", "Sigma_th (control rod absorption)")
+        .plot(t, res["Sigma_th"]),
+        # neutrons
+        plotting.FigureSpec("reactorModel_neutrons.png", "Neutron populations", "Time [s]",
+                            "Neutrons", xscale="log", yscale="log")
+        .plot(t, res["n_thermal"], "n_thermal").plot(t, res["n_fast"], "n_fast"),
+    ]
     # quelques actinides
-    plt.figure()
-    plt.loglog(t, res["N_U233"], label="U-233")
-    plt.loglog(t, res["N_U235"], label="U-235")
-    plt.loglog(t, res["N_U236"], label="U-236")
-    plt.loglog(t, res["N_U237"], label="U-237")
-    plt.loglog(t, res["N_U238"], label="U-238")
-
-    plt.loglog(t, res["N_Pu239"], label="Pu-239")
-    plt.loglog(t, res["N_Pu240"], label="Pu-240")
-    plt.loglog(t, res["N_Pu241"], label="Pu-241")
-
-
-    plt.loglog(t, res["N_Xe"], label="Xe-135")
-    plt.loglog(t, res["N_FP"], label="FP")
-
-    plt.xlabel("Time [s]")
-    plt.ylabel("Number of nuclei")
-    plt.legend()
-    plt.grid(True, which="both")
-    plt.title("Main nuclides")
-    plt.tight_layout()
-
-    plt.show()
\ No newline at end of file
+    spec = plotting.FigureSpec("reactorModel_nuclides.png", "Main nuclides", "Time [s]",
+                               "Number of nuclei", xscale="log", yscale="log")
+    for key, label in nuclides:
+        spec.plot(t, res[key], label)
+    figs.append(spec)
+
+    for name in plotting.render_all(figs, "graphique"):
+        print(name)
@@ -0,0 +1,183 @@
+# resultStore.py
+
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+
+META_FILE = "meta.json"
+# lignes recopiées à la fois quand un fichier est agrandi
+GROW_ROWS = 1 << 20
+# entrées du dictionnaire de résultats gardées dans l'en-tête
+SCALAR_KEYS = ("burnup", "stats", "final_state", "events")
+
+
+class ResultWriter:
+    """
+    Appends time-series chunks of a reactor run to one memory-mapped .npy
+    file per channel in the directory `path`, next to a small JSON header
+    (meta.json). The header is rewritten after every chunk, so a run that
+    stops halfway can still be read back up to its last chunk.
+
+    ----------------
+    :param path: string
+        output directory (created if needed)
+    :param keys: list of strings
+        channels, e.g. ["time", "power", "N_Xe"]
+    :param meta: dict
+        JSON-serialisable header (fuel composition, control settings, dt...)
+    :param capacity: int
+        initial number of rows of each file (the expected length when it is
+        known), grown by doubling if exceeded
+    :param length: int or None
+        reopen the existing files of path and go on writing after their
+        first `length` rows (restart from a checkpoint)
+    """
+
+    def __init__(self, path, keys, meta=None, capacity=1024, length=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.keys = list(keys)
+        self.meta = dict(meta or {})
+        self.meta["keys"] = self.keys
+        if length is None:
+            self.length = 0
+            self.capacity = max(int(capacity), 1)
+            self.arrays = {key: self._open(key, self.capacity) for key in self.keys}
+        else:
+            # reprise : fichiers existants, lignes au-delà de length abandonnées
+            self.arrays = {key: np.lib.format.open_memmap(self._file(key), mode="r+")
+                           for key in self.keys}
+            self.capacity = min(len(a) for a in self.arrays.values())
+            if length > self.capacity:
+                raise ValueError("store %s holds %d rows, cannot resume at %d"
+                                 % (path, self.capacity, length))
+            self.length = int(length)
+        self._write_meta()
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".npy")
+
+    def _open(self, key, capacity):
+        return np.lib.format.open_memmap(self._file(key), mode="w+", dtype=float, shape=(capacity,))
+
+    def _grow(self, needed):
+        """
+        Larger files: each one is copied by blocks of GROW_ROWS rows into a
+        new file that then replaces it, so that the history never has to fit
+        in memory.
+        """
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for key in self.keys:
+            old = self.arrays.pop(key)
+            tmp = self._file(key) + ".tmp"
+            new = np.lib.format.open_memmap(tmp, mode="w+", dtype=float, shape=(capacity,))
+            for i in range(0, self.length, GROW_ROWS):
+                j = min(i + GROW_ROWS, self.length)
+                new[i:j] = old[i:j]
+            new.flush()
+            del old, new
+            os.replace(tmp, self._file(key))
+            self.arrays[key] = np.lib.format.open_memmap(self._file(key), mode="r+")
+        self.capacity = capacity
+
+    def _write_meta(self):
+        self.meta["length"] = self.length
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f, indent=1, default=float)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def append(self, columns):
+        """
+        Append one chunk.
+        :param columns: dict {key: 1-D array}, same length for every key
+        """
+        k = len(columns[self.keys[0]])
+        if self.length + k > self.capacity:
+            self._grow(self.length + k)
+        for key in self.keys:
+            self.arrays[key][self.length:self.length + k] = columns[key]
+        self.length += k
+        for key in self.keys:
+            self.arrays[key].flush()
+        self._write_meta()
+
+    def close(self, **meta):
+        """Flush the files and add the final entries (burnup, stats...) to the header."""
+        self.meta.update(meta)
+        self._write_meta()
+        for key in self.keys:
+            self.arrays[key].flush()
+        self.arrays = {}
+
+
+class StoredResults(Mapping):
+    """
+    Read-only view of a run written by ResultWriter, with the same keys as
+    the dict returned by reactorModel. Channels are opened lazily as
+    memory-mapped arrays (no copy); scalar entries such as "burnup" come
+    from the header, available as .meta.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self._arrays = {}
+
+    def __getitem__(self, key):
+        if key in self.meta["keys"]:
+            if key not in self._arrays:
+                arr = np.load(os.path.join(self.path, key + ".npy"), mmap_mode="r")
+                self._arrays[key] = arr[:self.meta["length"]]
+            return self._arrays[key]
+        if key in SCALAR_KEYS and key in self.meta:
+            return self.meta[key]
+        raise KeyError(key)
+
+    def _scalars(self):
+        return [key for key in SCALAR_KEYS if key in self.meta]
+
+    def __iter__(self):
+        return iter(self.meta["keys"] + self._scalars())
+
+    def __len__(self):
+        return len(self.meta["keys"]) + len(self._scalars())
+
+
+def open_results(path):
+    """
+    Reopen a stored run without re-simulating it, as the raw channels;
+    reactorModel.open_results adds the derived series of results.Results.
+    """
+    return StoredResults(path)
+
+
+def save_checkpoint(path, state):
+    """
+    Write a checkpoint (dict of arrays and scalars) to the .npz file path
+    atomically: the previous checkpoint stays valid until the new one is
+    complete.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **state)
+    os.replace(tmp, path)
+
+
+def segment_path(path, i):
+    """File of the i-th history segment of the checkpoint path."""
+    return "%s.h%d.npz" % (path, i)
+
+
+def load_checkpoint(path):
+    """Checkpoint written by save_checkpoint as a dict, None if path does not exist."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
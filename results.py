@@ -0,0 +1,155 @@
+# results.py
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from nuclearData import NA
+
+
+# conversion J/kg -> MWd/t
+J_PER_KG_TO_MWD_PER_T = 1.0 / 86400.0 / 1e6 * 1e3
+
+
+def cumulative_trapezoid(y, t):
+    """Running integral of y over t with the trapezoidal rule, 0 at t[0]."""
+    y = np.asarray(y, dtype=float)
+    out = np.zeros(len(y))
+    if len(y) > 1:
+        np.cumsum(0.5 * (y[1:] + y[:-1]) * np.diff(t), out=out[1:])
+    return out
+
+
+class Results(Mapping):
+    """
+    Results of a reactorModel run: the recorded channels ("time", "power",
+    "n_fast", "N_U235", "Sigma_th"...) and the scalar entries ("burnup" in
+    [J/kg], "stats", "final_state", ...) read as a dict, plus derived series
+    computed on first access and cached:
+
+        energy           released energy [J] since t = 0 (the "energy" channel,
+                         integrated on the full step grid of the run; without
+                         it, trapezoidal rule on the recorded powers)
+        burnup_history   cumulative burnup [J/kg], same unit as "burnup"
+        burnup_MWd_t     the same in [MWd/t]
+        mass(X)          mass of nuclide X [kg]
+        reaction_rate(X, reaction)   'Fission' or 'Capture' rate [1/s]
+        k_eff, reactivity            neutron production / loss and (k-1)/k
+
+    so that only the primary channels are stored.
+
+    ----------------
+    :param data: dict of channels and scalar entries
+    :param system: reactorModel.ReactorSystem of the run
+    :param mTot: double, fuel mass [kg]
+    :param index: dict {channel: position in the state vector}
+        (reactorModel.state_keys)
+    """
+
+    __slots__ = ("_data", "system", "mTot", "index", "_cache")
+
+    def __init__(self, data, system, mTot, index):
+        self._data = dict(data)
+        self.system = system
+        self.mTot = mTot
+        self.index = index
+        self._cache = {}
+
+    # --- dict ---
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._cache.clear()
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "Results(%s)" % ", ".join(self._data)
+
+    def _cached(self, key, fun):
+        if key not in self._cache:
+            value = fun()
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+            self._cache[key] = value
+        return self._cache[key]
+
+    def _channel(self, key, why):
+        if key not in self._data:
+            raise KeyError("%s needs the channel '%s' (record it)" % (why, key))
+        return np.asarray(self._data[key])
+
+    def _nuclide_key(self, X):
+        chain = self.system.chain
+        if X not in chain.index:
+            raise KeyError("unknown nuclide '%s', expected one of %s" % (X, chain.nuclides))
+        return [k for k, i in self.index.items() if i == self.system.G + chain.index[X]][0]
+
+    def _states(self, why):
+        """State history (K, G + n) rebuilt from the channels."""
+        keys = sorted(self.index, key=self.index.get)
+        return np.column_stack([self._channel(k, why) for k in keys])
+
+    # --- grandeurs dérivées ---
+
+    @property
+    def energy(self):
+        """Released energy [J] since the start of the run."""
+        def fun():
+            if "energy" in self._data:
+                return np.array(self._data["energy"], dtype=float)
+            # sorties seules : exact pour stride = 1 uniquement
+            return cumulative_trapezoid(self._channel("power", "energy"), self._data["time"])
+        return self._cached("energy", fun)
+
+    @property
+    def burnup_history(self):
+        """Cumulative burnup [J/kg], ending at res["burnup"]."""
+        return self._cached("burnup_history", lambda: self.energy / self.mTot)
+
+    @property
+    def burnup_MWd_t(self):
+        """Cumulative burnup [MWd/t]."""
+        return self._cached("burnup_MWd_t", lambda: self.burnup_history * J_PER_KG_TO_MWD_PER_T)
+
+    def mass(self, X):
+        """Mass of nuclide X [kg]."""
+        def fun():
+            i = self.system.chain.index[X]
+            N = self._channel(self._nuclide_key(X), "mass")
+            return N * self.system.chain.molar_mass[i] / NA
+        return self._cached(("mass", X), fun)
+
+    def reaction_rate(self, X, reaction="Fission"):
+        """Total rate [1/s] of reaction ('Fission' or 'Capture') on nuclide X."""
+        def fun():
+            sigma = {"Fission": self.system.fis, "Capture": self.system.cap}[reaction]
+            i = self.system.chain.index[X]
+            N = self._channel(self._nuclide_key(X), "reaction_rate")
+            G = self.system.G
+            n = np.column_stack([self._channel(k, "reaction_rate")
+                                 for k in sorted(self.index, key=self.index.get)[:G]])
+            return (n @ sigma[:, i]) * N
+        return self._cached(("rate", X, reaction), fun)
+
+    @property
+    def k_eff(self):
+        """Neutron production / loss (prompt and delayed, rods and absorptions included)."""
+        def fun():
+            Y = self._states("k_eff")
+            prod, loss = self.system.neutron_balance(Y, self._channel("Sigma_th", "k_eff"))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return prod / loss
+        return self._cached("k_eff", fun)
+
+    @property
+    def reactivity(self):
+        """(k_eff - 1) / k_eff, in absolute units (x 1e5 for pcm)."""
+        return self._cached("reactivity", lambda: 1.0 - 1.0 / self.k_eff)
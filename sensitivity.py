@@ -0,0 +1,219 @@
+# sensitivity.py
+#
+# Sensibilités de la puissance et des inventaires aux données nucléaires,
+# calculées en un seul passage par le modèle linéaire tangent du pas
+# d'Euler (au lieu d'une simulation perturbée par paramètre).
+
+from collections import namedtuple
+
+import numpy as np
+
+import eulerKernel
+import nuclideChain as nC
+import reactorModel as rm
+from nuclearData import REGISTRY
+
+
+Parameter = namedtuple("Parameter", ["nuclide", "reaction", "group", "value"])
+Parameter.__doc__ = """
+Nuclear datum of the sensitivity analysis: the cross section [barn] of
+(nuclide, reaction) in a neutron group (group = index, fastest first), or
+the half-life [s] of (nuclide, decay mode) with group = None.
+"""
+
+
+def label(p):
+    """Short name of a Parameter, e.g. 'U235 Fission g1' or 'Xe135 BetaMinus T1/2'."""
+    if p.group is None:
+        return "%s %s T1/2" % (p.nuclide, p.reaction)
+    return "%s %s g%d" % (p.nuclide, p.reaction, p.group)
+
+
+def parameters(system):
+    """
+    Every nuclear datum of the model: the group cross sections of the
+    neutron reactions of the chain, then the half-lives of its decays. The
+    half-lives of halfLife.HL_DB that the chain does not use (e.g. the alpha
+    decays) have no effect on the model and are left out.
+    """
+    chain = system.chain
+    out = []
+    for X, R, _ in chain.reactions:
+        if R in nC.NEUTRON_REACTIONS:
+            sigma = (chain.sigma_fis if R == "Fission" else chain.sigma_cap)[:, chain.index[X]]
+            out += [Parameter(X, R, g, sigma[g] * 1e28) for g in range(system.G)]
+    for X, R, _ in chain.reactions:
+        if R not in nC.NEUTRON_REACTIONS:
+            T = REGISTRY.half_life(X, R)
+            if T > 0:
+                out.append(Parameter(X, R, None, T))
+    return out
+
+
+def derivatives(system, params):
+    """
+    Derivatives of the rate matrix and of the power vector of system
+    (ReactorSystem.M and .q) with respect to each parameter, per barn for
+    the cross sections and per second for the half-lives.
+    :return: (dM, dq), arrays (n_p, G+n+1, W) and (G+n, n_p)
+    """
+    chain = system.chain
+    G, n = system.G, system.n
+    daughter = {(X, R): D for X, R, D in chain.reactions}
+    dM = np.zeros((len(params),) + system.M.shape)
+    dq = np.zeros((G + n, len(params)))
+
+    for k, p in enumerate(params):
+        if (p.nuclide, p.reaction) not in daughter:
+            raise ValueError("(%s, %s) is not a reaction of the chain" % (p.nuclide, p.reaction))
+        i = chain.index[p.nuclide]
+        D = daughter[(p.nuclide, p.reaction)]
+        j = None if D is None else chain.index[D]
+        d_fis = np.zeros((G, n))
+        d_cap = np.zeros((G, n))
+        d_trans = np.zeros((G, n, n))
+        d_decay = np.zeros((n, n))
+        d_lambda_FP = 0.0
+
+        if p.group is not None:
+            # 1 barn sur la section du groupe
+            (d_fis if p.reaction == "Fission" else d_cap)[p.group, i] = 1e-28
+            d_trans[p.group, i, i] -= 1e-28
+            if j is not None:
+                d_trans[p.group, j, i] += 1e-28
+        else:
+            # lambda = ln 2 / T  ->  dlambda/dT = -lambda / T
+            d_lam = -np.log(2.0) / p.value ** 2
+            d_decay[i, i] -= d_lam
+            if j is not None:
+                d_decay[j, i] += d_lam
+            if (p.nuclide, p.reaction) == ("FP", "BetaMinus"):
+                d_lambda_FP = d_lam
+
+        dM[k], dq[:, k], _, _ = system.rate_matrix(d_fis, d_cap, d_trans, d_decay, d_lambda_FP)
+    return dM, dq
+
+
+def reactorSensitivity(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot, params=None,
+                       outputs=("power", "N_Xe"), record=None, stride=1, t_eval=None,
+                       use_control=None, P_nom=None, K_p=None, groups=None, initial_state=None):
+    """
+    Explicit Euler run of reactorModel (same arguments, dt = 1e-4 s) with
+    the forward sensitivities of the outputs to every parameter integrated
+    alongside the state: the tangent-linear model of the step
+    (eulerKernel.euler_steps_tangent) advances the n_p derivatives together,
+    so that the cost is a few times that of one run instead of one run per
+    parameter. The initial state is taken as independent of the data.
+
+    ----------------
+    :param params: list of Parameter, None -> parameters(system), every
+        cross section of every group and every half-life of the chain
+    :param outputs: channels whose derivatives are recorded: "power",
+        "Sigma_th" or the state channels ("N_Xe", "n_thermal", ...)
+    :return: results.Results of the run (channels of record), plus
+        "sensitivity": {"parameters": params, output: array (K, n_p) of
+        d(output)/dp at the recorded times, "burnup": array (n_p,) of
+        d(burnup)/dp [J/kg per unit of p]}
+    """
+    system = rm.reactor_system(FPCompo, groups)
+    recorder = rm.Recorder(system, record)
+    use_control, P_nom, K_p = rm.control_settings(use_control, P_nom, K_p)
+    params = parameters(system) if params is None else list(params)
+    n_p = len(params)
+
+    index = rm.state_keys(system)
+    unknown = [key for key in outputs if key not in index and key not in ("power", "Sigma_th")]
+    if unknown:
+        raise ValueError("Unknown output(s) %s, expected 'power', 'Sigma_th' or some of %s"
+                         % (unknown, list(index)))
+    d_keys = [key for key in outputs if key in index]
+    d_idx = np.array([index[key] for key in d_keys], dtype=np.int64)
+
+    y = system.initial_state(fuelCompo, system.populations(n_fa_init, n_th_init), mTot)
+    Sigma_th = rm.SIGMA_TH_MAX
+    if initial_state is not None:
+        y = np.array(initial_state["y"], dtype=float)
+        Sigma_th = float(initial_state["Sigma_th"])
+
+    # --------- OPÉRATEUR D'EULER ET SES DÉRIVÉES ---------
+
+    dt = 1e-4
+    n_steps = int(t_final / dt)
+    E, rod, E_rod = system.euler_operator(dt)
+    dM, dq = derivatives(system, params)
+    dE = dt * dM
+    dE[:, -1] = dM[:, -1]
+    # w @ dE_flat = vec(dE/dp @ w), p le plus rapide
+    dE_flat = np.ascontiguousarray(np.transpose(dE, (2, 1, 0)).reshape(E.shape[1], -1))
+
+    rec_steps = rm.record_steps(n_steps, dt, stride, t_eval)
+    K = len(rec_steps)
+    recorder.allocate(K)
+    dY = np.zeros((K, len(d_idx), n_p))
+    dP = np.zeros((K if "power" in outputs else 0, n_p))
+    dS = np.zeros((K if "Sigma_th" in outputs else 0, n_p))
+
+    dy = np.zeros((len(y), n_p))
+    Sigma_th, P_sum, P_first, P_last, dSigma, dP_sum, dP_first, dP_last = \
+        eulerKernel.euler_steps_tangent(
+            E, dE_flat, y, dy, system.G, float(Sigma_th), np.zeros(n_p), rod, E_rod, system.q,
+            dq, rm.Q_FISSION, dt, n_steps, use_control, P_nom, K_p,
+            float(rm.SIGMA_TH_MIN), float(rm.SIGMA_TH_MAX),
+            rec_steps, recorder.index, recorder.Y, recorder.P, recorder.S, recorder.E,
+            d_idx, dY, dP, dS)
+
+    # énergie par trapèzes, comme _run_euler
+    recorder.E = rm._energy(recorder.E, P_first, dt)
+    if n_steps > 1:
+        E_tot = rm._energy(P_sum - 0.5 * P_last, P_first, dt)
+        dE_tot = dt * (dP_sum - 0.5 * (dP_first + dP_last))
+    else:
+        E_tot, dE_tot = 0.0, np.zeros(n_p)
+
+    final_state = {"y": y, "Sigma_th": float(Sigma_th)}
+    res = recorder.results(rec_steps * dt, E_tot / mTot, {"n_steps": n_steps, "n_parameters": n_p},
+                           final_state, mTot)
+    sens = {"parameters": params, "burnup": dE_tot / mTot}
+    for key in outputs:
+        if key == "power":
+            sens[key] = dP
+        elif key == "Sigma_th":
+            sens[key] = dS
+        else:
+            sens[key] = dY[:, d_keys.index(key)]
+    res["sensitivity"] = sens
+    return res
+
+
+def relative(res, key="power"):
+    """
+    Relative sensitivities (p / Y) dY/dp of output key of a
+    reactorSensitivity result, array (K, n_p): the relative change of Y for
+    a relative change of p (0 where Y = 0).
+    """
+    sens = res["sensitivity"]
+    values = np.array([p.value for p in sens["parameters"]])
+    Y = np.asarray(res[key], dtype=float)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(Y != 0.0, sens[key] * values[None, :] / Y, 0.0)
+
+
+def ranking(res, key="power", n=10, at=-1):
+    """
+    The n parameters with the largest relative sensitivity of output key at
+    the recorded time index at, as (label, relative sensitivity) pairs.
+    """
+    S = relative(res, key)[at]
+    order = np.argsort(-np.abs(S))[:n]
+    return [(label(res["sensitivity"]["parameters"][k]), float(S[k])) for k in order]
+
+
+if __name__ == "__main__":
+    fuel = rm.Fuel()
+    fuel.U235, fuel.U238 = 3.0, 97.0
+    res = reactorSensitivity(fuel, rm.FP(), 10.0, 1e10, 0.0, 25.0, stride=1000,
+                             P_nom=1e7, K_p=1e-10)
+    for key in ("power", "N_Xe"):
+        print("\n%s at t = %g s:" % (key, res["time"][-1]))
+        for name, S in ranking(res, key):
+            print("    %-24s %+.4e" % (name, S))
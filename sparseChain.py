@@ -0,0 +1,184 @@
+# sparseChain.py
+
+import json
+
+import numpy as np
+import scipy.sparse as sp
+
+import crossSection as cS
+from groupStructure import GroupStructure
+from nuclearData import NA, REGISTRY
+
+
+MEV_TO_J = 1.602e-13
+
+
+class SparseChain:
+    """
+    Explicit decay and fission-yield chain (hundreds to thousands of
+    nuclides) stored as sparse matrices, for long depletion runs with
+    reactorModel.depletion(chain=...).
+
+    The chain is read from a JSON file (see load_chain):
+
+        {"nuclides": [
+            {"name": "I135", "half_life": 23652.0,
+             "decays": [["BetaMinus", "Xe135", 1.0]],
+             "capture": "I136", "fission": false,
+             "xs": {"Capture": [7.0, 0.01]},
+             "molar_mass": 0.1349, "decay_energy": 1.1},
+            ...],
+         "yields": {"U235": {"I135": 0.0628, "Pm149": 0.0108}, ...}}
+
+    decays: (mode, daughter or null, branching ratio); half_life in [s],
+    absent or 0 for a stable nuclide; capture: daughter of (n, gamma) or
+    null; fission: whether the nuclide fissions (its yields are listed in
+    "yields"); xs: optional [thermal, fast] plateau values in [barn] that
+    override the cross-section library; molar_mass [kg/mol] and
+    decay_energy [MeV] (decay heat) are optional. Cross sections not in the
+    file come from crossSection.LIBRARY (0 if absent).
+
+    With G groups the burnup matrix is
+        A(flux) = D + sum_g flux_g * B_g
+    with D (decays) and B_g (captures, fissions and yields) in CSR format,
+    so memory and work grow with the number of nonzeros.
+
+    ----------------
+    :param data: dict (parsed file)
+    :param energies: array-like or groupStructure.GroupStructure
+    """
+
+    def __init__(self, data, energies):
+        entries = data["nuclides"]
+        self.nuclides = [e["name"] for e in entries]
+        self.index = {X: i for i, X in enumerate(self.nuclides)}
+        if len(self.index) != len(self.nuclides):
+            raise ValueError("duplicate nuclide names in the chain")
+        n = len(self.nuclides)
+
+        self.groups = energies if isinstance(energies, GroupStructure) else None
+        self.energies = (energies.energies.copy() if self.groups is not None
+                         else np.array(energies, dtype=float))
+        G = len(self.energies)
+
+        def idx(X, where):
+            if X not in self.index:
+                raise ValueError("%s: unknown nuclide '%s'" % (where, X))
+            return self.index[X]
+
+        # --- décroissances ---
+        self.lam = np.zeros(n)
+        self.decay_energy = np.zeros(n)
+        rows, cols, vals = [], [], []
+        for i, e in enumerate(entries):
+            T = e.get("half_life", 0.0) or 0.0
+            lam = np.log(2.0) / T if T > 0 else 0.0
+            self.lam[i] = lam
+            self.decay_energy[i] = e.get("decay_energy", 0.0)
+            if lam == 0.0:
+                continue
+            rows.append(i)
+            cols.append(i)
+            vals.append(-lam)
+            for mode, daughter, ratio in e.get("decays", []):
+                if daughter is not None:
+                    rows.append(idx(daughter, e["name"]))
+                    cols.append(i)
+                    vals.append(lam * ratio)
+        self.decay = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
+
+        # --- sections efficaces [m^2], shape (G, n) ---
+        self.sigma_fis, self.sigma_cap = self._cross_sections(entries, G)
+
+        # --- captures, fissions et rendements par groupe ---
+        fissile = [i for i, e in enumerate(entries) if e.get("fission", False)]
+        y_rows, y_cols, y_vals = [], [], []
+        for parent, yields in data.get("yields", {}).items():
+            j = idx(parent, "yields")
+            for product, y in yields.items():
+                y_rows.append(idx(product, "yields of " + parent))
+                y_cols.append(j)
+                y_vals.append(y)
+        self.yields = sp.csr_matrix((y_vals, (y_rows, y_cols)), shape=(n, n))
+
+        is_fissile = np.zeros(n, dtype=bool)
+        is_fissile[fissile] = True
+        self.sigma_fis[:, ~is_fissile] = 0.0
+
+        cap_from = [i for i, e in enumerate(entries) if e.get("capture")]
+        cap_to = [idx(entries[i]["capture"], entries[i]["name"]) for i in cap_from]
+        self.transmutation = []
+        for g in range(G):
+            loss = sp.diags(-(self.sigma_fis[g] + self.sigma_cap[g]))
+            gain = sp.csr_matrix((self.sigma_cap[g, cap_from], (cap_to, cap_from)), shape=(n, n))
+            fission = self.yields @ sp.diags(self.sigma_fis[g])
+            self.transmutation.append((loss + gain + fission).tocsr())
+
+        masses = [e.get("molar_mass") for e in entries]
+        # masses utiles seulement pour le combustible initial : pas d'avertissement
+        known = REGISTRY.tables["molar_mass"]
+        self.molar_mass = np.array([known.get(X, 0.0) if M is None else M
+                                    for X, M in zip(self.nuclides, masses)], dtype=float)
+
+    def _cross_sections(self, entries, G):
+        th = {(e["name"], R): v[0] for e in entries for R, v in e.get("xs", {}).items()}
+        fast = {(e["name"], R): v[1] for e in entries for R, v in e.get("xs", {}).items()}
+        reactions = ("Fission", "Capture")
+        sigma = np.zeros((2, G, len(entries)))
+
+        libraries = [cS.LIBRARY] + ([cS.CrossSectionLibrary(th, fast)] if th else [])
+        for lib in libraries:
+            ids = lib.pair_ids(self.nuclides, reactions)
+            found = ids >= 0
+            if not np.any(found):
+                continue
+            if self.groups is not None:
+                table = self.groups.collapse(ids[found], lib)
+            else:
+                table = lib.evaluate(ids[found], self.energies)
+            i, r = np.nonzero(found)
+            sigma[r, :, i] = table
+        return sigma[0] * 1e-28, sigma[1] * 1e-28
+
+    def __len__(self):
+        return len(self.nuclides)
+
+    @property
+    def nnz(self):
+        return self.decay.nnz + sum(B.nnz for B in self.transmutation)
+
+    def vector(self, values):
+        """Inventory vector from a {nuclide: value} dict (missing -> 0)."""
+        N = np.zeros(len(self.nuclides))
+        for X, value in values.items():
+            N[self.index[X]] = value
+        return N
+
+    def initial_inventory(self, fuelCompo, mTot):
+        """Number of nuclei from the fuel mass fractions [%] (attributes of fuelCompo)."""
+        N = np.zeros(len(self.nuclides))
+        for i, X in enumerate(self.nuclides):
+            if hasattr(fuelCompo, X) and self.molar_mass[i] > 0:
+                N[i] = mTot * getattr(fuelCompo, X) / 100.0 / self.molar_mass[i] * NA
+        return N
+
+    def fission_rates(self, flux):
+        """Vector f such that the total fission rate is f @ N [1/s], at group fluxes flux."""
+        return np.asarray(flux, dtype=float) @ self.sigma_fis
+
+    def burnup_matrix(self, flux):
+        """Sparse A (CSR) such that dN/dt = A N at the group fluxes flux [1/(m^2 s)]."""
+        A = self.decay.copy()
+        for phi, B in zip(flux, self.transmutation):
+            A = A + phi * B
+        return A.tocsr()
+
+    def decay_heat(self, N):
+        """Decay power [W] of inventories N (last axis = nuclides)."""
+        return np.asarray(N) @ (self.lam * self.decay_energy) * MEV_TO_J
+
+
+def load_chain(path, energies):
+    """SparseChain from a JSON chain file (format in SparseChain)."""
+    with open(path) as f:
+        return SparseChain(json.load(f), energies)
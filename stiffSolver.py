@@ -0,0 +1,193 @@
+# stiffSolver.py
+
+import numpy as np
+
+
+STIFF_METHODS = ("rosenbrock", "BDF", "Radau", "LSODA")
+
+# coefficients de la méthode de Rosenbrock 2(3) de Shampine (ode23s)
+_D = 1.0 / (2.0 + np.sqrt(2.0))
+_E32 = 6.0 + np.sqrt(2.0)
+
+
+def _error_norm(err, x_old, x_new, rtol, atol):
+    scale = atol + rtol * np.maximum(np.abs(x_old), np.abs(x_new))
+    return np.max(np.abs(err) / scale)
+
+
+def _crossed(event, g0, g1):
+    direction = getattr(event, "direction", 0)
+    up = g0 < 0.0 <= g1
+    down = g0 > 0.0 >= g1
+    return up if direction > 0 else down if direction < 0 else up or down
+
+
+def rosenbrock(fun, jac, t_final, x0, t_eval=None, rtol=1e-6, atol=1e-6,
+               h0=None, max_step=np.inf, max_steps=1000000, events=None):
+    """
+    L-stable Rosenbrock 2(3) integrator (Shampine & Reichelt, ode23s) for the
+    autonomous stiff system dx/dt = fun(t, x) on [0, t_final].
+
+    The step size is adapted from the embedded third-order error estimate and
+    the solution is interpolated at t_eval with the continuous extension of
+    the method.
+
+    ----------------
+    :param fun: callable f(t, x) -> array
+    :param jac: callable J(t, x) -> 2-D array, Jacobian of f
+    :param t_final: double
+        end time in [s]
+    :param x0: array-like
+        initial state
+    :param t_eval: array-like or None
+        output times in [0, t_final]; None -> every accepted step
+    :param rtol, atol: double or array
+        relative and absolute tolerances
+    :param events: list of callables g(t, x) or None
+        as in scipy.integrate.solve_ivp (attributes terminal, direction);
+        zero crossings are located on the continuous extension, and a
+        terminal event ends the integration (t_eval truncated)
+    :return: (t, X, stats)
+        output times, states of shape (len(t), len(x0)) and a dict of
+        counters (accepted/rejected steps, f and J evaluations), with
+        "t_events" / "x_events" (one list per event) when events are given
+    """
+
+    x = np.array(x0, dtype=float)
+    atol = np.broadcast_to(np.asarray(atol, dtype=float), x.shape)
+    I = np.eye(len(x))
+
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        X_out = np.zeros((len(t_eval), len(x)))
+        i_out = 0
+        while i_out < len(t_eval) and t_eval[i_out] <= 0.0:
+            X_out[i_out] = x
+            i_out += 1
+    else:
+        t_list = [0.0]
+        x_list = [x.copy()]
+
+    t = 0.0
+    F0 = fun(t, x)
+    if h0 is None:
+        scale = atol + rtol * np.abs(x)
+        rate = np.max(np.abs(F0) / scale)
+        h0 = 0.01 / rate if rate > 0 else 1e-3 * t_final
+    h = min(h0, max_step, t_final)
+
+    stats = {"n_steps": 0, "n_rejected": 0, "nfev": 1, "njev": 0}
+    events = list(events or [])
+    if events:
+        from scipy.optimize import brentq
+        g_old = [g(t, x) for g in events]
+        stats["terminated"] = False
+        stats["t_events"] = [[] for _ in events]
+        stats["x_events"] = [[] for _ in events]
+
+    def dense(s, x, h, k1, k2):
+        return x + h * (s * (1.0 - s) * k1 + s * (s - 2.0 * _D) * k2) / (1.0 - 2.0 * _D)
+
+    while t < t_final:
+        if stats["n_steps"] >= max_steps:
+            raise RuntimeError("rosenbrock: too many steps (%d) before t=%g" % (max_steps, t))
+        h = min(h, t_final - t)
+
+        J = jac(t, x)
+        stats["njev"] += 1
+        W = I - h * _D * J
+
+        k1 = np.linalg.solve(W, F0)
+        F1 = fun(t + 0.5 * h, x + 0.5 * h * k1)
+        k2 = np.linalg.solve(W, F1 - k1) + k1
+        x_new = x + h * k2
+        F2 = fun(t + h, x_new)
+        k3 = np.linalg.solve(W, F2 - _E32 * (k2 - F1) - 2.0 * (k1 - F0))
+        stats["nfev"] += 2
+
+        err = _error_norm(h / 6.0 * (k1 - 2.0 * k2 + k3), x, x_new, rtol, atol)
+
+        if err <= 1.0 and np.all(np.isfinite(x_new)):
+            t_new = t + h
+            t_stop = None
+            if events:
+                g_new = [g(t_new, x_new) for g in events]
+                for i, g in enumerate(events):
+                    if not _crossed(g, g_old[i], g_new[i]):
+                        continue
+                    s = brentq(lambda s: g(t + s * h, dense(s, x, h, k1, k2)), 0.0, 1.0,
+                               xtol=1e-12) if g_new[i] != 0.0 else 1.0
+                    stats["t_events"][i].append(t + s * h)
+                    stats["x_events"][i].append(dense(s, x, h, k1, k2))
+                    if getattr(g, "terminal", False) and (t_stop is None or t + s * h < t_stop):
+                        t_stop = t + s * h
+                g_old = g_new
+                if t_stop is not None:
+                    # fin au premier événement terminal : sortie tronquée
+                    t_new = t_stop
+                    x_new = dense((t_stop - t) / h, x, h, k1, k2)
+            if t_eval is not None:
+                while i_out < len(t_eval) and t_eval[i_out] <= t_new:
+                    X_out[i_out] = dense((t_eval[i_out] - t) / h, x, h, k1, k2)
+                    i_out += 1
+            else:
+                t_list.append(t_new)
+                x_list.append(x_new.copy())
+            t, x, F0 = t_new, x_new, F2
+            stats["n_steps"] += 1
+            if events and t_stop is not None:
+                stats["terminated"] = True
+                if t_eval is not None:
+                    return t_eval[:i_out], X_out[:i_out], stats
+                break
+        else:
+            stats["n_rejected"] += 1
+
+        if not np.isfinite(err):
+            h *= 0.1
+        elif err == 0.0:
+            h *= 5.0
+        else:
+            h *= min(5.0, max(0.1, 0.8 * err ** (-1.0 / 3.0)))
+        h = min(h, max_step)
+        if t < t_final and h < 10.0 * np.finfo(float).eps * t:
+            raise RuntimeError("rosenbrock: step size underflow at t=%g" % t)
+
+    if t_eval is not None:
+        return t_eval, X_out, stats
+    return np.array(t_list), np.array(x_list), stats
+
+
+def solve(fun, jac, t_final, x0, method="rosenbrock", t_eval=None, rtol=1e-6, atol=1e-6,
+          max_step=np.inf, events=None):
+    """
+    Integrate a stiff system with an adaptive implicit method.
+
+    method is 'rosenbrock' (built in) or one of the implicit solvers of
+    scipy.integrate.solve_ivp ('BDF', 'Radau', 'LSODA'), which need SciPy.
+    Same parameters and return value as rosenbrock().
+    """
+
+    if method == "rosenbrock":
+        return rosenbrock(fun, jac, t_final, x0, t_eval=t_eval, rtol=rtol, atol=atol,
+                          max_step=max_step, events=events)
+
+    if method not in STIFF_METHODS:
+        raise ValueError("Unknown stiff method '%s', expected one of %s" % (method, STIFF_METHODS))
+
+    try:
+        from scipy.integrate import solve_ivp
+    except ImportError:
+        raise ImportError("method='%s' needs SciPy, use method='rosenbrock' instead" % method)
+
+    sol = solve_ivp(fun, (0.0, t_final), np.asarray(x0, dtype=float), method=method,
+                    jac=jac, t_eval=t_eval, rtol=rtol, atol=atol, max_step=max_step,
+                    events=events or None)
+    if not sol.success:
+        raise RuntimeError("%s: %s" % (method, sol.message))
+    stats = {"nfev": sol.nfev, "njev": sol.njev, "nlu": sol.nlu}
+    if events:
+        stats["terminated"] = sol.status == 1
+        stats["t_events"] = [list(t) for t in sol.t_events]
+        stats["x_events"] = [list(x) for x in sol.y_events]
+    return sol.t, sol.y.T, stats
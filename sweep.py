@@ -0,0 +1,148 @@
+# sweep.py
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import reactorModel as rm
+
+
+# une simulation = une configuration explicite (pas de variables globales)
+RunConfig = namedtuple(
+    "RunConfig",
+    ["label", "fuel", "FP", "t_final", "n_th_init", "n_fa_init", "mTot",
+     "use_control", "P_nom", "K_p", "method", "stride", "settle_tol", "events"],
+    defaults=[100.0, 1e10, 0.0, 25.0, rm.USE_CONTROL, rm.P_NOM, rm.K_P, "euler", 1, 0.01, None],
+)
+RunConfig.__doc__ = """
+Scenario of a sweep: label, fuel (rm.Fuel), FP (rm.FP) and the arguments
+of reactorModel, the rod controller (use_control, P_nom, K_p) included.
+settle_tol is the relative power band used for the settling time.
+events (events.Event or list) may end a run early, e.g. on divergence.
+"""
+
+
+def settling_time(t, P, P_target, tol):
+    """
+    First time after which P stays within tol * |P_target| of P_target,
+    NaN if the power is still outside the band at the end of the run.
+    """
+    outside = np.flatnonzero(np.abs(P - P_target) > tol * abs(P_target))
+    if len(outside) == 0:
+        return float(t[0])
+    if outside[-1] == len(t) - 1:
+        return float("nan")
+    return float(t[outside[-1] + 1])
+
+
+def summarize(cfg, res):
+    """Compact summary of a run: final inventories, burnup, peak power, settling time."""
+    t, P = res["time"], res["power"]
+    if not np.all(np.isfinite(P)):
+        raise FloatingPointError("power diverged (non-finite values)")
+    P_target = cfg.P_nom if cfg.use_control else P[-1]
+    return {
+        "label": cfg.label,
+        "ok": True,
+        "burnup": float(res["burnup"]),
+        "peak_power": float(np.max(P)),
+        "final_power": float(P[-1]),
+        "settling_time": settling_time(t, P, P_target, cfg.settle_tol),
+        "final_Sigma_th": float(res["Sigma_th"][-1]),
+        "final": {key: float(res[key][-1]) for key in res if key.startswith("N_")},
+        "events": res.get("events", []),
+        "stopped_by": res["stats"].get("stopped_by"),
+    }
+
+
+def run_config(cfg):
+    """
+    Run one scenario and return its summary. Any error is returned as a
+    summary with ok=False instead of being raised, so that one diverging
+    case does not stop the sweep.
+    """
+    t0 = time.perf_counter()
+    try:
+        with np.errstate(over="raise", invalid="raise"):
+            res = rm.reactorModel(
+                fuelCompo=cfg.fuel, FPCompo=cfg.FP, t_final=cfg.t_final,
+                n_th_init=cfg.n_th_init, n_fa_init=cfg.n_fa_init, mTot=cfg.mTot,
+                method=cfg.method, stride=cfg.stride,
+                use_control=cfg.use_control, P_nom=cfg.P_nom, K_p=cfg.K_p,
+                events=cfg.events,
+            )
+        summary = summarize(cfg, res)
+    except Exception as e:
+        summary = {"label": cfg.label, "ok": False, "error": "%s: %s" % (type(e).__name__, e)}
+    summary["wall_time"] = time.perf_counter() - t0
+    return summary
+
+
+def iter_sweep(configs, max_workers=None):
+    """
+    Run the scenarios on a pool of processes (all cores by default) and
+    yield (index in configs, summary) as the runs complete.
+    max_workers=1 runs them one after the other in this process.
+    """
+    configs = list(configs)
+    if max_workers == 1:
+        for i, cfg in enumerate(configs):
+            yield i, run_config(cfg)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = {pool.submit(run_config, cfg): i for i, cfg in enumerate(configs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # processus tué, configuration non picklable, ...
+                summary = {"label": configs[i].label, "ok": False,
+                           "error": "%s: %s" % (type(e).__name__, e)}
+            yield i, summary
+
+
+def run_sweep(configs, max_workers=None, verbose=True):
+    """
+    Run a grid of scenarios in parallel.
+    :return: list of summaries in the order of configs
+    """
+    configs = list(configs)
+    summaries = [None] * len(configs)
+    for n_done, (i, summary) in enumerate(iter_sweep(configs, max_workers), 1):
+        summaries[i] = summary
+        if verbose:
+            status = "ok" if summary["ok"] else "FAILED (%s)" % summary["error"]
+            print("[%d/%d] %s : %s" % (n_done, len(configs), summary["label"], status))
+    return summaries
+
+
+def grid(**axes):
+    """
+    Cartesian product of parameter axes as a list of dicts, e.g.
+    grid(K_p=[1e-10, 1e-9], P_nom=[1e7, 2e7]) -> 4 dicts.
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*[np.arange(len(axes[k])) for k in names], indexing="ij")
+    return [{k: axes[k][i] for k, i in zip(names, idx)}
+            for idx in zip(*[m.ravel() for m in mesh])]
+
+
+if __name__ == "__main__":
+    configs = []
+    for p in grid(U235=[3.0, 4.0, 5.0], Xe135=[0.0, 3.165]):
+        fuel = rm.Fuel()
+        fuel.U235, fuel.U238 = p["U235"], 100.0 - p["U235"]
+        fp = rm.FP()
+        fp.Xe135, fp.FP = p["Xe135"], 100.0 - p["Xe135"]
+        configs.append(RunConfig("U235=%g%%, Xe=%g%%" % (p["U235"], p["Xe135"]), fuel, fp,
+                                 t_final=10.0, P_nom=1e7, K_p=1e-10, stride=100))
+
+    for s in run_sweep(configs):
+        if s["ok"]:
+            print("%-22s burnup=%.3e J/kg  P_max=%.3e W  t_settle=%.3g s"
+                  % (s["label"], s["burnup"], s["peak_power"], s["settling_time"]))
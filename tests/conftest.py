@@ -0,0 +1,24 @@
+# conftest.py
+#
+# Les modules du dépôt sont à la racine : la rendre importable depuis tests/.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reactorModel as rm  # noqa: E402
+
+
+@pytest.fixture
+def fuel():
+    """UOX 3 %, the composition of projet.py."""
+    f = rm.Fuel()
+    f.U235, f.U238 = 3.0, 97.0
+    return f
+
+
+# régulation des barres utilisée par les tests
+CONTROL = {"P_nom": 1e7, "K_p": 1e-10}
@@ -0,0 +1,44 @@
+# test_backends.py
+
+import warnings
+
+import numpy as np
+import pytest
+
+import eulerKernel
+import reactorModel as rm
+from conftest import CONTROL
+
+
+def test_numba_matches_numpy(fuel):
+    pytest.importorskip("numba")
+    kw = dict(stride=100, **CONTROL)
+    ref = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, **kw)
+    res = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, backend="numba", **kw)
+
+    # même boucle, sommes dans un autre ordre que le produit BLAS
+    for key in ref:
+        if isinstance(ref[key], np.ndarray):
+            np.testing.assert_allclose(res[key], ref[key], rtol=1e-10, err_msg=key)
+    np.testing.assert_allclose(res["burnup"], ref["burnup"], rtol=1e-10)
+
+
+def test_batch_matches_single_runs(fuel):
+    other = rm.Fuel()
+    other.U235, other.U238, other.Pu239 = 0.3, 92.7, 7.0
+    runs = rm.reactorEnsemble([fuel, other], rm.FP(), 0.2, 1e10, 0.0, 25.0, stride=50, **CONTROL)
+    for f, res in zip([fuel, other], runs):
+        ref = rm.reactorModel(f, rm.FP(), 0.2, 1e10, 0.0, 25.0, stride=50, **CONTROL)
+        for key in ("power", "N_Xe", "Sigma_th"):
+            np.testing.assert_allclose(res[key], ref[key], rtol=1e-12, err_msg=key)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        eulerKernel.get_kernel("fortran")
+
+
+def test_numpy_backend_does_not_warn():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert eulerKernel.get_kernel("numpy") is eulerKernel.euler_steps_numpy
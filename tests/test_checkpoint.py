@@ -0,0 +1,61 @@
+# test_checkpoint.py
+
+import os
+
+import numpy as np
+import pytest
+
+import reactorModel as rm
+from conftest import CONTROL
+
+
+class Interrupt(Exception):
+    pass
+
+
+def stop_after(t_stop):
+    def callback(snap):
+        if snap.time > t_stop:
+            raise Interrupt
+    return callback
+
+
+def run(fuel, **kw):
+    return rm.reactorModel(fuel, rm.FP(), 1.0, 1e10, 0.0, 25.0, stride=50, **CONTROL, **kw)
+
+
+def assert_same_run(res, ref):
+    for key in ref:
+        if isinstance(ref[key], np.ndarray):
+            np.testing.assert_array_equal(res[key], ref[key], err_msg=key)
+    assert res["burnup"] == ref["burnup"]
+    np.testing.assert_array_equal(res["final_state"]["y"], ref["final_state"]["y"])
+
+
+def test_resume_is_bit_identical(fuel, tmp_path):
+    ref = run(fuel)
+    path = str(tmp_path / "run.npz")
+    kw = dict(checkpoint=path, checkpoint_every=0.15, callback_every=1000)
+    with pytest.raises(Interrupt):
+        run(fuel, callback=stop_after(0.5), **kw)
+    assert os.path.exists(path)
+
+    res = run(fuel, callback=lambda snap: None, **kw)
+    assert_same_run(res, ref)
+    # historique écrit par segments, un par sauvegarde
+    assert os.path.exists(path + ".h0.npz") and os.path.exists(path + ".h1.npz")
+
+
+def test_blocks_do_not_change_burnup(fuel, tmp_path):
+    ref = run(fuel)
+    assert_same_run(run(fuel, callback=lambda snap: None, callback_every=777), ref)
+    assert_same_run(run(fuel, store=str(tmp_path / "store")), ref)
+    snaps = list(rm.iter_reactor(fuel, rm.FP(), 1.0, 1e10, 0.0, 25.0, every=0.33, **CONTROL))
+    assert snaps[-1].energy / 25.0 == ref["burnup"]
+
+
+def test_checkpoint_of_another_run(fuel, tmp_path):
+    path = str(tmp_path / "run.npz")
+    run(fuel, checkpoint=path, checkpoint_every=0.5)
+    with pytest.raises(ValueError):
+        rm.reactorModel(fuel, rm.FP(), 2.0, 1e10, 0.0, 25.0, checkpoint=path, **CONTROL)
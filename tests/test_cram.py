@@ -0,0 +1,43 @@
+# test_cram.py
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+from scipy.sparse import csr_matrix
+
+import cram
+import reactorModel as rm
+
+
+@pytest.fixture
+def burnup_problem(fuel):
+    system = rm.reactor_system(rm.FP())
+    G = system.G
+    N0 = system.initial_state(fuel, np.zeros(G), 25.0)[G:]
+    n_g = np.full(G, 1e14) * rm.V_CORE / system.speeds
+    return system.nuclide_matrix(n_g), N0
+
+
+@pytest.mark.parametrize("dt", [3600.0, 30 * 86400.0, 365 * 86400.0])
+def test_cram_matches_expm(burnup_problem, dt):
+    A, N0 = burnup_problem
+    ref = expm(A * dt) @ N0
+    np.testing.assert_allclose(cram.cram(A, N0, dt), ref, rtol=1e-8, atol=1e-12 * N0.max())
+
+
+def test_sparse_matches_dense(burnup_problem):
+    A, N0 = burnup_problem
+    dt = 30 * 86400.0
+    np.testing.assert_allclose(cram.cram(csr_matrix(A), N0, dt), cram.cram(A, N0, dt),
+                               rtol=1e-10, atol=1e-14 * N0.max())
+
+
+def test_pure_decay_conserves_atoms():
+    # chaîne sans sortie : U239 -> Np239 -> Pu239, le total est conservé
+    lam1, lam2 = np.log(2.0) / 1407.0, np.log(2.0) / 203558.0
+    A = np.array([[-lam1, 0.0, 0.0], [lam1, -lam2, 0.0], [0.0, lam2, 0.0]])
+    N = cram.cram(A, [1e20, 0.0, 0.0], 10 * 86400.0)
+    np.testing.assert_allclose(N.sum(), 1e20, rtol=1e-12)
+    # précision de CRAM relative à la plus grande valeur
+    np.testing.assert_allclose(N, expm(A * 10 * 86400.0) @ [1e20, 0.0, 0.0], rtol=1e-10,
+                               atol=1e-13 * 1e20)
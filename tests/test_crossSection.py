@@ -0,0 +1,107 @@
+# test_crossSection.py
+
+import os
+
+import numpy as np
+import pytest
+
+import crossSection as cs
+
+
+POINTWISE = """\
+# deux réactions de U235
+NUCLIDE U235
+INTERP linlin
+REACTION Fission
+1.0     10.0
+3.0     30.0
+REACTION Capture
+1.0     1.0
+100.0   100.0
+"""
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / "u235.txt"
+    path.write_text(POINTWISE)
+    return str(path)
+
+
+def test_parse_pointwise(table):
+    blocks = cs.parse_pointwise(table)
+    assert [b[:3] for b in blocks] == [("U235", "Fission", "linlin"),
+                                      ("U235", "Capture", "loglog")]
+    np.testing.assert_array_equal(blocks[0][3], [1.0, 3.0])
+    np.testing.assert_array_equal(blocks[0][4], [10.0, 30.0])
+
+
+def test_parse_pointwise_errors(tmp_path):
+    path = tmp_path / "bad.txt"
+    path.write_text("1.0 2.0\n")
+    with pytest.raises(ValueError, match="before NUCLIDE"):
+        cs.parse_pointwise(str(path))
+    path.write_text("NUCLIDE U235\nREACTION Fission\nINTERP cubic\n1.0 2.0\n")
+    with pytest.raises(ValueError, match="unknown INTERP"):
+        cs.parse_pointwise(str(path))
+    path.write_text("NUCLIDE U235\nREACTION Fission\n2.0 1.0\n1.0 2.0\n")
+    with pytest.raises(ValueError, match="not increasing"):
+        cs.parse_pointwise(str(path))
+
+
+def test_load_pointwise_cache(table, tmp_path, monkeypatch):
+    cache = str(tmp_path / "u235.npz")
+    lib = cs.load_pointwise(table, cache=cache)
+    assert os.path.exists(cache)
+    # lin-lin entre 1 et 3 eV, log-log entre 1 et 100 eV
+    np.testing.assert_allclose(lib.evaluate([lib.index[("U235", "Fission")]], [2.0]), [[20.0]])
+    np.testing.assert_allclose(lib.evaluate([lib.index[("U235", "Capture")]], [10.0]), [[10.0]])
+
+    # cache valide : les fichiers texte ne sont pas relus
+    def no_parse(path):
+        raise AssertionError("text file parsed again")
+    with monkeypatch.context() as m:
+        m.setattr(cs, "parse_pointwise", no_parse)
+        hit = cs.load_pointwise(table, cache=cache)
+    assert hit.table_pairs == lib.table_pairs
+    np.testing.assert_array_equal(hit.energy, lib.energy)
+    np.testing.assert_array_equal(hit.sigma, lib.sigma)
+    np.testing.assert_array_equal(hit.interp, lib.interp)
+
+    # fichier modifié : cache périmé, relu
+    with open(table, "a") as f:
+        f.write("NUCLIDE U238\nREACTION Capture\n1.0 2.7\n")
+    stale = cs.load_pointwise(table, cache=cache)
+    assert ("U238", "Capture") in stale.table_pairs
+    np.testing.assert_allclose(stale.evaluate([stale.index[("U238", "Capture")]], [5.0]), [[2.7]])
+
+
+def test_load_pointwise_fallback(table):
+    lib = cs.load_pointwise(table, fallback=cs.LIBRARY)
+    key = ("U238", "Fission")
+    assert key not in lib.table_pairs
+    E = np.array([0.025, 1e3, 2e6])
+    np.testing.assert_array_equal(lib.evaluate([lib.index[key]], E),
+                                  cs.LIBRARY.evaluate([cs.LIBRARY.index[key]], E))
+
+    alone = cs.load_pointwise(table, fallback=None)
+    assert key not in alone.index
+
+
+def test_library_matches_crossSection():
+    E = np.array([1e-5, 0.025, 1.0, 1e3, 1e6, 2e7])
+    nuclides = ["U235", "U238", "Pu239", "Xe135", "FP"]
+    reactions = ["Fission", "Capture"]
+    sigma, missing = cs.LIBRARY.lookup(nuclides, reactions, E)
+
+    for i, X in enumerate(nuclides):
+        for r, R in enumerate(reactions):
+            assert missing[i, r] == ((X, R) not in cs.LIBRARY.index)
+            if not missing[i, r]:
+                np.testing.assert_array_equal(sigma[i, r], cs.crossSection(X, R, E))
+    assert missing[nuclides.index("Xe135"), 0] and not np.any(sigma[nuclides.index("Xe135"), 0])
+
+    # plateaux thermique (<= 1 eV) et rapide (>= 1 MeV), log-linéaire entre les deux
+    np.testing.assert_allclose(cs.crossSection("U235", "Fission", [0.025, 1e3, 2e7]),
+                               [580.0, 290.5, 1.0])
+    assert cs.crossSection("U235", "Fission", 0.025).shape == ()
@@ -0,0 +1,18 @@
+# test_equilibrium.py
+
+import numpy as np
+
+import reactorModel as rm
+
+
+def test_equilibrium_is_steady(fuel):
+    eq = rm.equilibrium(fuel, rm.FP(), 25.0, P_nom=1e7)
+    assert eq["critical"]
+    assert eq["residual"] < 1e-8
+    np.testing.assert_allclose(eq["power"], 1e7, rtol=1e-8)
+
+    # départ de l'équilibre, barres figées : rien ne bouge
+    res = rm.reactorModel(fuel, rm.FP(), 1.0, 0.0, 0.0, 25.0, initial_state=eq, stride=1000,
+                          use_control=False)
+    np.testing.assert_allclose(res["power"], 1e7, rtol=1e-4)
+    np.testing.assert_allclose(res["N_Xe"], eq["N_Xe"], rtol=1e-4)
@@ -0,0 +1,69 @@
+# test_events.py
+
+import numpy as np
+
+import events as ev
+import reactorModel as rm
+from conftest import CONTROL
+
+
+def crossing_time(t, P, P_lim):
+    """First time where the recorded power falls to P_lim, interpolated."""
+    k = np.flatnonzero((P[:-1] > P_lim) & (P[1:] <= P_lim))[0]
+    return t[k] + (P_lim - P[k]) * (t[k + 1] - t[k]) / (P[k + 1] - P[k])
+
+
+def test_two_crossings_in_one_block(fuel):
+    ref = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, **CONTROL)
+    t, P = ref["time"], ref["power"]
+    # deux seuils franchis à 0.5 ms d'écart, dans le même bloc de EVENT_STEPS pas
+    P_a, P_b = np.interp([0.0285, 0.029], t, P)
+    events = [ev.PowerThreshold(P_a, direction=-1, terminal=False, name="a"),
+              ev.PowerThreshold(P_b, direction=-1, name="b")]
+
+    res = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, events=events, **CONTROL)
+    hits = {h["name"]: h["time"] for h in res["events"]}
+    assert list(hits) == ["a", "b"]
+    assert res["stats"]["stopped_by"] == "b"
+    # pas de l'événement : le pas d'Euler enregistré t_k = k dt suit y_{k+1}
+    dt = 1e-4
+    assert abs(hits["a"] - crossing_time(t + dt, P, P_a)) < dt
+    assert abs(hits["b"] - crossing_time(t + dt, P, P_b)) < dt
+    assert res["time"][-1] < hits["b"] < res["time"][-1] + 2 * dt
+    np.testing.assert_array_equal(res["power"], P[:len(res["power"])])
+
+
+def test_stiff_method_finds_both(fuel):
+    ref = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, **CONTROL)
+    P_a, P_b = np.interp([0.0285, 0.029], ref["time"], ref["power"])
+    events = [ev.PowerThreshold(P_a, direction=-1, terminal=False, name="a"),
+              ev.PowerThreshold(P_b, direction=-1, name="b")]
+    res = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, method="rosenbrock",
+                          events=events, **CONTROL)
+    assert [h["name"] for h in res["events"]] == ["a", "b"]
+    assert res["stats"]["stopped_by"] == "b"
+
+
+def test_profile_counts_only_the_run(fuel):
+    ref = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, **CONTROL)
+    P_a, P_b = np.interp([0.0285, 0.029], ref["time"], ref["power"])
+    events = [ev.PowerThreshold(P_a, direction=-1, terminal=False, name="a"),
+              ev.PowerThreshold(P_b, direction=-1, name="b")]
+
+    res = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, events=events,
+                          profile=True, **CONTROL)
+    # ni les dichotomies ni le bloc coupé par "b" ne sont comptés
+    assert res["stats"]["stopped_by"] == "b"
+    assert res["stats"]["profile"]["counts"]["steps"] == res["stats"]["n_steps"]
+
+
+def test_crossing_undone_within_a_block(fuel, monkeypatch):
+    # maximum de puissance (33.2 W) au 23e pas : 33 W franchi deux fois
+    # dans le premier bloc de EVENT_STEPS = 100 pas
+    events = [ev.PowerThreshold(33.0, direction=0, terminal=False)]
+    res = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, events=events, **CONTROL)
+    assert res["events"] == []
+
+    monkeypatch.setattr(rm, "EVENT_STEPS", 10)
+    res = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, events=events, **CONTROL)
+    assert len(res["events"]) == 2
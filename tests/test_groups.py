@@ -0,0 +1,33 @@
+# test_groups.py
+
+import numpy as np
+
+import reactorModel as rm
+from conftest import CONTROL
+from groupStructure import GroupStructure
+
+
+def two_group_check(system):
+    """Slowing-down of the two-group model: one rate LAMBDA_SLOW, Q_SLOW per neutron."""
+    L = rm.LAMBDA_SLOW
+    assert system.G == 2
+    np.testing.assert_allclose(system.scatter, [[-L, 0.0], [L, 0.0]], rtol=1e-12)
+    np.testing.assert_allclose(system.q[:2], [rm.Q_SLOW * L, 0.0], rtol=1e-12)
+
+
+def test_two_groups_reduce_to_the_two_group_model(fuel):
+    two_group_check(rm.reactor_system(rm.FP()))
+
+    # structure à deux groupes centrés (en léthargie) sur E_FAST et E_TH
+    b = np.sqrt(rm.E_FAST * rm.E_TH)
+    groups = GroupStructure([rm.E_FAST ** 2 / b, b, rm.E_TH ** 2 / b])
+    np.testing.assert_allclose(groups.energies, [rm.E_FAST, rm.E_TH], rtol=1e-12)
+    system = rm.reactor_system(rm.FP(), groups)
+    two_group_check(system)
+    assert list(rm.state_keys(system))[:2] == ["n_fast", "n_thermal"]
+
+    ref = rm.reactorModel(fuel, rm.FP(), 0.1, 1e10, 0.0, 25.0, stride=10, **CONTROL)
+    res = rm.reactorModel(fuel, rm.FP(), 0.1, 1e10, 0.0, 25.0, stride=10,
+                          groups=[rm.E_FAST, rm.E_TH], **CONTROL)
+    for key in ("power", "n_fast", "n_thermal", "N_Xe"):
+        np.testing.assert_array_equal(res[key], ref[key])
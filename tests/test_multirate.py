@@ -0,0 +1,24 @@
+# test_multirate.py
+
+import numpy as np
+
+import reactorModel as rm
+from conftest import CONTROL
+
+
+def test_default_macro_step_tracks_euler(fuel):
+    # macro_dt par défaut : pas choisi par l'erreur sur l'inventaire
+    ref = rm.reactorModel(fuel, rm.FP(), 10.0, 1e10, 0.0, 25.0, stride=10, **CONTROL)
+    res = rm.reactorModel(fuel, rm.FP(), 10.0, 1e10, 0.0, 25.0, method="multirate", **CONTROL)
+
+    assert rm.history_error(res, ref, "N_Xe") < 1e-2
+    assert res["time"][-1] <= 10.0
+    assert np.all(np.diff(res["time"]) > 0)
+    np.testing.assert_allclose(res["burnup"], ref["burnup"], rtol=1e-2)
+
+
+def test_outputs_at_t_eval(fuel):
+    t = np.linspace(0.0, 5.0, 11)
+    res = rm.reactorModel(fuel, rm.FP(), 5.0, 1e10, 0.0, 25.0, method="multirate", t_eval=t,
+                          **CONTROL)
+    np.testing.assert_allclose(res["time"], t)
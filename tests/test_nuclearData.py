@@ -0,0 +1,43 @@
+# test_nuclearData.py
+
+import json
+
+import numpy as np
+
+import halfLife as hL
+import molarMass as mM
+from nuclearData import NA, REGISTRY, NuclearData
+
+
+def test_registry_matches_data_modules():
+    for (X, mode), T in hL.HL_DB.items():
+        assert REGISTRY.half_life(X, mode) == hL.halfLife(X, mode) == T
+        assert REGISTRY.decay_constant(X, mode) == np.log(2.0) / T
+    for X in mM.MOLAR_MASS_DB:
+        assert REGISTRY.molar_mass(X) == mM.molarMass(X)
+
+    nuclides = ["U235", "U238", "Xe135", "FP"]
+    ids = REGISTRY.id_array(nuclides)
+    assert [REGISTRY.id(X) for X in nuclides] == ids.tolist()
+    M = np.array([mM.molarMass(X) for X in nuclides])
+    np.testing.assert_array_equal(REGISTRY.molar_masses(ids), M)
+    np.testing.assert_array_equal(REGISTRY.atoms_per_kg(ids), NA / M)
+
+
+def test_json_source_overrides(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"molar_mass": {"I135": 0.1349},
+                                "half_life": {"I135": {"BetaMinus": 23652.0},
+                                              "Xe135": {"BetaMinus": 3.0e4}}}))
+    data = NuclearData()
+    i_xe = data.id("Xe135")
+    assert data.half_life("Xe135", "BetaMinus") == hL.halfLife("Xe135", "BetaMinus")
+
+    data.add_source(str(path))
+    assert data.id("Xe135") == i_xe
+    assert data.half_life("Xe135", "BetaMinus") == 3.0e4
+    assert data.molar_mass("I135") == 0.1349
+    assert data.decay_constant("I135", "BetaMinus") == np.log(2.0) / 23652.0
+    # donnée absente : 0, signalée une seule fois
+    assert data.molar_mass("Cs137") == 0.0
+    assert data.missing == {("molar mass", "Cs137")}
@@ -0,0 +1,71 @@
+# test_phases.py
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+import cram
+import reactorModel as rm
+from conftest import CONTROL
+
+
+@pytest.fixture
+def irradiated(fuel):
+    """Final state of a short irradiation, neutrons removed."""
+    res = rm.reactorModel(fuel, rm.FP(), 0.2, 1e10, 0.0, 25.0, stride=100, **CONTROL)
+    state = res["final_state"]
+    system = rm.reactor_system(rm.FP())
+    state["y"] = np.array(state["y"])
+    state["y"][:system.G] = 0.0
+    return system, state
+
+
+@pytest.mark.parametrize("duration", [3600.0, 30 * 86400.0])
+def test_bateman_matches_cram(irradiated, duration):
+    system, state = irradiated
+    G = system.G
+    N0 = state["y"][G:]
+    A = system.nuclide_matrix(np.zeros(G))
+
+    res = rm.cooling(state, rm.FP(), duration, 25.0)
+    N = res["final_state"]["y"][G:]
+    np.testing.assert_allclose(N, cram.cram(A, N0, duration), rtol=1e-8, atol=1e-12 * N0.max())
+    np.testing.assert_allclose(N, expm(A * duration) @ N0, rtol=1e-8, atol=1e-12 * N0.max())
+
+
+def test_first_phase_source(fuel):
+    ref = rm.reactorModel(fuel, rm.FP(), 0.2, 3e10, 0.0, 25.0, stride=10, **CONTROL)
+    res = rm.reactorPhases(fuel, rm.FP(), 25.0, [{"duration": 0.2, "n_th_init": 3e10}],
+                           stride=10, **CONTROL)
+    np.testing.assert_array_equal(res["power"], ref["power"])
+    assert res["burnup"] == ref["burnup"]
+
+
+def test_phase_boundary_continuity(fuel):
+    ref = rm.reactorModel(fuel, rm.FP(), 0.4, 1e10, 0.0, 25.0, stride=10, **CONTROL)
+    res = rm.reactorPhases(fuel, rm.FP(), 25.0, [{"duration": 0.2}, {"duration": 0.2}],
+                           stride=10, **CONTROL)
+
+    # même trajectoire : la seconde phase repart de l'état final de la première
+    np.testing.assert_allclose(res["time"], ref["time"], rtol=1e-12)
+    np.testing.assert_allclose(res["power"], ref["power"], rtol=1e-12)
+    np.testing.assert_allclose(res["final_state"]["y"], ref["final_state"]["y"], rtol=1e-12)
+    # énergie continue à la frontière, cumulée sur les phases
+    np.testing.assert_allclose(res.burnup_history, ref.burnup_history, rtol=1e-3)
+    assert np.all(np.diff(res.energy) > 0.0)
+    assert res["burnup"] == pytest.approx(ref["burnup"], rel=1e-3)
+
+
+def test_shutdown_keeps_t_eval(fuel):
+    t_eval = np.linspace(0.0, 3600.0, 11)
+    phases = [{"duration": 1.0, "stride": 100},
+              {"duration": 3600.0, "shutdown": True, "t_eval": t_eval}]
+    res = rm.reactorPhases(fuel, rm.FP(), 25.0, phases, **CONTROL)
+
+    kinds = [p["kind"] for p in res["phases"]]
+    assert kinds == ["kinetic", "kinetic", "bateman"]
+    t_settle = res["phases"][1]["duration"]
+    # 100 sorties de la première phase, t_eval et la fin de la décroissance des précurseurs
+    np.testing.assert_allclose(res["time"][100:], np.sort(np.append(1.0 + t_eval, 1.0 + t_settle)),
+                               atol=1e-3)
+    assert res.burnup_history[-1] == pytest.approx(res["burnup"], rel=1e-12)
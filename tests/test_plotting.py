@@ -0,0 +1,72 @@
+# test_plotting.py
+
+import numpy as np
+import pytest
+
+import plotting
+
+
+@pytest.fixture
+def signal():
+    """Noisy series with one narrow spike and one narrow dip."""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.0, 10.0, 100001)
+    y = np.sin(x) + 0.01 * rng.standard_normal(len(x))
+    y[31234] = 5.0
+    y[77777] = -5.0
+    return x, y
+
+
+def test_minmax_keeps_ends_and_extrema(signal):
+    x, y = signal
+    idx = plotting.minmax_indices(x, y, 500)
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert len(idx) <= 4 * 500
+    assert 31234 in idx and 77777 in idx
+
+    # extrema de chaque seau conservés
+    starts = plotting._bucket_starts(x, 500)
+    bucket = np.searchsorted(starts, idx, side="right") - 1
+    np.testing.assert_array_equal(np.maximum.reduceat(y, starts),
+                                  [y[idx[bucket == b]].max() for b in range(len(starts))])
+    np.testing.assert_array_equal(np.minimum.reduceat(y, starts),
+                                  [y[idx[bucket == b]].min() for b in range(len(starts))])
+
+
+def test_lttb_length_and_ends(signal):
+    x, y = signal
+    idx = plotting.lttb_indices(x, y, 1000)
+    assert len(idx) == 1000
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 31234 in idx and 77777 in idx
+
+
+def test_downsample(signal):
+    x, y = signal
+    for method in plotting.DOWNSAMPLING:
+        xd, yd = plotting.downsample(x, y, 2000, method)
+        assert len(xd) <= 2000
+        assert (xd[0], xd[-1]) == (x[0], x[-1])
+        assert (yd.max(), yd.min()) == (y.max(), y.min())
+    # série courte inchangée
+    xs, ys = plotting.downsample(x[:100], y[:100], 2000)
+    assert len(xs) == len(ys) == 100
+    with pytest.raises(ValueError):
+        plotting.downsample(x, y, 2000, "stride")
+
+
+def test_render_all_in_worker_processes(signal, tmp_path):
+    pytest.importorskip("matplotlib")
+    x, y = signal
+    specs = [plotting.FigureSpec("power.png", title="P", xlabel="t [s]").plot(x, y, "P"),
+             plotting.FigureSpec("xe.png", yscale="log").plot(x, np.exp(y))]
+    files = plotting.render_all(specs, directory=str(tmp_path / "fig"), max_workers=2)
+
+    assert files == [str(tmp_path / "fig" / name) for name in ("power.png", "xe.png")]
+    for name in files:
+        with open(name, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    # les FigureSpec d'origine ne sont pas modifiées
+    assert specs[0].filename == "power.png" and len(specs[0].series[0][0]) == len(x)
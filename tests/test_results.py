@@ -0,0 +1,22 @@
+# test_results.py
+
+import numpy as np
+
+import reactorModel as rm
+from conftest import CONTROL
+
+
+def test_burnup_history_with_stride(fuel):
+    # 5001 pas : le dernier est enregistré avec stride=100
+    ref = rm.reactorModel(fuel, rm.FP(), 0.5001, 1e10, 0.0, 25.0, **CONTROL)
+    res = rm.reactorModel(fuel, rm.FP(), 0.5001, 1e10, 0.0, 25.0, stride=100, **CONTROL)
+
+    assert res["time"][-1] == 0.5
+    assert res.burnup_history[-1] == res["burnup"]
+    np.testing.assert_array_equal(res.energy, ref.energy[::100])
+
+
+def test_energy_without_channel_falls_back_on_power(fuel):
+    res = rm.reactorModel(fuel, rm.FP(), 0.2, 1e10, 0.0, 25.0, record=["power"], **CONTROL)
+    assert "energy" not in res
+    np.testing.assert_allclose(res.burnup_history[-1], res["burnup"], rtol=1e-6)
@@ -0,0 +1,48 @@
+# test_sensitivity.py
+
+import copy
+
+import numpy as np
+
+import reactorModel as rm
+import sensitivity as se
+from conftest import CONTROL
+
+
+def test_tangent_matches_finite_differences(fuel, monkeypatch):
+    system = rm.reactor_system(rm.FP())
+    chosen = [("U235", "Fission", 1), ("Xe135", "Capture", 1), ("U238", "Capture", 0),
+              ("Xe135", "BetaMinus", None)]
+    params = [p for p in se.parameters(system) if (p.nuclide, p.reaction, p.group) in chosen]
+    assert len(params) == len(chosen)
+    dM, dq = se.derivatives(system, params)
+
+    kw = dict(stride=100, **CONTROL)
+    res = se.reactorSensitivity(fuel, rm.FP(), 0.3, 1e10, 0.0, 25.0, params=params, **kw)
+    ref = rm.reactorModel(fuel, rm.FP(), 0.3, 1e10, 0.0, 25.0, **kw)
+    np.testing.assert_array_equal(res["power"], ref["power"])
+
+    reactor_system = rm.reactor_system
+    for k, p in enumerate(params):
+        out = []
+        for eps in (1e-3 * p.value, -1e-3 * p.value):
+            # M et q sont linéaires par paramètre : perturbation exacte
+            def perturbed(FPCompo, groups=None, eps=eps):
+                s = copy.copy(reactor_system(FPCompo, groups))
+                s.M = s.M + eps * dM[k]
+                s.q = s.q + eps * dq[:, k]
+                return s
+            monkeypatch.setattr(rm, "reactor_system", perturbed)
+            out.append(rm.reactorModel(fuel, rm.FP(), 0.3, 1e10, 0.0, 25.0, **kw))
+        monkeypatch.setattr(rm, "reactor_system", reactor_system)
+
+        h = 2e-3 * p.value
+        for key in ("power", "N_Xe"):
+            fd = (out[0][key] - out[1][key]) / h
+            tangent = res["sensitivity"][key][:, k]
+            # erreur d'arrondi des différences finies : ~1e-12 Y / h
+            tol = 1e-4 * np.max(np.abs(tangent)) + 1e-11 * np.max(np.abs(ref[key])) / h
+            assert np.max(np.abs(fd - tangent)) < tol, (se.label(p), key)
+        np.testing.assert_allclose((out[0]["burnup"] - out[1]["burnup"]) / h,
+                                   res["sensitivity"]["burnup"][k], rtol=1e-4,
+                                   atol=1e-11 * ref["burnup"] / h)
@@ -0,0 +1,49 @@
+# test_sparseChain.py
+
+import numpy as np
+
+import halfLife as hL
+import nuclideChain as nC
+import reactorModel as rm
+import sparseChain
+
+
+def heavy_chain_data():
+    """Actinides of the dense chain (FP and Xe135 left out) in the SparseChain format."""
+    heavy = [X for X in nC.NUCLIDES if X not in ("FP", "Xe135")]
+    entries = {X: {"name": X, "decays": [], "capture": None, "fission": False} for X in heavy}
+    for X, R, D in nC.REACTIONS:
+        if X not in entries:
+            continue
+        e = entries[X]
+        if R == "Fission":
+            e["fission"] = True
+        elif R == "Capture":
+            e["capture"] = D
+        else:
+            e["half_life"] = hL.halfLife(X, R)
+            e["decays"].append([R, D, 1.0])
+    return {"nuclides": [entries[X] for X in heavy]}
+
+
+def test_sparse_matches_dense_on_actinides(fuel):
+    energies = [rm.E_FAST, rm.E_TH]
+    sparse = sparseChain.SparseChain(heavy_chain_data(), energies)
+    dense = nC.default_chain(energies)
+    cols = [dense.index[X] for X in sparse.nuclides]
+
+    flux = np.array([1e17, 1e18])
+    np.testing.assert_allclose(sparse.sigma_fis, dense.sigma_fis[:, cols], rtol=1e-14)
+    np.testing.assert_allclose(sparse.sigma_cap, dense.sigma_cap[:, cols], rtol=1e-14)
+    np.testing.assert_allclose(sparse.burnup_matrix(flux).toarray(),
+                               dense.burnup_matrix(flux)[np.ix_(cols, cols)],
+                               rtol=1e-14, atol=1e-30)
+
+    # les actinides ne reçoivent rien des PF : mêmes inventaires en déplétion
+    times = np.array([0.0, 10.0, 30.0]) * 86400.0
+    ref = rm.depletion(fuel, rm.FP(), 25.0, times, flux)
+    res = rm.depletion(fuel, rm.FP(), 25.0, times, flux, chain=sparse)
+    for X in sparse.nuclides:
+        np.testing.assert_allclose(res["N_" + X], ref[nC.RESULT_KEYS[X]], rtol=1e-8,
+                                   atol=1e-12 * ref["N_U238"][0], err_msg=X)
+    np.testing.assert_allclose(res["power"], ref["power"], rtol=1e-8)
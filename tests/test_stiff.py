@@ -0,0 +1,25 @@
+# test_stiff.py
+
+import numpy as np
+
+import reactorModel as rm
+from conftest import CONTROL
+
+
+def test_rosenbrock_matches_radau(fuel):
+    t = np.linspace(0.0, 0.5, 11)
+    kw = dict(t_eval=t, rtol=1e-8, atol=1e-2, **CONTROL)
+    ros = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, method="rosenbrock", **kw)
+    rad = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, method="Radau", **kw)
+
+    for key in ("power", "n_thermal", "N_Xe", "Sigma_th"):
+        np.testing.assert_allclose(ros[key], rad[key], rtol=1e-4, err_msg=key)
+    np.testing.assert_allclose(ros["burnup"], rad["burnup"], rtol=1e-4)
+
+
+def test_rosenbrock_close_to_euler(fuel):
+    t = np.linspace(0.0, 0.2, 5)
+    ros = rm.reactorModel(fuel, rm.FP(), 0.2, 1e10, 0.0, 25.0, method="rosenbrock", t_eval=t,
+                          **CONTROL)
+    eul = rm.reactorModel(fuel, rm.FP(), 0.2, 1e10, 0.0, 25.0, t_eval=t, **CONTROL)
+    np.testing.assert_allclose(ros["power"][1:], eul["power"][1:], rtol=1e-2)
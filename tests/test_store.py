@@ -0,0 +1,38 @@
+# test_store.py
+
+import numpy as np
+
+import reactorModel as rm
+import resultStore
+from conftest import CONTROL
+from results import Results
+
+
+def test_stored_run_matches_memory(fuel, tmp_path):
+    kw = dict(stride=10, **CONTROL)
+    ref = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, **kw)
+    res = rm.reactorModel(fuel, rm.FP(), 0.5, 1e10, 0.0, 25.0, store=str(tmp_path / "run"), **kw)
+
+    assert isinstance(res, Results)
+    assert set(res) == set(ref)
+    for key in ref:
+        if isinstance(ref[key], np.ndarray):
+            np.testing.assert_array_equal(res[key], ref[key], err_msg=key)
+    assert res["burnup"] == ref["burnup"]
+
+    # grandeurs dérivées depuis les fichiers
+    np.testing.assert_array_equal(res.burnup_history, ref.burnup_history)
+    np.testing.assert_array_equal(res.mass("U235"), ref.mass("U235"))
+    np.testing.assert_array_equal(res.reactivity, ref.reactivity)
+
+    reopened = rm.open_results(str(tmp_path / "run"))
+    np.testing.assert_array_equal(reopened.burnup_MWd_t, ref.burnup_MWd_t)
+
+
+def test_writer_grows_past_capacity(tmp_path):
+    path = str(tmp_path / "w")
+    writer = resultStore.ResultWriter(path, ["a"], capacity=3)
+    for i in range(5):
+        writer.append({"a": np.arange(3.0) + 3 * i})
+    writer.close()
+    np.testing.assert_array_equal(resultStore.open_results(path)["a"], np.arange(15.0))
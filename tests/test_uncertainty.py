@@ -0,0 +1,49 @@
+# test_uncertainty.py
+
+import numpy as np
+import pytest
+
+import reactorModel as rm
+import uncertainty as uq
+
+
+def test_online_stats_match_numpy():
+    rng = np.random.default_rng(0)
+    x = rng.lognormal(size=(2000, 3))
+    stats = uq.OnlineStats((3,), quantiles=(0.05, 0.5, 0.95))
+    for batch in np.array_split(x, 23):
+        stats.update(batch)
+
+    np.testing.assert_allclose(stats.mean, x.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(stats.variance, x.var(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_array_equal(stats.min, x.min(axis=0))
+    np.testing.assert_array_equal(stats.max, x.max(axis=0))
+    for p in (0.05, 0.5, 0.95):
+        # P² : estimation, à quelques % de la valeur exacte
+        np.testing.assert_allclose(stats.quantile(p), np.quantile(x, p, axis=0), rtol=0.05)
+
+
+def test_lhs_stratified_over_all_batches():
+    n, d = 100, 4
+    sampler = uq.Sampler(d, "lhs", seed=1, n_total=n)
+    u = np.vstack([sampler.draw(32), sampler.draw(32), sampler.draw(36)])
+    for j in range(d):
+        assert len(np.unique(np.floor(u[:, j] * n))) == n
+    with pytest.raises(ValueError):
+        sampler.draw(1)
+
+
+def test_no_samples(fuel):
+    with pytest.raises(ValueError):
+        uq.propagate(fuel, rm.FP(), 0.01, 1e10, 0.0, 25.0, 0)
+
+
+def test_unperturbed_samples_match_reactor_model(fuel):
+    res = uq.propagate(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, 6, batch_size=4, seed=0,
+                       uncertainties={("U235", "Fission"): 0.0}, stride=100,
+                       P_nom=1e7, K_p=1e-10)
+    ref = rm.reactorModel(fuel, rm.FP(), 0.05, 1e10, 0.0, 25.0, stride=100,
+                          P_nom=1e7, K_p=1e-10)
+    assert res["n_samples"] == 6 and res["n_failed"] == 0
+    np.testing.assert_allclose(res["stats"]["power"].mean, ref["power"], rtol=1e-12)
+    np.testing.assert_allclose(res["stats"]["burnup"].mean, ref["burnup"], rtol=1e-12)
@@ -0,0 +1,337 @@
+# uncertainty.py
+#
+# Propagation Monte Carlo des incertitudes des données nucléaires :
+# échantillons tirés par lots, simulés ensemble (reactorEnsemble), et
+# statistiques cumulées au fil de l'eau, sans garder les échantillons.
+
+import copy
+
+import numpy as np
+from scipy.stats import norm, qmc
+
+import nuclideChain as nC
+import reactorModel as rm
+from nuclearData import REGISTRY
+
+
+SAMPLING = ("lhs", "sobol", "random")
+
+# pseudo-réaction du rendement de fission en Xe135 (FP.Xe135)
+YIELD = "Yield"
+
+
+def default_uncertainties(system, xs=0.05, half_life=0.01, xe_yield=0.05):
+    """
+    Relative uncertainties (1 sigma) of every datum of the model:
+    {(nuclide, reaction): rel} for the cross sections of the neutron
+    reactions of the chain, the half-lives of its decays and the Xe135
+    fission yield (key ("Xe135", YIELD)).
+    """
+    unc = {}
+    for X, R, _ in system.chain.reactions:
+        if R in nC.NEUTRON_REACTIONS:
+            unc[(X, R)] = xs
+        elif REGISTRY.half_life(X, R) > 0:
+            unc[(X, R)] = half_life
+    unc[("Xe135", YIELD)] = xe_yield
+    return unc
+
+
+def lognormal_factors(u, rel):
+    """
+    Multiplicative factors of mean 1 and relative standard deviation rel
+    from uniform samples u in (0, 1), through a lognormal law so that
+    cross sections and half-lives stay positive.
+    :param u: array (n_samples, d)
+    :param rel: array-like (d,)
+    """
+    s = np.sqrt(np.log1p(np.asarray(rel, dtype=float) ** 2))
+    return np.exp(s * norm.ppf(u) - 0.5 * s ** 2)
+
+
+class Sampler:
+    """
+    Uniform samples in (0, 1)^d drawn batch after batch: a Latin hypercube
+    ('lhs'), the continuation of one scrambled Sobol sequence ('sobol',
+    batches of a power of 2 keep its balance) or plain Monte Carlo
+    ('random').
+
+    With n_total the Latin hypercube is stratified over all the n_total
+    samples (one of the n_total strata of each dimension per sample, in a
+    random order drawn once), so that the batches together form a single
+    hypercube; without it each batch is a hypercube of its own.
+
+    ----------------
+    :param n_total: int or None, number of samples to be drawn ('lhs')
+    """
+
+    def __init__(self, d, method="lhs", seed=None, n_total=None):
+        if method not in SAMPLING:
+            raise ValueError("Unknown sampling '%s', expected one of %s" % (method, SAMPLING))
+        self.d = d
+        self.method = method
+        self.rng = np.random.default_rng(seed)
+        self.n_total = n_total
+        self.n_drawn = 0
+        if method == "sobol":
+            self.sobol = qmc.Sobol(d, scramble=True, seed=self.rng)
+        if method == "lhs" and n_total is not None:
+            # strate de chaque dimension pour chaque échantillon, shape (n_total, d)
+            self.strata = np.column_stack([self.rng.permutation(n_total) for _ in range(d)])
+
+    def draw(self, n):
+        if self.method == "lhs" and self.n_total is not None:
+            if self.n_drawn + n > self.n_total:
+                raise ValueError("%d samples drawn out of n_total = %d"
+                                 % (self.n_drawn + n, self.n_total))
+            strata = self.strata[self.n_drawn:self.n_drawn + n]
+            u = (strata + self.rng.random((n, self.d))) / self.n_total
+        elif self.method == "lhs":
+            u = qmc.LatinHypercube(self.d, seed=self.rng).random(n)
+        elif self.method == "sobol":
+            u = self.sobol.random(n)
+        else:
+            u = self.rng.random((n, self.d))
+        self.n_drawn += n
+        # norm.ppf(0) = -inf
+        return np.clip(u, 1e-12, 1.0 - 1e-12)
+
+
+def perturbed_system(system, FPCompo, keys, factors):
+    """
+    ReactorSystem of system with the data of keys ((nuclide, reaction)
+    pairs, see default_uncertainties) multiplied by factors.
+    """
+    scale = {}
+    FPc = FPCompo
+    for key, f in zip(keys, factors):
+        if key[1] == YIELD:
+            FPc = copy.copy(FPCompo)
+            FPc.Xe135 = FPCompo.Xe135 * f
+        else:
+            scale[key] = f
+    return rm.ReactorSystem(system.chain.scaled(scale), FPc)
+
+
+class P2Quantile:
+    """
+    P² estimator of the quantile p (Jain & Chlamtac, 1985), on arrays: five
+    markers per entry, updated one observation at a time, constant memory
+    whatever the number of observations.
+
+    ----------------
+    :param p: double in (0, 1)
+    :param shape: shape of one observation
+    """
+
+    def __init__(self, p, shape=()):
+        self.p = p
+        self.count = 0
+        self.first = []
+        self.q = np.zeros((5,) + tuple(shape))
+        self.n = np.zeros((5,) + tuple(shape))
+        self.n_want = np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])
+        self.dn = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+
+    def _expand(self, a):
+        return a.reshape((5,) + (1,) * (self.q.ndim - 1))
+
+    def add(self, x):
+        x = np.asarray(x, dtype=float)
+        self.count += 1
+        if self.count <= 5:
+            self.first.append(x)
+            if self.count == 5:
+                self.q = np.sort(np.array(self.first), axis=0)
+                self.n = np.broadcast_to(self._expand(np.arange(5.0)), self.q.shape).copy()
+                self.first = []
+            return
+
+        q, n = self.q, self.n
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        k = (x >= q[1]).astype(int) + (x >= q[2]) + (x >= q[3])
+        n += self._expand(np.arange(5)) > k[None]
+        want = self._expand(self.n_want + (self.count - 5) * self.dn)
+
+        # ajustement des marqueurs centraux (parabolique, sinon linéaire)
+        for i in (1, 2, 3):
+            d = want[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            d = np.where(move, np.sign(d), 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                par = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                nb = np.where(d > 0, i + 1, i - 1)
+                q_nb = np.take_along_axis(q, nb[None], axis=0)[0]
+                n_nb = np.take_along_axis(n, nb[None], axis=0)[0]
+                lin = q[i] + d * (q_nb - q[i]) / (n_nb - n[i])
+            inside = (q[i - 1] < par) & (par < q[i + 1])
+            q[i] = np.where(move, np.where(inside, par, lin), q[i])
+            n[i] += d
+
+    @property
+    def value(self):
+        if self.count < 5:
+            if self.count == 0:
+                return np.full(self.q.shape[1:], np.nan)
+            return np.quantile(np.array(self.first), self.p, axis=0)
+        return self.q[2].copy()
+
+
+class OnlineStats:
+    """
+    Running statistics of a sampled quantity (array of a given shape): mean
+    and variance by Welford's update, merged batch by batch (Chan et al.),
+    minimum, maximum and P² quantiles. Memory does not depend on the number
+    of samples.
+
+    ----------------
+    :param shape: shape of one sample, e.g. (K,) for a history
+    :param quantiles: tuple of doubles in (0, 1)
+    """
+
+    def __init__(self, shape=(), quantiles=(0.05, 0.5, 0.95)):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.M2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.p2 = {p: P2Quantile(p, shape) for p in quantiles}
+
+    def update(self, batch):
+        """Add a batch of samples, array (B,) + shape."""
+        batch = np.asarray(batch, dtype=float)
+        B = len(batch)
+        if B == 0:
+            return
+        mean_b = batch.mean(axis=0)
+        M2_b = ((batch - mean_b) ** 2).sum(axis=0)
+        total = self.count + B
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (B / total)
+        self.M2 = self.M2 + M2_b + delta ** 2 * (self.count * B / total)
+        self.count = total
+        self.min = np.minimum(self.min, batch.min(axis=0))
+        self.max = np.maximum(self.max, batch.max(axis=0))
+        for est in self.p2.values():
+            for x in batch:
+                est.add(x)
+
+    @property
+    def variance(self):
+        """Unbiased sample variance."""
+        if self.count < 2:
+            return np.full(np.shape(self.mean), np.nan)
+        return self.M2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, p):
+        return self.p2[p].value
+
+    def summary(self):
+        """Dict of the statistics (mean, std, min, max, q<p>)."""
+        out = {"count": self.count, "mean": self.mean, "std": self.std,
+               "min": self.min, "max": self.max}
+        for p, est in self.p2.items():
+            out["q%g" % p] = est.value
+        return out
+
+
+def iter_propagate(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot, n_samples,
+                   uncertainties=None, method="lhs", batch_size=64, seed=None,
+                   outputs=("power", "N_Xe"), quantiles=(0.05, 0.5, 0.95), stride=1000,
+                   use_control=None, P_nom=None, K_p=None, groups=None):
+    """
+    Generator form of propagate: yields the statistics dict after each batch
+    (see propagate), so that a long study can be watched or stopped early.
+    """
+    if n_samples < 1 or batch_size < 1:
+        raise ValueError("n_samples and batch_size must be >= 1, got %s and %s"
+                         % (n_samples, batch_size))
+    system = rm.reactor_system(FPCompo, groups)
+    unc = default_uncertainties(system) if uncertainties is None else dict(uncertainties)
+    keys = list(unc)
+    rel = np.array([unc[key] for key in keys])
+    sampler = Sampler(len(keys), method, seed, n_total=n_samples)
+    outputs = list(outputs)
+
+    stats = None
+    n_done = n_failed = 0
+    while n_done < n_samples:
+        B = min(batch_size, n_samples - n_done)
+        factors = lognormal_factors(sampler.draw(B), rel)
+        systems = [perturbed_system(system, FPCompo, keys, f) for f in factors]
+        with np.errstate(over="ignore", invalid="ignore"):
+            runs = rm.reactorEnsemble([fuelCompo] * B, FPCompo, t_final, n_th_init, n_fa_init,
+                                      mTot, use_control, P_nom, K_p, record=outputs,
+                                      stride=stride, systems=systems)
+
+        hist = {key: np.array([r[key] for r in runs]) for key in outputs}
+        burnup = np.array([r["burnup"] for r in runs])
+        # échantillons divergents : comptés, pas pris dans les statistiques
+        ok = np.isfinite(burnup)
+        for key in outputs:
+            ok &= np.all(np.isfinite(hist[key]), axis=1)
+
+        if stats is None:
+            stats = {key: OnlineStats(hist[key].shape[1:], quantiles) for key in outputs}
+            stats["burnup"] = OnlineStats((), quantiles)
+            time = runs[0]["time"]
+        for key in outputs:
+            stats[key].update(hist[key][ok])
+        stats["burnup"].update(burnup[ok])
+        n_done += B
+        n_failed += int(B - np.count_nonzero(ok))
+
+        yield {"time": time, "n_samples": n_done, "n_failed": n_failed, "keys": keys,
+               "stats": stats}
+
+
+def propagate(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot, n_samples, **kwargs):
+    """
+    Monte Carlo propagation of the nuclear data uncertainties through
+    reactorModel (explicit Euler, dt = 1e-4 s). Each sample multiplies the
+    cross sections (all groups of a reaction together), the half-lives and
+    the Xe135 yield by lognormal factors of mean 1; the samples of a batch
+    run together with reactorEnsemble and only their running statistics
+    are kept.
+
+    ----------------
+    :param n_samples: int >= 1
+    :param uncertainties: dict {(nuclide, reaction): relative uncertainty}
+        with reaction 'Fission', 'Capture', a decay mode (half-life) or
+        YIELD for ("Xe135", YIELD); None -> default_uncertainties()
+    :param method: 'lhs', 'sobol' or 'random' (see Sampler); the Latin
+        hypercube is stratified over all the n_samples, not per batch
+    :param batch_size: int >= 1, samples simulated together
+    :param seed: int or None
+    :param outputs: recorded channels whose histories are summarised
+    :param quantiles: tuple of doubles, estimated with P²
+    :param stride: int, one output every stride steps
+    :param use_control, P_nom, K_p, groups: as in reactorModel
+    :return: dict {"time": recorded times, "n_samples", "n_failed"
+        (diverging samples, left out), "keys": sampled data, "stats":
+        {output: OnlineStats, "burnup": OnlineStats}}
+    """
+    for out in iter_propagate(fuelCompo, FPCompo, t_final, n_th_init, n_fa_init, mTot,
+                              n_samples, **kwargs):
+        pass
+    return out
+
+
+if __name__ == "__main__":
+    fuel = rm.Fuel()
+    fuel.U235, fuel.U238 = 3.0, 97.0
+    res = propagate(fuel, rm.FP(), 10.0, 1e10, 0.0, 25.0, 256, batch_size=64, seed=1,
+                    P_nom=1e7, K_p=1e-10)
+    print("%d samples (%d failed), %d uncertain data" % (res["n_samples"], res["n_failed"],
+                                                         len(res["keys"])))
+    for key, st in res["stats"].items():
+        s = st.summary()
+        print("%-7s mean %.4e  std %.3e  q5 %.4e  q50 %.4e  q95 %.4e"
+              % (key, *(np.ravel(s[k])[-1] for k in ("mean", "std", "q0.05", "q0.5", "q0.95"))))